@@ -0,0 +1,29 @@
+"""
+관리자 전용 기능 인증
+
+ADMIN_TOKEN 환경변수가 설정된 경우에만 관리자 기능이 활성화됩니다.
+HTTP는 X-Admin-Token 헤더, WebSocket은 헤더 또는 admin_token 쿼리 파라미터로 전달합니다.
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """토큰이 관리자 토큰과 일치하는지 확인 (토큰 미설정 시 항상 False)"""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 엔드포인트용 FastAPI 의존성"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="관리자 기능이 비활성화되어 있습니다")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다")
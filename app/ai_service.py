@@ -1,10 +1,15 @@
 import os
 import json
-import re
-from typing import List
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
 import google.generativeai as genai
 from pydantic_ai import Agent
 from .models import VocabularyEntry, UsageExample, SpellCheckInfo
+from .timing import stage_timer
+from .metrics import registry
+from .language_detection import RUSSIAN, source_language as detect_source_language
 
 # 환경변수 로드 (python-dotenv 사용)
 try:
@@ -19,21 +24,89 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 if GOOGLE_API_KEY:
     genai.configure(api_key=GOOGLE_API_KEY)
 
+# AI 호출 메트릭
+ai_request_duration = registry.histogram(
+    "ai_request_duration_seconds",
+    "AI 백엔드 호출 소요 시간",
+    labelnames=("backend",)
+)
+ai_requests_total = registry.counter(
+    "ai_requests_total",
+    "AI 백엔드 호출 결과별 횟수",
+    labelnames=("backend", "outcome")
+)
+ai_fallback_total = registry.counter(
+    "ai_fallback_total",
+    "백업 경로로 전환된 횟수",
+    labelnames=("reason",)
+)
+
+@contextmanager
+def ai_call(backend: str) -> Iterator[None]:
+    """AI 호출 구간의 소요 시간과 성공/실패를 기록"""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with stage_timer(f"ai_{backend}"):
+            yield
+        outcome = "success"
+    finally:
+        ai_request_duration.observe(time.perf_counter() - start, backend)
+        ai_requests_total.inc(backend, outcome)
+
 # 언어 감지 함수
 def detect_language(text: str) -> str:
-    """입력 텍스트의 언어를 감지합니다."""
-    # 키릴 문자 패턴 (러시아어)
-    cyrillic_pattern = re.compile(r'[\u0400-\u04FF]')
-    # 한글 패턴
-    hangul_pattern = re.compile(r'[가-힣]')
+    """입력 텍스트의 언어를 감지합니다. (터미널과 같은 규칙, 판단이 안 되면 더 많은 쪽 문자 기준으로 korean/russian)"""
+    return detect_source_language(text)
+
+# 생성 결과 캐시 (입력 언어 + 입력 텍스트 → 어휘 항목, 오래 안 쓴 항목부터 제거)
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "256"))
+ai_cache_requests = registry.counter(
+    "ai_cache_requests_total",
+    "AI 생성 결과 캐시 조회 결과",
+    labelnames=("result",)
+)
+
+class GenerationCache:
+    """번역 방향별 AI 생성 결과 LRU 캐시"""
     
-    if cyrillic_pattern.search(text):
-        return "russian"
-    elif hangul_pattern.search(text):
-        return "korean"
-    else:
-        # 기본적으로 한국어로 처리 (영어/숫자 등)
-        return "korean"
+    def __init__(self, max_size: int = AI_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], VocabularyEntry]" = OrderedDict()
+        # 내용이 바뀔 때마다 증가 (접두사 색인 재생성 판단용)
+        self.version = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Tuple[str, str]) -> Optional[VocabularyEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            ai_cache_requests.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        ai_cache_requests.inc("hit")
+        # 호출한 쪽에서 id 등을 채우므로 사본 반환
+        return entry.copy(deep=True)
+    
+    def put(self, key: Tuple[str, str], entry: VocabularyEntry) -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = entry.copy(deep=True)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self.version += 1
+    
+    def items(self) -> List[Tuple[Tuple[str, str], VocabularyEntry]]:
+        """(키, 항목) 목록 스냅샷 (항목은 공유되므로 수정하지 말 것)"""
+        return list(self._entries.items())
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self.version += 1
+
+generation_cache = GenerationCache()
 
 # PydanticAI Agent 설정 (API 키가 있을 때만)
 vocabulary_agent = None
@@ -76,17 +149,31 @@ if GOOGLE_API_KEY:
         print(f"⚠️  PydanticAI 에이전트 초기화 실패: {e}")
         vocabulary_agent = None
 
-async def generate_vocabulary_entry(input_text: str) -> VocabularyEntry:
-    """입력 텍스트(한국어/러시아어)를 감지하여 적절한 번역 데이터를 생성합니다."""
+async def generate_vocabulary_entry(input_text: str, source_language: Optional[str] = None) -> VocabularyEntry:
+    """
+    입력 텍스트(한국어/러시아어)의 번역 데이터를 생성합니다.
+    source_language(korean/russian)를 주면 번역 방향으로 그대로 사용하고, 없으면 여기서 한 번 감지합니다.
+    """
+    detected_language = source_language or detect_language(input_text)
+    cache_key = (detected_language, input_text.strip())
+    cached = generation_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    entry, cacheable = await _generate_vocabulary_entry(input_text, detected_language)
+    if cacheable:
+        generation_cache.put(cache_key, entry)
+    return entry
+
+async def _generate_vocabulary_entry(input_text: str, detected_language: str) -> Tuple[VocabularyEntry, bool]:
+    """(생성 결과, 캐시 가능 여부) 반환 (기본 예제로 대체된 결과는 캐시하지 않음)"""
     if not vocabulary_agent:
         # API 키가 없으면 백업 함수 사용
-        return await generate_vocabulary_fallback(input_text)
-    
-    # 언어 감지
-    detected_language = detect_language(input_text)
+        ai_fallback_total.inc("no_agent")
+        return await _generate_fallback(input_text, detected_language)
     
     try:
-        if detected_language == "russian":
+        if detected_language == RUSSIAN:
             # 러시아어 → 한국어 번역
             prompt = f"""
             러시아어 단어/표현: "{input_text}"
@@ -177,27 +264,31 @@ async def generate_vocabulary_entry(input_text: str) -> VocabularyEntry:
         }}
         """
         
-        result = await vocabulary_agent.run(prompt)
-        return result.data
+        with ai_call("agent"):
+            result = await vocabulary_agent.run(prompt)
+        return result.data, True
         
     except Exception as e:
         # 에러 발생시 백업 함수 사용
-        return await generate_vocabulary_fallback(input_text)
+        ai_fallback_total.inc("agent_error")
+        return await _generate_fallback(input_text, detected_language)
 
 # Gemini API를 직접 사용하는 백업 함수
-async def generate_vocabulary_fallback(input_text: str) -> VocabularyEntry:
+async def generate_vocabulary_fallback(input_text: str, source_language: Optional[str] = None) -> VocabularyEntry:
     """PydanticAI가 실패할 경우 사용하는 백업 함수"""
+    entry, _ = await _generate_fallback(input_text, source_language or detect_language(input_text))
+    return entry
+
+async def _generate_fallback(input_text: str, detected_language: str) -> Tuple[VocabularyEntry, bool]:
     if not GOOGLE_API_KEY:
         # API 키가 없으면 기본 예제 반환
-        return create_basic_entry(input_text, "Google API 키가 설정되지 않음")
+        ai_requests_total.inc("fallback", "no_api_key")
+        return create_basic_entry(input_text, "Google API 키가 설정되지 않음", detected_language), False
         
     try:
         model = genai.GenerativeModel('gemini-2.5-flash')
         
-        # 언어 감지
-        detected_language = detect_language(input_text)
-        
-        if detected_language == "russian":
+        if detected_language == RUSSIAN:
             prompt = f"""
             러시아어 단어/표현 "{input_text}"를 한국어로 번역하여 JSON 형식으로 응답해주세요:
             """
@@ -247,7 +338,8 @@ async def generate_vocabulary_fallback(input_text: str) -> VocabularyEntry:
             2단계: 올바른 맞춤법으로 연인 관계에서 자주 사용되는 자연스러운 예문을 작성해주세요.
             """
         
-        response = model.generate_content(prompt)
+        with ai_call("fallback"):
+            response = model.generate_content(prompt)
         
         # JSON 파싱 시도
         try:
@@ -258,21 +350,22 @@ async def generate_vocabulary_fallback(input_text: str) -> VocabularyEntry:
                 json_text = json_text[3:-3].strip()
                 
             data = json.loads(json_text)
-            return VocabularyEntry(**data)
+            return VocabularyEntry(**data), True
             
         except json.JSONDecodeError:
             # JSON 파싱 실패시 기본 구조 반환
-            return create_basic_entry(input_text, response.text)
+            ai_requests_total.inc("fallback", "parse_error")
+            return create_basic_entry(input_text, response.text, detected_language), False
             
     except Exception as e:
-        return create_basic_entry(input_text, f"오류: {str(e)}")
+        return create_basic_entry(input_text, f"오류: {str(e)}", detected_language), False
 
-def create_basic_entry(input_text: str, error_info: str = "") -> VocabularyEntry:
+def create_basic_entry(input_text: str, error_info: str = "", source_language: Optional[str] = None) -> VocabularyEntry:
     """기본 어휘 엔트리 생성"""
-    # 언어 감지
-    detected_language = detect_language(input_text)
+    # 언어 감지 (호출한 쪽에서 이미 감지했으면 재사용)
+    detected_language = source_language or detect_language(input_text)
     
-    if detected_language == "russian":
+    if detected_language == RUSSIAN:
         # 러시아어 입력인 경우
         return VocabularyEntry(
             original_word="번역 필요",
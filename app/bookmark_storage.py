@@ -1,71 +1,120 @@
 import json
-import os
-from typing import List, Optional, Dict
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterator, List, Optional, Dict
 from datetime import datetime, timedelta
 import logging
 from .models import BookmarkEntry, ChatMessage
+from .timing import stage_timer
+from .file_lock import atomic_write_json, file_lock, file_signature
+from .storage_executor import run_storage
 
 logger = logging.getLogger(__name__)
 
 class BookmarkStorage:
-    """북마크 저장 및 관리 클래스"""
+    """
+    북마크 저장 및 관리 클래스.
+    ChatStorage와 같이 변경은 파일 잠금 안에서 최신 파일 기준으로 적용하고,
+    조회 시 다른 프로세스가 파일을 바꿨으면 다시 로드합니다.
+    비동기 코드에서는 *_async 메서드로 저장소 스레드 풀에서 실행합니다.
+    """
     
     def __init__(self, storage_file: str = "bookmarks.json"):
         self.storage_file = storage_file
         self.bookmarks: Dict[str, BookmarkEntry] = {}
+        # 마지막으로 읽거나 쓴 파일의 시그니처 (다른 프로세스의 저장 감지용)
+        self._signature = None
+        # 스레드 풀의 여러 스레드가 메모리의 북마크를 함께 다루므로 조회/변경을 직렬화
+        self._lock = threading.RLock()
         self.load_all_bookmarks()
     
+    def _load_unlocked(self) -> None:
+        """파일에서 북마크를 읽어 교체 (파일이 없으면 빈 저장소, 손상되었으면 예외를 내고 메모리는 그대로)"""
+        signature = file_signature(self.storage_file)
+        if signature is not None:
+            bookmarks: Dict[str, BookmarkEntry] = {}
+            with stage_timer("bookmark_load"), open(self.storage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                for bookmark_data in data.get('bookmarks', []):
+                    # ISO 문자열을 datetime 객체로 변환
+                    for date_field in ['created_at', 'last_reviewed', 'next_review_date']:
+                        if date_field in bookmark_data and isinstance(bookmark_data[date_field], str):
+                            bookmark_data[date_field] = datetime.fromisoformat(bookmark_data[date_field])
+                    
+                    # usage_examples 처리 (중첩된 객체)
+                    if 'usage_examples' in bookmark_data and bookmark_data['usage_examples']:
+                        # 이미 UsageExample 객체 형태로 저장되어 있음
+                        pass
+                    
+                    bookmark = BookmarkEntry(**bookmark_data)
+                    bookmarks[bookmark.id] = bookmark
+                    
+            self.bookmarks = bookmarks
+            logger.info(f"✅ {len(self.bookmarks)}개 북마크 로드 완료")
+        else:
+            logger.info("📝 새로운 북마크 저장소 생성")
+            self.bookmarks = {}
+        self._signature = signature
+    
     def load_all_bookmarks(self) -> None:
-        """모든 북마크를 파일에서 로드"""
+        """모든 북마크를 파일에서 로드 (실패하면 메모리의 북마크를 그대로 유지)"""
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for bookmark_data in data.get('bookmarks', []):
-                        # ISO 문자열을 datetime 객체로 변환
-                        for date_field in ['created_at', 'last_reviewed', 'next_review_date']:
-                            if date_field in bookmark_data and isinstance(bookmark_data[date_field], str):
-                                bookmark_data[date_field] = datetime.fromisoformat(bookmark_data[date_field])
-                        
-                        # usage_examples 처리 (중첩된 객체)
-                        if 'usage_examples' in bookmark_data and bookmark_data['usage_examples']:
-                            # 이미 UsageExample 객체 형태로 저장되어 있음
-                            pass
-                        
-                        bookmark = BookmarkEntry(**bookmark_data)
-                        self.bookmarks[bookmark.id] = bookmark
-                        
-                logger.info(f"✅ {len(self.bookmarks)}개 북마크 로드 완료")
-            else:
-                logger.info("📝 새로운 북마크 저장소 생성")
-                self.bookmarks = {}
+            self._load_unlocked()
         except Exception as e:
             logger.error(f"❌ 북마크 로드 실패: {e}")
-            self.bookmarks = {}
+    
+    def _reload_if_changed(self, strict: bool = False) -> None:
+        """다른 프로세스가 파일을 바꿨으면 다시 로드 (strict=True면 로드 실패 시 예외)"""
+        if file_signature(self.storage_file) != self._signature:
+            if strict:
+                self._load_unlocked()
+            else:
+                self.load_all_bookmarks()
+    
+    @contextmanager
+    def _read(self) -> Iterator[None]:
+        """조회 구간: 다른 프로세스의 변경을 반영한 뒤 메모리의 북마크를 읽음"""
+        with self._lock:
+            self._reload_if_changed()
+            yield
+    
+    @contextmanager
+    def _update(self) -> Iterator[None]:
+        """읽기-수정-쓰기 구간: 배타 잠금을 잡고 최신 파일 기준으로 변경"""
+        with self._lock, file_lock(self.storage_file):
+            # 파일을 읽지 못하면 여기서 중단 (메모리의 빈/오래된 상태로 손상된 파일을 덮어쓰지 않도록)
+            self._reload_if_changed(strict=True)
+            yield
+    
+    def _values(self) -> List[BookmarkEntry]:
+        with self._read():
+            return list(self.bookmarks.values())
     
     def save_all_bookmarks(self) -> bool:
-        """모든 북마크를 파일에 저장"""
+        """모든 북마크를 파일에 원자적으로 저장 (다른 프로세스와 함께 쓸 때는 _update() 안에서 호출)"""
         try:
-            # Pydantic 모델을 dict로 변환 (datetime을 ISO 문자열로)
-            bookmarks_data = []
-            for bookmark in self.bookmarks.values():
-                bookmark_dict = bookmark.dict()
+            with stage_timer("bookmark_persist"):
+                # Pydantic 모델을 dict로 변환 (datetime을 ISO 문자열로)
+                bookmarks_data = []
+                for bookmark in self.bookmarks.values():
+                    bookmark_dict = bookmark.dict()
                 
-                # datetime 객체들을 ISO 문자열로 변환
-                for date_field in ['created_at', 'last_reviewed', 'next_review_date']:
-                    if date_field in bookmark_dict and bookmark_dict[date_field]:
-                        if hasattr(bookmark_dict[date_field], 'isoformat'):
-                            bookmark_dict[date_field] = bookmark_dict[date_field].isoformat()
+                    # datetime 객체들을 ISO 문자열로 변환
+                    for date_field in ['created_at', 'last_reviewed', 'next_review_date']:
+                        if date_field in bookmark_dict and bookmark_dict[date_field]:
+                            if hasattr(bookmark_dict[date_field], 'isoformat'):
+                                bookmark_dict[date_field] = bookmark_dict[date_field].isoformat()
                 
-                bookmarks_data.append(bookmark_dict)
+                    bookmarks_data.append(bookmark_dict)
             
-            data = {
-                "bookmarks": bookmarks_data,
-                "last_updated": datetime.now().isoformat()
-            }
+                data = {
+                    "bookmarks": bookmarks_data,
+                    "last_updated": datetime.now().isoformat()
+                }
             
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                atomic_write_json(self.storage_file, data, ensure_ascii=False, indent=2)
+                self._signature = file_signature(self.storage_file)
             
             logger.info(f"💾 {len(self.bookmarks)}개 북마크 저장 완료")
             return True
@@ -75,59 +124,64 @@ class BookmarkStorage:
     
     def create_bookmark(self, session_id: str, message: ChatMessage) -> BookmarkEntry:
         """새로운 북마크 생성"""
-        
-        # 기존 북마크 중복 확인
-        existing_bookmark = self.find_bookmark_by_message(session_id, message.id)
-        if existing_bookmark:
-            logger.info(f"북마크가 이미 존재함: {message.id}")
-            return existing_bookmark
-        
-        # 북마크 생성
-        bookmark = BookmarkEntry(
-            session_id=session_id,
-            message_id=message.id,
-            korean_text=message.text,
-            russian_translation=message.russian_translation or "",
-            pronunciation=message.pronunciation,
-            usage_examples=message.usage_examples,
-            next_review_date=datetime.now() + timedelta(days=1)  # 첫 복습은 1일 후
-        )
-        
-        self.bookmarks[bookmark.id] = bookmark
-        self.save_all_bookmarks()
+        with self._update():
+            # 기존 북마크 중복 확인
+            existing_bookmark = self.find_bookmark_by_message(session_id, message.id)
+            if existing_bookmark:
+                logger.info(f"북마크가 이미 존재함: {message.id}")
+                return existing_bookmark
+            
+            # 북마크 생성
+            bookmark = BookmarkEntry(
+                session_id=session_id,
+                message_id=message.id,
+                korean_text=message.text,
+                russian_translation=message.russian_translation or "",
+                pronunciation=message.pronunciation,
+                usage_examples=message.usage_examples,
+                next_review_date=datetime.now() + timedelta(days=1)  # 첫 복습은 1일 후
+            )
+            
+            self.bookmarks[bookmark.id] = bookmark
+            self.save_all_bookmarks()
         
         logger.info(f"🦊 새 북마크 생성: {bookmark.korean_text[:20]}...")
         return bookmark
     
     def find_bookmark_by_message(self, session_id: str, message_id: str) -> Optional[BookmarkEntry]:
         """특정 메시지의 북마크 찾기"""
-        for bookmark in self.bookmarks.values():
+        for bookmark in self._values():
             if bookmark.session_id == session_id and bookmark.message_id == message_id:
                 return bookmark
         return None
     
     def delete_bookmark(self, bookmark_id: str) -> bool:
         """북마크 삭제"""
-        if bookmark_id in self.bookmarks:
-            bookmark = self.bookmarks[bookmark_id]
-            del self.bookmarks[bookmark_id]
+        with self._update():
+            if bookmark_id not in self.bookmarks:
+                return False
+            bookmark = self.bookmarks.pop(bookmark_id)
             self.save_all_bookmarks()
-            logger.info(f"🗑️ 북마크 삭제: {bookmark.korean_text[:20]}...")
-            return True
-        return False
+        logger.info(f"🗑️ 북마크 삭제: {bookmark.korean_text[:20]}...")
+        return True
     
-    def get_all_bookmarks(self, limit: int = 100) -> List[BookmarkEntry]:
-        """모든 북마크를 최신순으로 반환"""
-        bookmarks = list(self.bookmarks.values())
+    def get_all_bookmarks(self, limit: Optional[int] = 100) -> List[BookmarkEntry]:
+        """모든 북마크를 최신순으로 반환 (limit=None이면 전체)"""
+        bookmarks = self._values()
         bookmarks.sort(key=lambda x: x.created_at, reverse=True)
         return bookmarks[:limit]
     
+    def get_page(self, offset: int, limit: int) -> List[BookmarkEntry]:
+        """저장 순서로 offset부터 limit개 (전체 목록을 복사·정렬하지 않음, 내보내기용)"""
+        with self._read():
+            return list(islice(self.bookmarks.values(), offset, offset + limit))
+    
     def get_bookmarks_for_review(self) -> List[BookmarkEntry]:
         """복습이 필요한 북마크들 반환"""
         now = datetime.now()
         review_bookmarks = []
         
-        for bookmark in self.bookmarks.values():
+        for bookmark in self._values():
             if bookmark.next_review_date and bookmark.next_review_date <= now:
                 review_bookmarks.append(bookmark)
         
@@ -137,14 +191,6 @@ class BookmarkStorage:
     
     def update_review(self, bookmark_id: str, difficulty_rating: int) -> bool:
         """복습 완료 처리 (간격반복학습 알고리즘)"""
-        if bookmark_id not in self.bookmarks:
-            return False
-        
-        bookmark = self.bookmarks[bookmark_id]
-        bookmark.review_count += 1
-        bookmark.last_reviewed = datetime.now()
-        bookmark.difficulty_level = max(1, min(5, difficulty_rating))  # 1-5 범위 제한
-        
         # 간격반복학습 알고리즘 (난이도에 따른 다음 복습 간격)
         intervals = {
             1: 1,    # 매우 쉬움: 1일 후
@@ -154,20 +200,29 @@ class BookmarkStorage:
             5: 30    # 매우 어려움: 1달 후
         }
         
-        # 복습 횟수에 따른 배수 적용
-        multiplier = min(bookmark.review_count, 5)  # 최대 5배
-        days_to_add = intervals[difficulty_rating] * multiplier
-        
-        bookmark.next_review_date = datetime.now() + timedelta(days=days_to_add)
-        
-        self.save_all_bookmarks()
+        with self._update():
+            if bookmark_id not in self.bookmarks:
+                return False
+            
+            bookmark = self.bookmarks[bookmark_id]
+            bookmark.review_count += 1
+            bookmark.last_reviewed = datetime.now()
+            bookmark.difficulty_level = max(1, min(5, difficulty_rating))  # 1-5 범위 제한
+            
+            # 복습 횟수에 따른 배수 적용
+            multiplier = min(bookmark.review_count, 5)  # 최대 5배
+            days_to_add = intervals[difficulty_rating] * multiplier
+            
+            bookmark.next_review_date = datetime.now() + timedelta(days=days_to_add)
+            
+            self.save_all_bookmarks()
         logger.info(f"📚 복습 완료: {bookmark.korean_text[:20]}... (다음 복습: {days_to_add}일 후)")
         return True
     
     def get_bookmarks_by_session(self, session_id: str) -> List[BookmarkEntry]:
         """특정 세션의 북마크들 반환"""
         session_bookmarks = [
-            bookmark for bookmark in self.bookmarks.values() 
+            bookmark for bookmark in self._values()
             if bookmark.session_id == session_id
         ]
         session_bookmarks.sort(key=lambda x: x.created_at, reverse=True)
@@ -180,7 +235,7 @@ class BookmarkStorage:
             return []
         
         matching_bookmarks = []
-        for bookmark in self.bookmarks.values():
+        for bookmark in self._values():
             # 한국어 텍스트 또는 러시아어 번역에서 검색
             if (query in bookmark.korean_text.lower() or 
                 query in bookmark.russian_translation.lower()):
@@ -189,15 +244,27 @@ class BookmarkStorage:
         matching_bookmarks.sort(key=lambda x: x.created_at, reverse=True)
         return matching_bookmarks
     
+    def import_bookmarks(self, bookmarks: List[BookmarkEntry]) -> int:
+        """북마크들을 같은 ID는 교체하며 추가하고 파일에 한 번 저장 (일괄 가져오기용)"""
+        if not bookmarks:
+            return 0
+        with self._update():
+            for bookmark in bookmarks:
+                self.bookmarks[bookmark.id] = bookmark
+            if not self.save_all_bookmarks():
+                raise OSError("북마크 저장 실패")
+        return len(bookmarks)
+    
     def get_bookmark_stats(self) -> Dict:
         """북마크 통계 정보 반환"""
-        total_bookmarks = len(self.bookmarks)
+        bookmarks = self._values()
+        total_bookmarks = len(bookmarks)
         review_needed = len(self.get_bookmarks_for_review())
         
         if total_bookmarks > 0:
-            avg_difficulty = sum(b.difficulty_level for b in self.bookmarks.values()) / total_bookmarks
-            avg_reviews = sum(b.review_count for b in self.bookmarks.values()) / total_bookmarks
-            latest_bookmark = max(self.bookmarks.values(), key=lambda x: x.created_at)
+            avg_difficulty = sum(b.difficulty_level for b in bookmarks) / total_bookmarks
+            avg_reviews = sum(b.review_count for b in bookmarks) / total_bookmarks
+            latest_bookmark = max(bookmarks, key=lambda x: x.created_at)
         else:
             avg_difficulty = 0
             avg_reviews = 0
@@ -210,6 +277,37 @@ class BookmarkStorage:
             "avg_reviews": round(avg_reviews, 1),
             "latest_bookmark": latest_bookmark.created_at if latest_bookmark else None
         }
+    
+    # 비동기 버전: 파일 I/O와 JSON (역)직렬화를 저장소 스레드 풀에서 실행
+    async def create_bookmark_async(self, session_id: str, message: ChatMessage) -> BookmarkEntry:
+        return await run_storage(self.create_bookmark, session_id, message)
+    
+    async def delete_bookmark_async(self, bookmark_id: str) -> bool:
+        return await run_storage(self.delete_bookmark, bookmark_id)
+    
+    async def get_all_bookmarks_async(self, limit: Optional[int] = 100) -> List[BookmarkEntry]:
+        return await run_storage(self.get_all_bookmarks, limit)
+    
+    async def get_bookmarks_for_review_async(self) -> List[BookmarkEntry]:
+        return await run_storage(self.get_bookmarks_for_review)
+    
+    async def update_review_async(self, bookmark_id: str, difficulty_rating: int) -> bool:
+        return await run_storage(self.update_review, bookmark_id, difficulty_rating)
+    
+    async def get_bookmarks_by_session_async(self, session_id: str) -> List[BookmarkEntry]:
+        return await run_storage(self.get_bookmarks_by_session, session_id)
+    
+    async def search_bookmarks_async(self, query: str) -> List[BookmarkEntry]:
+        return await run_storage(self.search_bookmarks, query)
+    
+    async def get_bookmark_stats_async(self) -> Dict:
+        return await run_storage(self.get_bookmark_stats)
+    
+    async def get_page_async(self, offset: int, limit: int) -> List[BookmarkEntry]:
+        return await run_storage(self.get_page, offset, limit)
+    
+    async def import_bookmarks_async(self, bookmarks: List[BookmarkEntry]) -> int:
+        return await run_storage(self.import_bookmarks, bookmarks)
 
 # 전역 북마크 스토리지 인스턴스
 bookmark_storage = BookmarkStorage()
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+텔레그램 봇 사용자 세션 저장소
+
+사용자별 세션(마지막 단어, 누적 단어 수)을 크기 제한 LRU + TTL로 메모리에 유지하고,
+주기적으로 JSON 스냅샷을 디스크에 기록해 재시작 후에도 누적 단어 수가 이어지도록 합니다.
+사용자 수가 늘어나도 메모리에는 최근 사용자 max_users명까지만 남습니다.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .file_lock import atomic_write_json
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+BOT_SESSION_FILE = os.getenv("BOT_SESSION_FILE", "telegram_sessions.json")
+# 메모리에 유지할 최대 사용자 수
+BOT_SESSION_MAX_USERS = int(os.getenv("BOT_SESSION_MAX_USERS", "10000"))
+# 마지막 사용 이후 세션을 유지하는 시간 (초, 기본 30일)
+BOT_SESSION_TTL = float(os.getenv("BOT_SESSION_TTL", str(30 * 24 * 3600)))
+# 디스크 스냅샷 간격 (초)
+BOT_SESSION_SNAPSHOT_INTERVAL = float(os.getenv("BOT_SESSION_SNAPSHOT_INTERVAL", "60"))
+
+bot_sessions_evicted = registry.counter(
+    "telegram_sessions_evicted_total",
+    "메모리에서 제거된 텔레그램 사용자 세션 수",
+    labelnames=("reason",)
+)
+bot_session_snapshots = registry.counter(
+    "telegram_session_snapshots_total",
+    "텔레그램 사용자 세션 스냅샷 저장 횟수",
+    labelnames=("result",)
+)
+
+
+def new_session() -> Dict[str, Any]:
+    return {'last_word': None, 'vocab_count': 0, 'last_seen': time.time()}
+
+
+class BotSessionStore:
+    """크기 제한 LRU + TTL 사용자 세션 저장소 (디스크 스냅샷 지원)"""
+
+    def __init__(
+        self,
+        storage_file: Optional[str] = BOT_SESSION_FILE,
+        max_users: int = BOT_SESSION_MAX_USERS,
+        ttl: float = BOT_SESSION_TTL
+    ):
+        self.storage_file = storage_file
+        self.max_users = max_users
+        self.ttl = ttl
+        self.sessions: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.evicted = {"lru": 0, "ttl": 0}
+        self.dirty = False
+        self.last_snapshot_at: Optional[datetime] = None
+        if storage_file:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self.sessions
+
+    def _expired(self, session: Dict[str, Any], now: float) -> bool:
+        return now - session.get('last_seen', 0) > self.ttl
+
+    def _evict(self, user_id: int, reason: str) -> None:
+        self.sessions.pop(user_id, None)
+        self.evicted[reason] += 1
+        bot_sessions_evicted.inc(reason)
+        self.dirty = True
+
+    def get(self, user_id: int) -> Dict[str, Any]:
+        """사용자 세션 조회 (없거나 만료되었으면 새로 생성, 최근 사용으로 갱신)"""
+        now = time.time()
+        session = self.sessions.get(user_id)
+        if session is not None and self._expired(session, now):
+            self._evict(user_id, "ttl")
+            session = None
+
+        if session is None:
+            session = new_session()
+            self.sessions[user_id] = session
+            while len(self.sessions) > self.max_users:
+                oldest = next(iter(self.sessions))
+                self._evict(oldest, "lru")
+        else:
+            self.sessions.move_to_end(user_id)
+            session['last_seen'] = now
+
+        self.dirty = True
+        return session
+
+    def reset(self, user_id: int) -> Dict[str, Any]:
+        """세션 초기화 (/start)"""
+        self.sessions.pop(user_id, None)
+        return self.get(user_id)
+
+    def record_word(self, user_id: int, word: str) -> int:
+        """번역한 단어를 기록하고 누적 단어 수 반환"""
+        session = self.get(user_id)
+        session['last_word'] = word
+        session['vocab_count'] += 1
+        return session['vocab_count']
+
+    def expire(self) -> int:
+        """TTL이 지난 세션 정리 (LRU 순서이므로 앞에서부터 만료되지 않은 세션을 만나면 중단)"""
+        now = time.time()
+        removed = 0
+        while self.sessions:
+            user_id, session = next(iter(self.sessions.items()))
+            if not self._expired(session, now):
+                break
+            self._evict(user_id, "ttl")
+            removed += 1
+        return removed
+
+    def load(self) -> None:
+        """스냅샷 파일에서 만료되지 않은 최근 세션만 로드"""
+        try:
+            if not os.path.exists(self.storage_file):
+                logger.info("📝 새로운 텔레그램 세션 저장소 생성")
+                return
+            with open(self.storage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"❌ 텔레그램 세션 로드 실패: {e}")
+            return
+
+        now = time.time()
+        entries = [
+            (int(user_id), session) for user_id, session in data.get('sessions', {}).items()
+            if not self._expired(session, now)
+        ]
+        # 오래 사용하지 않은 사용자부터 넣어 LRU 순서 복원
+        entries.sort(key=lambda item: item[1].get('last_seen', 0))
+        self.sessions = OrderedDict(entries[-self.max_users:] if self.max_users > 0 else [])
+        logger.info(f"✅ {len(self.sessions)}개 텔레그램 세션 로드 완료")
+
+    def _snapshot_payload(self) -> Dict[str, Any]:
+        return {
+            "sessions": {str(user_id): dict(session) for user_id, session in self.sessions.items()},
+            "last_updated": datetime.now().isoformat()
+        }
+
+    def _write(self, payload: Dict[str, Any]) -> None:
+        # 임시 파일에 쓰고 fsync 후 교체하여 저장 도중 종료되어도 이전 스냅샷이 남도록 함
+        atomic_write_json(self.storage_file, payload, ensure_ascii=False)
+
+    def save(self) -> bool:
+        """변경이 있으면 스냅샷 저장"""
+        if not self.storage_file or not self.dirty:
+            return True
+        payload = self._snapshot_payload()
+        self.dirty = False
+        return self._write_logged(payload)
+
+    async def save_async(self) -> bool:
+        """스냅샷 생성은 이벤트 루프에서, 파일 쓰기는 스레드에서 수행"""
+        if not self.storage_file or not self.dirty:
+            return True
+        payload = self._snapshot_payload()
+        self.dirty = False
+        return await asyncio.to_thread(self._write_logged, payload)
+
+    def _write_logged(self, payload: Dict[str, Any]) -> bool:
+        try:
+            self._write(payload)
+        except Exception as e:
+            self.dirty = True
+            bot_session_snapshots.inc("error")
+            logger.error(f"❌ 텔레그램 세션 저장 실패: {e}")
+            return False
+        self.last_snapshot_at = datetime.now()
+        bot_session_snapshots.inc("ok")
+        logger.debug(f"💾 {len(payload['sessions'])}개 텔레그램 세션 저장 완료")
+        return True
+
+    async def run_snapshots(self, interval: float = BOT_SESSION_SNAPSHOT_INTERVAL) -> None:
+        """주기적으로 만료 세션을 정리하고 스냅샷 저장 (취소될 때까지)"""
+        while True:
+            await asyncio.sleep(interval)
+            self.expire()
+            await self.save_async()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self.sessions),
+            "max_users": self.max_users,
+            "ttl_seconds": self.ttl,
+            "evicted": dict(self.evicted),
+            "last_snapshot_at": self.last_snapshot_at.isoformat() if self.last_snapshot_at else None,
+        }
@@ -0,0 +1,125 @@
+"""
+텔레그램 업데이트 동시 처리
+
+python-telegram-bot의 BaseUpdateProcessor 구현입니다. 서로 다른 채팅의 업데이트는
+최대 workers개까지 동시에 처리하고, 같은 채팅의 업데이트는 도착 순서대로 하나씩 처리합니다.
+한 사용자의 느린 AI 호출이 다른 사용자의 처리를 막지 않으면서도 대화 순서는 유지됩니다.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Dict, Optional
+
+from telegram.ext import BaseUpdateProcessor
+
+from .loop_monitor import task_label
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# 동시에 핸들러를 실행할 업데이트 수 (1이면 기존처럼 순차 처리)
+TELEGRAM_UPDATE_WORKERS = int(os.getenv("TELEGRAM_UPDATE_WORKERS", "8"))
+# 처리 중 + 대기 중인 업데이트 최대 수 (넘으면 PTB가 새 업데이트 처리를 미룸)
+TELEGRAM_MAX_PENDING_UPDATES = int(os.getenv("TELEGRAM_MAX_PENDING_UPDATES", "256"))
+
+telegram_updates_processed = registry.counter(
+    "telegram_updates_processed_total",
+    "처리가 끝난 텔레그램 업데이트 수",
+    labelnames=("result",)
+)
+
+
+# 느린 콜백 보고에 쓰는 업데이트 종류 (확인 순서대로)
+UPDATE_KINDS = ("message", "edited_message", "callback_query", "inline_query", "chosen_inline_result")
+
+
+def update_kind(update: object) -> str:
+    for kind in UPDATE_KINDS:
+        if getattr(update, kind, None) is not None:
+            return kind
+    return "other"
+
+
+def chat_key(update: object) -> Optional[int]:
+    """순서를 보장할 기준 (채팅 ID, 채팅이 없는 업데이트는 None)"""
+    chat = getattr(update, "effective_chat", None)
+    return getattr(chat, "id", None)
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """채팅별 순서를 지키는 제한된 동시 업데이트 처리기"""
+
+    def __init__(self, workers: int = TELEGRAM_UPDATE_WORKERS,
+                 max_pending: int = TELEGRAM_MAX_PENDING_UPDATES):
+        super().__init__(max(max_pending, workers))
+        self.workers = workers
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        # 채팅 ID → 해당 채팅에서 마지막으로 들어온 업데이트의 완료 신호
+        self._tails: Dict[Any, asyncio.Future] = {}
+        self.queued = 0
+        self.active = 0
+
+    def _slots(self) -> asyncio.Semaphore:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._worker_slots is None:
+            self._worker_slots = asyncio.Semaphore(self.workers)
+        return self._worker_slots
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        key = chat_key(update)
+        previous = self._tails.get(key) if key is not None else None
+        done = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._tails[key] = done
+
+        self.queued += 1
+        waiting = True
+        try:
+            # 같은 채팅의 이전 업데이트가 끝날 때까지는 작업 슬롯을 차지하지 않고 대기
+            if previous is not None:
+                await previous
+            async with self._slots():
+                self.queued -= 1
+                waiting = False
+                self.active += 1
+                try:
+                    with task_label(f"telegram {update_kind(update)}"):
+                        await coroutine
+                    telegram_updates_processed.inc("ok")
+                except Exception:
+                    telegram_updates_processed.inc("error")
+                    raise
+                finally:
+                    self.active -= 1
+        finally:
+            if waiting:
+                self.queued -= 1
+                # 차례가 오기 전에 취소된 경우 핸들러 코루틴을 닫아 경고 방지
+                if hasattr(coroutine, "close"):
+                    coroutine.close()
+            done.set_result(None)
+            if key is not None and self._tails.get(key) is done:
+                del self._tails[key]
+
+    async def initialize(self) -> None:
+        logger.info(f"⚙️ 텔레그램 업데이트 동시 처리: 작업 {self.workers}개, 최대 대기 {self.max_concurrent_updates}개")
+
+    async def shutdown(self) -> None:
+        pending = self.queued + self.active
+        if pending:
+            logger.info(f"🛑 처리 중이던 텔레그램 업데이트 {pending}개")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "queued": self.queued,
+            "active": self.active,
+            "chats_waiting": len(self._tails),
+        }
+
+
+def build_update_processor(workers: int = TELEGRAM_UPDATE_WORKERS) -> Optional[ChatOrderedUpdateProcessor]:
+    """설정된 작업 수가 2 이상이면 동시 처리기, 아니면 None (PTB 기본 순차 처리)"""
+    if workers <= 1:
+        return None
+    return ChatOrderedUpdateProcessor(workers)
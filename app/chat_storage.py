@@ -1,76 +1,121 @@
 import json
-import os
-from typing import List, Optional, Dict
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Iterator, List, Optional, Dict
 from datetime import datetime, timedelta
 import logging
 from .models import ChatSession, ChatMessage
+from .timing import stage_timer
+from .file_lock import atomic_write_json, file_lock, file_signature
+from .storage_executor import run_storage
 
 logger = logging.getLogger(__name__)
 
 class ChatStorage:
-    """채팅 세션 저장 및 관리 클래스"""
+    """
+    채팅 세션 저장 및 관리 클래스.
+    여러 프로세스(uvicorn 워커)가 같은 파일을 쓰므로, 변경은 파일 잠금 안에서 최신 파일을
+    다시 읽은 뒤 적용하고, 조회 시에도 파일이 바뀌었으면 다시 로드합니다.
+    비동기 코드에서는 *_async 메서드로 저장소 스레드 풀에서 실행합니다.
+    """
     
     def __init__(self, storage_file: str = "chat_sessions.json"):
         self.storage_file = storage_file
         self.sessions: Dict[str, ChatSession] = {}
+        # 마지막으로 읽거나 쓴 파일의 시그니처 (다른 프로세스의 저장 감지용)
+        self._signature = None
+        # 스레드 풀의 여러 스레드가 메모리의 세션을 함께 다루므로 조회/변경을 직렬화
+        self._lock = threading.RLock()
         self.load_all_sessions()
     
+    def _load_unlocked(self) -> None:
+        """파일에서 세션을 읽어 교체 (파일이 없으면 빈 저장소, 손상되었으면 예외를 내고 메모리는 그대로)"""
+        signature = file_signature(self.storage_file)
+        if signature is not None:
+            sessions: Dict[str, ChatSession] = {}
+            with stage_timer("chat_load"), open(self.storage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                for session_data in data.get('sessions', []):
+                    # ISO 문자열을 datetime 객체로 변환
+                    if 'created_at' in session_data and isinstance(session_data['created_at'], str):
+                        session_data['created_at'] = datetime.fromisoformat(session_data['created_at'])
+                    if 'last_updated' in session_data and isinstance(session_data['last_updated'], str):
+                        session_data['last_updated'] = datetime.fromisoformat(session_data['last_updated'])
+                    
+                    # 메시지들의 timestamp도 변환
+                    for message in session_data.get('messages', []):
+                        if 'timestamp' in message and isinstance(message['timestamp'], str):
+                            message['timestamp'] = datetime.fromisoformat(message['timestamp'])
+                    
+                    session = ChatSession(**session_data)
+                    sessions[session.session_id] = session
+            self.sessions = sessions
+            logger.info(f"✅ {len(self.sessions)}개 채팅 세션 로드 완료")
+        else:
+            logger.info("📝 새로운 채팅 저장소 생성")
+            self.sessions = {}
+        self._signature = signature
+    
     def load_all_sessions(self) -> None:
-        """모든 세션을 파일에서 로드"""
+        """모든 세션을 파일에서 로드 (실패하면 메모리의 세션을 그대로 유지)"""
         try:
-            if os.path.exists(self.storage_file):
-                with open(self.storage_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for session_data in data.get('sessions', []):
-                        # ISO 문자열을 datetime 객체로 변환
-                        if 'created_at' in session_data and isinstance(session_data['created_at'], str):
-                            session_data['created_at'] = datetime.fromisoformat(session_data['created_at'])
-                        if 'last_updated' in session_data and isinstance(session_data['last_updated'], str):
-                            session_data['last_updated'] = datetime.fromisoformat(session_data['last_updated'])
-                        
-                        # 메시지들의 timestamp도 변환
-                        for message in session_data.get('messages', []):
-                            if 'timestamp' in message and isinstance(message['timestamp'], str):
-                                message['timestamp'] = datetime.fromisoformat(message['timestamp'])
-                        
-                        session = ChatSession(**session_data)
-                        self.sessions[session.session_id] = session
-                logger.info(f"✅ {len(self.sessions)}개 채팅 세션 로드 완료")
-            else:
-                logger.info("📝 새로운 채팅 저장소 생성")
-                self.sessions = {}
+            self._load_unlocked()
         except Exception as e:
             logger.error(f"❌ 채팅 세션 로드 실패: {e}")
-            self.sessions = {}
+    
+    def _reload_if_changed(self, strict: bool = False) -> None:
+        """다른 프로세스가 파일을 바꿨으면 다시 로드 (strict=True면 로드 실패 시 예외)"""
+        if file_signature(self.storage_file) != self._signature:
+            if strict:
+                self._load_unlocked()
+            else:
+                self.load_all_sessions()
+    
+    @contextmanager
+    def _read(self) -> Iterator[None]:
+        """조회 구간: 다른 프로세스의 변경을 반영한 뒤 메모리의 세션을 읽음"""
+        with self._lock:
+            self._reload_if_changed()
+            yield
+    
+    @contextmanager
+    def _update(self) -> Iterator[None]:
+        """읽기-수정-쓰기 구간: 배타 잠금을 잡고 최신 파일 기준으로 변경"""
+        with self._lock, file_lock(self.storage_file):
+            # 파일을 읽지 못하면 여기서 중단 (메모리의 빈/오래된 상태로 손상된 파일을 덮어쓰지 않도록)
+            self._reload_if_changed(strict=True)
+            yield
     
     def save_all_sessions(self) -> bool:
-        """모든 세션을 파일에 저장"""
+        """모든 세션을 파일에 원자적으로 저장 (다른 프로세스와 함께 쓸 때는 _update() 안에서 호출)"""
         try:
-            # Pydantic 모델을 dict로 변환 (datetime을 ISO 문자열로)
-            sessions_data = []
-            for session in self.sessions.values():
-                session_dict = session.dict()
-                # datetime 객체들을 ISO 문자열로 변환
-                if 'created_at' in session_dict and session_dict['created_at']:
-                    session_dict['created_at'] = session_dict['created_at'].isoformat()
-                if 'last_updated' in session_dict and session_dict['last_updated']:
-                    session_dict['last_updated'] = session_dict['last_updated'].isoformat()
+            with stage_timer("chat_persist"):
+                # Pydantic 모델을 dict로 변환 (datetime을 ISO 문자열로)
+                sessions_data = []
+                for session in self.sessions.values():
+                    session_dict = session.dict()
+                    # datetime 객체들을 ISO 문자열로 변환
+                    if 'created_at' in session_dict and session_dict['created_at']:
+                        session_dict['created_at'] = session_dict['created_at'].isoformat()
+                    if 'last_updated' in session_dict and session_dict['last_updated']:
+                        session_dict['last_updated'] = session_dict['last_updated'].isoformat()
                 
-                # 메시지들의 timestamp도 변환
-                for message in session_dict.get('messages', []):
-                    if 'timestamp' in message and message['timestamp']:
-                        if hasattr(message['timestamp'], 'isoformat'):
-                            message['timestamp'] = message['timestamp'].isoformat()
+                    # 메시지들의 timestamp도 변환
+                    for message in session_dict.get('messages', []):
+                        if 'timestamp' in message and message['timestamp']:
+                            if hasattr(message['timestamp'], 'isoformat'):
+                                message['timestamp'] = message['timestamp'].isoformat()
                         
-                sessions_data.append(session_dict)
+                    sessions_data.append(session_dict)
             
-            data = {
-                "sessions": sessions_data,
-                "last_updated": datetime.now().isoformat()
-            }
+                data = {
+                    "sessions": sessions_data,
+                    "last_updated": datetime.now().isoformat()
+                }
             
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+                atomic_write_json(self.storage_file, data, ensure_ascii=False, indent=2)
+                self._signature = file_signature(self.storage_file)
             
             logger.info(f"💾 {len(self.sessions)}개 채팅 세션 저장 완료")
             return True
@@ -97,36 +142,45 @@ class ChatStorage:
             )
             session.add_message(user_msg)
         
-        self.sessions[session.session_id] = session
-        self.save_all_sessions()
+        with self._update():
+            self.sessions[session.session_id] = session
+            self.save_all_sessions()
         
         logger.info(f"🆕 새 채팅 세션 생성: {session.session_id}")
         return session
     
     def get_session(self, session_id: str) -> Optional[ChatSession]:
         """세션 ID로 특정 세션 조회"""
-        return self.sessions.get(session_id)
+        with self._read():
+            return self.sessions.get(session_id)
     
     def add_message_to_session(self, session_id: str, message: ChatMessage) -> bool:
         """특정 세션에 메시지 추가"""
-        session = self.get_session(session_id)
-        if not session:
-            logger.error(f"❌ 세션을 찾을 수 없음: {session_id}")
-            return False
-        
-        session.add_message(message)
-        self.save_all_sessions()
+        with self._update():
+            session = self.sessions.get(session_id)
+            if not session:
+                logger.error(f"❌ 세션을 찾을 수 없음: {session_id}")
+                return False
+            
+            session.add_message(message)
+            self.save_all_sessions()
         
         logger.info(f"📨 메시지 추가 완료: {session_id} (총 {session.message_count}개)")
         return True
     
-    def get_all_sessions(self, limit: int = 50) -> List[ChatSession]:
-        """모든 세션을 최신순으로 반환"""
-        sessions = list(self.sessions.values())
+    def get_all_sessions(self, limit: Optional[int] = 50) -> List[ChatSession]:
+        """모든 세션을 최신순으로 반환 (limit=None이면 전체)"""
+        with self._read():
+            sessions = list(self.sessions.values())
         # 마지막 업데이트 시간으로 정렬 (최신순)
         sessions.sort(key=lambda x: x.last_updated, reverse=True)
         return sessions[:limit]
     
+    def get_page(self, offset: int, limit: int) -> List[ChatSession]:
+        """저장 순서로 offset부터 limit개 (전체 목록을 복사·정렬하지 않음, 내보내기용)"""
+        with self._read():
+            return list(islice(self.sessions.values(), offset, offset + limit))
+    
     def get_sessions_by_date(self) -> Dict[str, List[ChatSession]]:
         """날짜별로 그룹핑된 세션 반환"""
         now = datetime.now()
@@ -158,41 +212,56 @@ class ChatStorage:
     
     def delete_session(self, session_id: str) -> bool:
         """세션 삭제"""
-        if session_id in self.sessions:
+        with self._update():
+            if session_id not in self.sessions:
+                return False
             del self.sessions[session_id]
             self.save_all_sessions()
-            logger.info(f"🗑️ 세션 삭제 완료: {session_id}")
-            return True
-        return False
+        logger.info(f"🗑️ 세션 삭제 완료: {session_id}")
+        return True
     
     def clear_old_sessions(self, days: int = 30) -> int:
         """지정된 일수보다 오래된 세션 삭제"""
         cutoff_date = datetime.now() - timedelta(days=days)
         deleted_count = 0
         
-        sessions_to_delete = []
-        for session_id, session in self.sessions.items():
-            if session.last_updated < cutoff_date:
-                sessions_to_delete.append(session_id)
-        
-        for session_id in sessions_to_delete:
-            del self.sessions[session_id]
-            deleted_count += 1
-        
-        if deleted_count > 0:
-            self.save_all_sessions()
-            logger.info(f"🧹 {deleted_count}개 오래된 세션 정리 완료")
+        with self._update():
+            sessions_to_delete = []
+            for session_id, session in self.sessions.items():
+                if session.last_updated < cutoff_date:
+                    sessions_to_delete.append(session_id)
+            
+            for session_id in sessions_to_delete:
+                del self.sessions[session_id]
+                deleted_count += 1
+            
+            if deleted_count > 0:
+                self.save_all_sessions()
+                logger.info(f"🧹 {deleted_count}개 오래된 세션 정리 완료")
         
         return deleted_count
     
+    def import_sessions(self, sessions: List[ChatSession]) -> int:
+        """세션들을 같은 ID는 교체하며 추가하고 파일에 한 번 저장 (일괄 가져오기용)"""
+        if not sessions:
+            return 0
+        with self._update():
+            for session in sessions:
+                self.sessions[session.session_id] = session
+            if not self.save_all_sessions():
+                raise OSError("채팅 세션 저장 실패")
+        return len(sessions)
+    
     def get_session_stats(self) -> Dict:
         """세션 통계 정보 반환"""
-        total_sessions = len(self.sessions)
-        total_messages = sum(session.message_count for session in self.sessions.values())
+        with self._read():
+            sessions = list(self.sessions.values())
+        total_sessions = len(sessions)
+        total_messages = sum(session.message_count for session in sessions)
         
         if total_sessions > 0:
             avg_messages = total_messages / total_sessions
-            latest_session = max(self.sessions.values(), key=lambda x: x.last_updated)
+            latest_session = max(sessions, key=lambda x: x.last_updated)
         else:
             avg_messages = 0
             latest_session = None
@@ -203,6 +272,34 @@ class ChatStorage:
             "avg_messages_per_session": round(avg_messages, 1),
             "latest_activity": latest_session.last_updated if latest_session else None
         }
+    
+    # 비동기 버전: 파일 I/O와 JSON (역)직렬화를 저장소 스레드 풀에서 실행
+    async def create_session_async(self, first_message: Optional[str] = None) -> ChatSession:
+        return await run_storage(self.create_session, first_message)
+    
+    async def get_session_async(self, session_id: str) -> Optional[ChatSession]:
+        return await run_storage(self.get_session, session_id)
+    
+    async def add_message_to_session_async(self, session_id: str, message: ChatMessage) -> bool:
+        return await run_storage(self.add_message_to_session, session_id, message)
+    
+    async def get_sessions_by_date_async(self) -> Dict[str, List[ChatSession]]:
+        return await run_storage(self.get_sessions_by_date)
+    
+    async def delete_session_async(self, session_id: str) -> bool:
+        return await run_storage(self.delete_session, session_id)
+    
+    async def get_session_stats_async(self) -> Dict:
+        return await run_storage(self.get_session_stats)
+    
+    async def get_all_sessions_async(self, limit: Optional[int] = 50) -> List[ChatSession]:
+        return await run_storage(self.get_all_sessions, limit)
+    
+    async def get_page_async(self, offset: int, limit: int) -> List[ChatSession]:
+        return await run_storage(self.get_page, offset, limit)
+    
+    async def import_sessions_async(self, sessions: List[ChatSession]) -> int:
+        return await run_storage(self.import_sessions, sessions)
 
 # 전역 채팅 스토리지 인스턴스
 chat_storage = ChatStorage()
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+터미널 WebSocket 연결 관리
+
+살아 있는 연결(세션) 레지스트리, 애플리케이션 수준 하트비트(ping/pong),
+유휴·반쯤 끊긴(half-open) 연결 정리, 전체/IP별 동시 연결 제한,
+종료 시 연결 정리(drain)를 담당합니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import WebSocket
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "200"))
+WS_MAX_CONNECTIONS_PER_IP = int(os.getenv("WS_MAX_CONNECTIONS_PER_IP", "10"))
+# 서버가 ping을 보내는 간격 (초)
+WS_HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "25"))
+# ping 이후 아무 프레임도 오지 않으면 반쯤 끊긴 연결로 보고 정리하기까지의 추가 대기 (초)
+WS_PONG_TIMEOUT = float(os.getenv("WS_PONG_TIMEOUT", "20"))
+# 번역/명령어 등 실제 요청이 없으면 정리하기까지의 시간 (초)
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "900"))
+
+# WebSocket 종료 코드
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_TRY_AGAIN_LATER = 1013
+# 서버 쪽 종료 시 안내 프레임 전송/close 핸드셰이크 각각의 최대 대기 (초)
+WS_CLOSE_TIMEOUT = 1.0
+
+# 클라이언트가 보내는 하트비트 메시지 (유휴 시간 계산에서 제외)
+HEARTBEAT_MESSAGE_TYPES = ("ping", "pong")
+
+websocket_connections_peak = registry.gauge(
+    "websocket_connections_peak",
+    "프로세스 시작 이후 최대 동시 터미널 WebSocket 수",
+    callback=lambda: connection_manager.peak
+)
+websocket_rejected = registry.counter(
+    "websocket_connections_rejected_total",
+    "연결 제한으로 거절된 터미널 WebSocket 수",
+    labelnames=("reason",)
+)
+websocket_reaped = registry.counter(
+    "websocket_connections_reaped_total",
+    "서버가 정리한 터미널 WebSocket 수",
+    labelnames=("reason",)
+)
+
+
+def client_ip(websocket: WebSocket) -> str:
+    """연결 제한에 사용할 클라이언트 IP"""
+    return websocket.client.host if websocket.client else "unknown"
+
+
+class ManagedConnection:
+    """레지스트리에 등록된 연결 하나"""
+
+    def __init__(self, websocket: WebSocket, ip: str, session: Any,
+                 send: Callable[[dict], Awaitable[bool]]):
+        self.websocket = websocket
+        self.ip = ip
+        self.session = session
+        self.send = send
+        now = time.monotonic()
+        self.connected_at = now
+        # 마지막으로 어떤 프레임이든 받은 시각 (half-open 판단)
+        self.last_seen = now
+        # 마지막으로 하트비트가 아닌 요청을 받은 시각 (유휴 판단)
+        self.last_activity = now
+        self.closing = False
+        self.close_reason: Optional[str] = None
+        # 연결을 처리하는 엔드포인트 작업 (정리 시 수신 대기를 끊기 위해 취소)
+        self.handler_task: Optional[asyncio.Task] = None
+        self.heartbeat_task: Optional[asyncio.Task] = None
+
+    def touch(self, message_type: Optional[str] = None) -> None:
+        now = time.monotonic()
+        self.last_seen = now
+        if message_type not in HEARTBEAT_MESSAGE_TYPES:
+            self.last_activity = now
+
+
+class ConnectionManager:
+    """터미널 WebSocket 연결 레지스트리"""
+
+    def __init__(
+        self,
+        max_connections: int = WS_MAX_CONNECTIONS,
+        max_per_ip: int = WS_MAX_CONNECTIONS_PER_IP,
+        heartbeat_interval: float = WS_HEARTBEAT_INTERVAL,
+        pong_timeout: float = WS_PONG_TIMEOUT,
+        idle_timeout: float = WS_IDLE_TIMEOUT
+    ):
+        self.max_connections = max_connections
+        self.max_per_ip = max_per_ip
+        self.heartbeat_interval = heartbeat_interval
+        self.pong_timeout = pong_timeout
+        self.idle_timeout = idle_timeout
+        self.connections: Dict[int, ManagedConnection] = {}
+        # IP별 연결 수 (등록된 연결 + 핸드셰이크 중인 예약)
+        self._per_ip: Dict[str, int] = defaultdict(int)
+        # 자리를 예약했지만 아직 register되지 않은 연결 수
+        self._reserved = 0
+        self.peak = 0
+        self.accepting = True
+
+    @property
+    def live(self) -> int:
+        return len(self.connections)
+
+    def admission_error(self, ip: str) -> Optional[str]:
+        """새 연결을 받을 수 없는 이유 (받을 수 있으면 None)"""
+        if not self.accepting:
+            return "shutting_down"
+        if len(self.connections) + self._reserved >= self.max_connections:
+            return "global_limit"
+        if self._per_ip.get(ip, 0) >= self.max_per_ip:
+            return "ip_limit"
+        return None
+
+    def reserve(self, ip: str) -> Optional[str]:
+        """
+        제한을 확인하고 통과하면 그 자리에서 연결 한 자리를 예약 (거절 이유 반환, 통과하면 None).
+        accept 등 await 사이에 동시에 들어온 핸드셰이크가 모두 제한을 통과하지 않도록
+        확인과 예약을 한 번에 합니다. 예약은 register가 이어받거나 release로 반납합니다.
+        """
+        rejection = self.admission_error(ip)
+        if rejection is None:
+            self._reserved += 1
+            self._per_ip[ip] += 1
+        return rejection
+
+    def release(self, ip: str) -> None:
+        """register 전에 실패한 연결의 예약 반납"""
+        self._reserved -= 1
+        self._decrement_ip(ip)
+
+    def _decrement_ip(self, ip: str) -> None:
+        self._per_ip[ip] -= 1
+        if self._per_ip[ip] <= 0:
+            del self._per_ip[ip]
+
+    def register(self, websocket: WebSocket, session: Any,
+                 send: Callable[[dict], Awaitable[bool]]) -> ManagedConnection:
+        """reserve로 예약한 자리에 연결 등록 후 하트비트 시작 (엔드포인트 작업 안에서 호출)"""
+        connection = ManagedConnection(websocket, client_ip(websocket), session, send)
+        connection.handler_task = asyncio.current_task()
+        self._reserved -= 1
+        self.connections[id(connection)] = connection
+        self.peak = max(self.peak, len(self.connections))
+        connection.heartbeat_task = asyncio.create_task(self._heartbeat(connection))
+        return connection
+
+    def unregister(self, connection: ManagedConnection) -> None:
+        if self.connections.pop(id(connection), None) is None:
+            return
+        self._decrement_ip(connection.ip)
+        if connection.heartbeat_task is not None and connection.heartbeat_task is not asyncio.current_task():
+            connection.heartbeat_task.cancel()
+
+    async def _heartbeat(self, connection: ManagedConnection) -> None:
+        """주기적으로 ping을 보내고 유휴/반쯤 끊긴 연결 정리"""
+        try:
+            while not connection.closing:
+                await asyncio.sleep(self.heartbeat_interval)
+                now = time.monotonic()
+                if now - connection.last_seen > self.heartbeat_interval + self.pong_timeout:
+                    await self.close(connection, CLOSE_GOING_AWAY, "half_open")
+                    return
+                if now - connection.last_activity > self.idle_timeout:
+                    await self.close(connection, CLOSE_NORMAL, "idle")
+                    return
+                await connection.send({"type": "ping", "timestamp": time.time()})
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self, connection: ManagedConnection, code: int, reason: str) -> None:
+        """서버 쪽에서 연결 정리 (엔드포인트의 수신 대기도 함께 종료)"""
+        if connection.closing:
+            return
+        connection.closing = True
+        connection.close_reason = reason
+        websocket_reaped.inc(reason)
+        logger.info(f"🧹 터미널 WebSocket 정리 ({reason}): {connection.ip}")
+        # 수신 버퍼가 찬 클라이언트에게 막혀 정리가 멈추지 않도록 전송도 시간 제한
+        try:
+            await asyncio.wait_for(connection.send({
+                "type": "error",
+                "message": "연결이 서버에 의해 종료됩니다.",
+                "reason": reason
+            }), timeout=WS_CLOSE_TIMEOUT)
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(connection.websocket.close(code=code), timeout=WS_CLOSE_TIMEOUT)
+        except Exception:
+            pass
+        # 응답이 없는 클라이언트는 disconnect 이벤트가 오지 않으므로 수신 대기를 직접 끊음
+        if connection.handler_task is not None and not connection.handler_task.done():
+            connection.handler_task.cancel()
+
+    async def drain(self) -> None:
+        """새 연결을 막고 모든 연결을 1001(going away)로 종료"""
+        self.accepting = False
+        connections: List[ManagedConnection] = list(self.connections.values())
+        if connections:
+            logger.info(f"🛑 종료 전 터미널 WebSocket {len(connections)}개 정리")
+        await asyncio.gather(
+            *(self.close(connection, CLOSE_GOING_AWAY, "shutdown") for connection in connections),
+            return_exceptions=True
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """live/peak 연결 수와 IP별 분포"""
+        return {
+            "live": self.live,
+            "peak": self.peak,
+            "max_connections": self.max_connections,
+            "max_per_ip": self.max_per_ip,
+            "per_ip": dict(self._per_ip),
+            "accepting": self.accepting,
+        }
+
+
+# 전역 연결 관리자
+connection_manager = ConnectionManager()
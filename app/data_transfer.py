@@ -0,0 +1,179 @@
+"""
+NDJSON 내보내기/가져오기
+
+어휘, 채팅 세션, 북마크를 한 줄에 레코드 하나인 NDJSON으로 주고받습니다.
+내보내기는 저장소에서 작은 묶음씩 꺼내 직렬화해 바로 흘려보내고,
+가져오기는 업로드 본문을 읽는 대로 줄 단위로 잘라 IMPORT_BATCH_SIZE줄마다
+검증한 뒤 배치당 파일 저장 한 번으로 반영합니다.
+어느 쪽이든 응답/요청 전체를 메모리에 올리지 않으므로 대용량 백업·이전에도 메모리가 튀지 않습니다.
+(직렬화/검증은 저장소 스레드 풀에서 실행)
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from .bookmark_storage import bookmark_storage
+from .chat_storage import chat_storage
+from .metrics import registry
+from .models import BookmarkEntry, ChatSession, VocabularyEntry
+from .storage import storage
+from .storage_executor import run_storage
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+TRANSFER_MODELS = {
+    "vocabulary": VocabularyEntry,
+    "sessions": ChatSession,
+    "bookmarks": BookmarkEntry,
+}
+# 내보내기 시 한 번에 직렬화해 보내는 레코드 수
+EXPORT_CHUNK_SIZE = 200
+# 가져오기 시 한 번에 검증하고 저장하는 줄 수
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+# 한 줄(레코드 하나)의 최대 크기 (줄바꿈 없는 거대한 본문으로 메모리를 채우지 않도록)
+IMPORT_MAX_LINE_BYTES = int(os.getenv("IMPORT_MAX_LINE_BYTES", str(1024 * 1024)))
+# 응답에 포함할 오류 줄 수
+IMPORT_MAX_ERRORS = 20
+
+data_transfer_records = registry.counter(
+    "data_transfer_records_total",
+    "NDJSON 내보내기/가져오기 레코드 수",
+    labelnames=("kind", "direction", "result")
+)
+
+
+class LineTooLong(ValueError):
+    def __init__(self, line_no: int, limit: int):
+        super().__init__(f"{line_no}번째 줄이 {limit}바이트를 넘습니다")
+        self.line_no = line_no
+
+
+def export_filename(kind: str) -> str:
+    return f"{kind}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.ndjson"
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_records(records: List[Any]) -> bytes:
+    """모델 목록 → NDJSON 바이트 (레코드마다 한 줄)"""
+    return "".join(
+        json.dumps(record.dict(), ensure_ascii=False, default=_json_default) + "\n" for record in records
+    ).encode("utf-8")
+
+
+async def _record_page(kind: str, offset: int, limit: int) -> List[Any]:
+    if kind == "vocabulary":
+        return await storage.get_page_async(offset, limit)
+    if kind == "sessions":
+        return await chat_storage.get_page_async(offset, limit)
+    return await bookmark_storage.get_page_async(offset, limit)
+
+
+async def export_ndjson(kind: str, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """kind의 모든 레코드를 저장 순서대로 chunk_size개씩 꺼내 NDJSON 묶음으로 생성 (StreamingResponse 본문용)
+
+    전체 목록을 한 번에 올리지 않으므로, 내보내는 도중에 추가된 레코드는 포함될 수 있고
+    삭제되면 뒤 레코드 하나가 빠질 수 있음 (시점 일관 백업이 필요하면 쓰기를 멈춘 뒤 내보낼 것)
+    """
+    total = 0
+    while True:
+        records = await _record_page(kind, total, chunk_size)
+        if not records:
+            break
+        yield await run_storage(encode_records, records)
+        total += len(records)
+        if len(records) < chunk_size:
+            break
+    data_transfer_records.inc(kind, "export", "ok", amount=total)
+    logger.info(f"📤 NDJSON 내보내기 완료: {kind} {total}건")
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes],
+                            max_line_bytes: int = IMPORT_MAX_LINE_BYTES) -> AsyncIterator[Tuple[int, bytes]]:
+    """바이트 묶음 스트림을 (줄 번호, 줄) 로 나눔 (빈 줄은 건너뜀)"""
+    buffer = bytearray()
+    line_no = 0
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            line_no += 1
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if line:
+                yield line_no, line
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise LineTooLong(line_no + 1, max_line_bytes)
+    line = bytes(buffer).strip()
+    if line:
+        yield line_no + 1, line
+
+
+def decode_batch(kind: str, lines: List[Tuple[int, bytes]]) -> Tuple[List[Any], List[Dict]]:
+    """줄 묶음을 검증해 (모델 목록, 오류 목록) 반환"""
+    model = TRANSFER_MODELS[kind]
+    records: List[Any] = []
+    errors: List[Dict] = []
+    for line_no, line in lines:
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("JSON 객체가 아닙니다")
+            records.append(model(**data))
+        except Exception as e:
+            errors.append({"line": line_no, "error": str(e).splitlines()[0][:200] if str(e) else type(e).__name__})
+    return records, errors
+
+
+async def _apply_records(kind: str, records: List[Any]) -> int:
+    if kind == "vocabulary":
+        await storage.apply_async([("save", record) for record in records])
+        return len(records)
+    if kind == "sessions":
+        return await chat_storage.import_sessions_async(records)
+    return await bookmark_storage.import_bookmarks_async(records)
+
+
+async def import_ndjson(kind: str, chunks: AsyncIterator[bytes], batch_size: int = IMPORT_BATCH_SIZE) -> Dict:
+    """
+    NDJSON 스트림을 batch_size줄씩 검증·저장하고 결과 요약 반환.
+    같은 키(단어/세션 ID/북마크 ID)의 레코드는 교체하며, 잘못된 줄은 건너뛰고 errors에 기록합니다.
+    줄이 너무 길면 거기서 멈추고 aborted에 이유를 남깁니다 (이미 저장된 배치는 유지).
+    """
+    summary: Dict[str, Any] = {"kind": kind, "imported": 0, "failed": 0, "batches": 0, "errors": [], "aborted": None}
+    batch: List[Tuple[int, bytes]] = []
+
+    async def flush() -> None:
+        records, errors = await run_storage(decode_batch, kind, list(batch))
+        batch.clear()
+        if records:
+            summary["imported"] += await _apply_records(kind, records)
+            summary["batches"] += 1
+        summary["failed"] += len(errors)
+        summary["errors"].extend(errors[:max(0, IMPORT_MAX_ERRORS - len(summary["errors"]))])
+
+    try:
+        async for line in iter_ndjson_lines(chunks):
+            batch.append(line)
+            if len(batch) >= batch_size:
+                await flush()
+    except LineTooLong as e:
+        summary["aborted"] = str(e)
+    if batch:
+        await flush()
+
+    data_transfer_records.inc(kind, "import", "ok", amount=summary["imported"])
+    data_transfer_records.inc(kind, "import", "invalid", amount=summary["failed"])
+    logger.info(f"📥 NDJSON 가져오기: {kind} {summary['imported']}건 저장, {summary['failed']}건 실패")
+    return summary
@@ -0,0 +1,115 @@
+"""
+프로세스 간 파일 잠금과 원자적 저장
+
+웹 앱과 텔레그램 봇 프로세스(또는 여러 uvicorn 워커)가 같은 JSON 파일을 함께 쓰기 때문에,
+읽기-수정-쓰기 구간을 `<파일>.lock` 옆 파일에 대한 권고 잠금(flock)으로 보호합니다.
+fcntl이 없는 플랫폼(Windows)에서는 잠금 없이 동작합니다.
+
+파일은 같은 디렉터리의 임시 파일에 쓰고 fsync한 뒤 os.replace로 교체하므로,
+쓰는 도중 프로세스가 죽어도 기존 파일이 잘린 채로 남지 않고 읽는 쪽은 잠금 없이
+항상 완전한 이전 또는 새 파일을 보게 됩니다.
+"""
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .metrics import registry
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+file_lock_wait = registry.histogram(
+    "storage_lock_wait_seconds",
+    "저장 파일 잠금을 얻기까지 기다린 시간",
+    labelnames=("file", "mode")
+)
+
+
+def lock_path_for(path: str) -> str:
+    return f"{path}.lock"
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """
+    path에 대한 프로세스 간 권고 잠금.
+    shared=True면 읽기용 공유 잠금, 아니면 쓰기용 배타 잠금입니다.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    mode = "shared" if shared else "exclusive"
+    started = time.perf_counter()
+    fd = os.open(lock_path_for(path), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        file_lock_wait.observe(time.perf_counter() - started, os.path.basename(path), mode)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def file_signature(path: str):
+    """다른 프로세스의 변경을 감지하기 위한 (inode, mtime, 크기) (파일이 없으면 None)"""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_ino, info.st_mtime_ns, info.st_size
+
+
+def _fsync_directory(directory: str) -> None:
+    """rename 결과가 디스크에 남도록 디렉터리 항목 동기화 (지원하지 않는 플랫폼은 건너뜀)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: str, data, **dump_kwargs) -> None:
+    """
+    data를 JSON으로 임시 파일에 쓰고 fsync 후 path로 교체합니다.
+    직렬화나 쓰기가 실패하면 임시 파일을 지우고 예외를 그대로 올리며, 기존 파일은 바뀌지 않습니다.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp는 0600으로 만들기 때문에 기존 파일 권한을 이어받음
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except OSError:
+            mode = 0o644
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
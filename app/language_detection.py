@@ -0,0 +1,149 @@
+"""
+한국어/러시아어 언어 감지
+
+터미널(비율 기반 감지)과 AI 서비스(번역 방향 결정)가 같은 문자 집계와 같은 판단 규칙을 씁니다.
+요청당 한 번만 감지하고, 결과(입력 언어)를 AI 서비스까지 그대로 전달하는 것을 전제로 합니다.
+문자 집계는 정규식 여러 번 대신 코드 포인트 범위로 한 번만 훑습니다.
+"""
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+KOREAN = "korean"
+RUSSIAN = "russian"
+
+# 비율이 이 값을 넘으면 해당 언어로 판단
+LANGUAGE_RATIO_THRESHOLD = 0.7
+
+# 코드 포인트 범위
+HANGUL_SYLLABLES = (0xAC00, 0xD7A3)  # 가-힣
+HANGUL_JAMO = (0x3131, 0x3163)  # 호환 자모 ㄱ-ㅎ, ㅏ-ㅣ
+RUSSIAN_LETTERS = (0x0410, 0x044F)  # А-Я, а-я
+RUSSIAN_YO = (0x0401, 0x0451)  # Ё, ё
+
+
+class LanguageDetectionResult(BaseModel):
+    """언어 감지 결과"""
+    language: str  # korean, russian, mixed, unknown
+    confidence: float  # 0.0 ~ 1.0
+    text: str
+    should_translate_to: Optional[str] = None
+    forced_language: Optional[str] = None
+
+
+class ScriptCounts(NamedTuple):
+    """문자 종류별 개수"""
+    hangul_syllables: int
+    hangul_jamo: int
+    cyrillic: int  # 러시아어 자모 (а-я, ё, 대문자 포함)
+    other_word: int  # 그 외 문자/숫자/밑줄 (영문, 숫자, ї 같은 다른 키릴 문자 등)
+    word: int  # 단어 문자 전체 (정규식 \w와 같은 기준)
+
+    @property
+    def hangul(self) -> int:
+        return self.hangul_syllables + self.hangul_jamo
+
+
+def count_scripts(text: str) -> ScriptCounts:
+    """코드 포인트 범위로 한 번만 훑어 한글 음절/자모, 러시아어 자모, 그 외 단어 문자 수 집계"""
+    syllables = jamo = cyrillic = other_word = 0
+    syllable_start, syllable_end = HANGUL_SYLLABLES
+    jamo_start, jamo_end = HANGUL_JAMO
+    russian_start, russian_end = RUSSIAN_LETTERS
+
+    for char in text:
+        code = ord(char)
+        if syllable_start <= code <= syllable_end:
+            syllables += 1
+        elif jamo_start <= code <= jamo_end:
+            jamo += 1
+        elif russian_start <= code <= russian_end or code in RUSSIAN_YO:
+            cyrillic += 1
+        elif char.isalnum() or char == "_":
+            other_word += 1
+
+    return ScriptCounts(
+        hangul_syllables=syllables,
+        hangul_jamo=jamo,
+        cyrillic=cyrillic,
+        other_word=other_word,
+        word=syllables + jamo + cyrillic + other_word,
+    )
+
+
+def count_scripts_batch(texts: Iterable[str]) -> List[ScriptCounts]:
+    """여러 텍스트의 문자 수 집계 (입력 순서대로 반환)"""
+    return [count_scripts(text) for text in texts]
+
+
+def _target_of(language: str) -> str:
+    return KOREAN if language == RUSSIAN else RUSSIAN
+
+
+def _classify(counts: ScriptCounts) -> Tuple[str, float]:
+    """문자 집계 → (언어, 신뢰도). korean/russian은 비율이 임계값을 넘을 때만, 둘 다 있으면 mixed"""
+    if counts.word == 0:
+        return "unknown", 0.0
+    korean_ratio = counts.hangul / counts.word
+    russian_ratio = counts.cyrillic / counts.word
+    if korean_ratio > LANGUAGE_RATIO_THRESHOLD:
+        return KOREAN, korean_ratio
+    if russian_ratio > LANGUAGE_RATIO_THRESHOLD:
+        return RUSSIAN, russian_ratio
+    if korean_ratio > 0 and russian_ratio > 0:
+        return "mixed", max(korean_ratio, russian_ratio)
+    return "unknown", 0.0
+
+
+def detect_language(text: str, forced_language: Optional[str] = None) -> LanguageDetectionResult:
+    """
+    입력 텍스트의 언어를 감지합니다.
+
+    Args:
+        text: 분석할 텍스트
+        forced_language: 강제할 입력 언어 (korean/russian, 선택사항)
+
+    Returns:
+        LanguageDetectionResult: 언어 감지 결과
+    """
+    cleaned_text = text.strip()
+
+    # 빈 입력 처리
+    if not cleaned_text:
+        return LanguageDetectionResult(language="unknown", confidence=0.0, text=text)
+
+    # 강제 모드 처리
+    if forced_language in (KOREAN, RUSSIAN):
+        return LanguageDetectionResult(
+            language=forced_language,
+            confidence=1.0,
+            text=text,
+            forced_language=forced_language,
+            should_translate_to=_target_of(forced_language)
+        )
+
+    language, confidence = _classify(count_scripts(cleaned_text))
+    return LanguageDetectionResult(
+        language=language,
+        confidence=confidence,
+        text=text,
+        should_translate_to=_target_of(language) if language in (KOREAN, RUSSIAN) else None
+    )
+
+
+def detect_languages(texts: Iterable[str], forced_language: Optional[str] = None) -> List[LanguageDetectionResult]:
+    """여러 텍스트의 언어를 한 번에 감지 (입력 순서대로 반환)"""
+    return [detect_language(text, forced_language) for text in texts]
+
+
+def source_language(text: str) -> str:
+    """
+    AI 번역 방향을 정할 입력 언어 (항상 korean/russian 중 하나).
+    detect_language와 같은 규칙으로 판단하고, 그 결과가 korean/russian이면 그대로 씁니다.
+    mixed/unknown이면 러시아어 자모가 한글보다 많을 때만 러시아어, 그 외(영어/숫자만 등)는 한국어로 처리합니다.
+    """
+    counts = count_scripts(text.strip())
+    language, _ = _classify(counts)
+    if language in (KOREAN, RUSSIAN):
+        return language
+    return RUSSIAN if counts.cyrillic > counts.hangul else KOREAN
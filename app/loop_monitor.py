@@ -0,0 +1,258 @@
+"""
+이벤트 루프 지연(lag) 측정과 느린 콜백 보고
+
+일정 간격으로 asyncio.sleep을 걸어 두고 예정 시각보다 얼마나 늦게 깨어났는지 기록합니다.
+이 값이 곧 그 사이 루프를 막고 있던 동기 코드(파일 I/O, JSON 직렬화 등)의 길이입니다.
+
+감시 스레드는 예정 시각이 임계값 이상 지났는데도 루프가 깨어나지 않으면 루프가 막혀 있는
+그 순간 루프 스레드의 호출 스택과 실행 중인 태스크(코루틴, 라우트)를 기록합니다.
+기록은 크기 제한 로그(recent_slow_callbacks)와 메트릭으로 남습니다.
+라우트는 task_label()로 HTTP 요청/텔레그램 업데이트를 처리하는 태스크에 붙여 둔 이름입니다.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Union
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# 측정 간격 (초)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.25"))
+# 이 시간(초) 이상 루프를 막으면 느린 콜백으로 보고
+SLOW_CALLBACK_THRESHOLD = float(os.getenv("SLOW_CALLBACK_THRESHOLD", "0.1"))
+# 보관할 느린 콜백 기록 수
+SLOW_CALLBACK_LOG_SIZE = int(os.getenv("SLOW_CALLBACK_LOG_SIZE", "50"))
+# 기록할 스택 프레임 수 (가장 안쪽부터)
+SLOW_CALLBACK_STACK_DEPTH = 15
+
+event_loop_lag = registry.gauge(
+    "event_loop_lag_seconds",
+    "마지막 측정의 이벤트 루프 지연",
+    labelnames=("loop",)
+)
+event_loop_lag_max = registry.gauge(
+    "event_loop_lag_max_seconds",
+    "모니터 시작 이후 최대 이벤트 루프 지연",
+    labelnames=("loop",)
+)
+event_loop_lag_samples = registry.histogram(
+    "event_loop_lag_sample_seconds",
+    "이벤트 루프 지연 측정값 분포",
+    labelnames=("loop",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+slow_callbacks = registry.counter(
+    "event_loop_slow_callbacks_total",
+    "임계값 이상 이벤트 루프를 막은 콜백 수",
+    labelnames=("loop", "route")
+)
+slow_callback_duration = registry.histogram(
+    "event_loop_slow_callback_seconds",
+    "느린 콜백이 이벤트 루프를 막은 시간",
+    labelnames=("loop",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+# 태스크 → 라우트 이름 (문자열 또는 보고 시점에 이름을 계산하는 함수)
+TaskLabel = Union[str, Callable[[], str]]
+_task_labels: Dict[asyncio.Task, TaskLabel] = {}
+
+_slow_callback_log: Deque[Dict] = deque(maxlen=SLOW_CALLBACK_LOG_SIZE)
+_slow_callback_lock = threading.Lock()
+
+
+@contextmanager
+def task_label(label: TaskLabel) -> Iterator[None]:
+    """현재 태스크가 처리 중인 라우트 이름을 느린 콜백 보고에 쓰도록 등록"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is None:
+        yield
+        return
+    previous = _task_labels.get(task)
+    _task_labels[task] = label
+    try:
+        yield
+    finally:
+        if previous is None:
+            _task_labels.pop(task, None)
+        else:
+            _task_labels[task] = previous
+
+
+def label_for(task: Optional[asyncio.Task]) -> Optional[str]:
+    label = _task_labels.get(task) if task is not None else None
+    if callable(label):
+        try:
+            return label()
+        except Exception:
+            return None
+    return label
+
+
+def recent_slow_callbacks(limit: int = SLOW_CALLBACK_LOG_SIZE) -> List[Dict]:
+    """최근 느린 콜백 기록 (최신순)"""
+    with _slow_callback_lock:
+        records = list(_slow_callback_log)
+    return [dict(record) for record in reversed(records[-limit:])] if limit > 0 else []
+
+
+def _format_stack(frame) -> List[str]:
+    lines = []
+    while frame is not None and len(lines) < SLOW_CALLBACK_STACK_DEPTH:
+        code = frame.f_code
+        lines.append(f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}")
+        frame = frame.f_back
+    return list(reversed(lines))
+
+
+class LoopLagMonitor:
+    """
+    실행 중인 이벤트 루프의 지연을 주기적으로 측정 (name은 메트릭 loop 레이블).
+    watchdog=True면 감시 스레드가 threshold 이상 막힌 순간의 스택을 기록합니다.
+    """
+
+    def __init__(self, name: str, interval: float = LOOP_LAG_INTERVAL,
+                 threshold: float = SLOW_CALLBACK_THRESHOLD, watchdog: bool = True):
+        self.name = name
+        self.interval = interval
+        self.threshold = threshold
+        self.watchdog = watchdog
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.samples = 0
+        self.slow_callbacks = 0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        # 다음에 루프가 깨어나야 하는 시각 (time.monotonic 기준)
+        self._deadline = float("inf")
+        # 감시 스레드가 기록한, 아직 끝나지 않은 차단 구간
+        self._stall: Optional[Dict] = None
+        self._stall_lock = threading.Lock()
+        self._stop_watchdog = threading.Event()
+        self._watchdog_thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """현재 루프에서 측정 시작 (이미 실행 중이면 무시)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._deadline = time.monotonic() + self.interval
+        self._task = self._loop.create_task(self._run())
+        if self.watchdog:
+            self._stop_watchdog.clear()
+            self._watchdog_thread = threading.Thread(
+                target=self._watch, name=f"loop-watchdog-{self.name}", daemon=True
+            )
+            self._watchdog_thread.start()
+
+    async def stop(self) -> None:
+        self._stop_watchdog.set()
+        if self._watchdog_thread is not None:
+            self._watchdog_thread.join(timeout=1)
+            self._watchdog_thread = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._deadline = float("inf")
+
+    def record(self, lag: float) -> None:
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+        event_loop_lag.set(lag, self.name)
+        event_loop_lag_max.set(self.max_lag, self.name)
+        event_loop_lag_samples.observe(lag, self.name)
+
+        with self._stall_lock:
+            stall, self._stall = self._stall, None
+        if stall is not None:
+            # 감시 스레드가 차단 중에 기록한 항목에 실제 차단 시간 채움
+            stall["blocked_seconds"] = round(lag, 4)
+            slow_callback_duration.observe(lag, self.name)
+            logger.warning(
+                f"🐢 이벤트 루프 차단 {lag * 1000:.0f}ms ({self.name}): "
+                f"{stall['route'] or stall['coroutine']} @ {stall['stack'][-1] if stall['stack'] else '?'}"
+            )
+        elif lag >= self.threshold:
+            # 감시 주기 사이에 끝난 차단 (스택 없이 기록)
+            self._report(lag, None, [])
+            slow_callback_duration.observe(lag, self.name)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._deadline = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def _watch(self) -> None:
+        poll = max(0.001, min(self.interval, self.threshold) / 2)
+        reported_deadline = None
+        while not self._stop_watchdog.wait(poll):
+            deadline = self._deadline
+            overdue = time.monotonic() - deadline
+            if overdue < self.threshold or deadline == reported_deadline:
+                continue
+            reported_deadline = deadline
+            frame = sys._current_frames().get(self._loop_thread_id)
+            try:
+                task = asyncio.current_task(self._loop)
+            except RuntimeError:
+                task = None
+            record = self._report(overdue, task, _format_stack(frame) if frame is not None else [])
+            with self._stall_lock:
+                self._stall = record
+
+    def _report(self, blocked: float, task: Optional[asyncio.Task], stack: List[str]) -> Dict:
+        coroutine = None
+        if task is not None:
+            coro = task.get_coro()
+            coroutine = getattr(coro, "__qualname__", None) or repr(coro)
+        route = label_for(task)
+        record = {
+            "loop": self.name,
+            "detected_at": datetime.now().isoformat(),
+            "blocked_seconds": round(blocked, 4),
+            "task": task.get_name() if task is not None else None,
+            "coroutine": coroutine,
+            "route": route,
+            "stack": stack,
+        }
+        with _slow_callback_lock:
+            _slow_callback_log.append(record)
+        self.slow_callbacks += 1
+        slow_callbacks.inc(self.name, route or "unknown")
+        return record
+
+    def snapshot(self) -> dict:
+        return {
+            "loop": self.name,
+            "interval_seconds": self.interval,
+            "slow_callback_threshold_seconds": self.threshold,
+            "last_lag_seconds": round(self.last_lag, 6),
+            "max_lag_seconds": round(self.max_lag, 6),
+            "samples": self.samples,
+            "slow_callbacks": self.slow_callbacks,
+        }
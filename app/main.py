@@ -1,27 +1,47 @@
-from fastapi import FastAPI, HTTPException, Request, Form, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Form, WebSocket, WebSocketDisconnect, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
-from typing import List
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from typing import Dict, List, Optional
+import asyncio
 import logging
 import os
 import json
+import time
 
 from .models import (
     VocabularyRequest, VocabularyResponse, VocabularyEntry,
     ChatRequest, ChatResponse, ChatMessage, ChatSession, SessionListResponse,
     BookmarkRequest, BookmarkResponse, BookmarkListResponse, BookmarkEntry
 )
-from .ai_service import generate_vocabulary_entry, generate_vocabulary_fallback
+from .ai_service import generate_vocabulary_entry, generate_vocabulary_fallback, generation_cache
 from .storage import storage
 from .chat_storage import chat_storage
 from .bookmark_storage import bookmark_storage
 from .terminal_service import (
     parse_terminal_command, 
     process_terminal_translation,
+    process_terminal_batch,
     format_terminal_response,
-    TranslationMode
+    static_command_frame,
+    command_error_frame,
+    TranslationMode,
+    TranslationHistory,
+    history_store,
+    TERMINAL_BATCH_MAX_ITEMS
 )
+from .timing import RequestTimingMiddleware, stage_timer
+from .metrics import registry, RateMeter
+from .admin import ADMIN_TOKEN_HEADER, is_admin_token, require_admin
+from .profiling import ProfilingMiddleware, RequestProfile, profile_store
+from .memory_report import build_memory_report, register_memory_source, tracemalloc_session
+from .ws_codec import CODEC_JSON, CODEC_MSGPACK, negotiate_codec, encode_frame, decode_frame, add_request_id
+from .connection_manager import (
+    connection_manager, client_ip, websocket_rejected, CLOSE_TRY_AGAIN_LATER
+)
+from .loop_monitor import LoopLagMonitor, recent_slow_callbacks
+from .data_transfer import NDJSON_MEDIA_TYPE, TRANSFER_MODELS, export_filename, export_ndjson, import_ndjson
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -34,6 +54,58 @@ app = FastAPI(
     version="0.1.6"
 )
 
+# 관리자 요청 단위 프로파일링 (X-Admin-Token + X-Profile 헤더)
+app.add_middleware(ProfilingMiddleware)
+# 요청 단계별 시간 측정 (Server-Timing 헤더, 라우트별 지연 히스토그램)
+app.add_middleware(RequestTimingMiddleware)
+
+# 메트릭 정의
+vocabulary_cache_requests = registry.counter(
+    "vocabulary_cache_requests_total",
+    "저장된 어휘 재사용(캐시) 조회 결과",
+    labelnames=("result",)
+)
+registry.gauge(
+    "vocabulary_cache_hit_ratio",
+    "저장된 어휘 재사용 비율",
+    callback=lambda: _cache_hit_ratio()
+)
+websocket_connections = registry.gauge(
+    "websocket_connections",
+    "현재 연결된 터미널 WebSocket 수"
+)
+websocket_messages = registry.counter(
+    "websocket_messages_total",
+    "터미널 WebSocket 메시지 수",
+    labelnames=("direction",)
+)
+terminal_cancelled = registry.counter(
+    "terminal_translations_cancelled_total",
+    "취소된 터미널 번역 작업 수 (client: cancel 메시지, superseded: latest-wins 대체)",
+    labelnames=("reason",)
+)
+websocket_message_rate = RateMeter(window=60.0)
+registry.gauge(
+    "websocket_messages_per_second",
+    "최근 60초간 터미널 WebSocket 초당 메시지 수 (수신+송신)",
+    callback=websocket_message_rate.rate
+)
+registry.gauge("chat_sessions", "메모리에 로드된 채팅 세션 수", callback=lambda: len(chat_storage.sessions))
+registry.gauge("bookmarks", "메모리에 로드된 북마크 수", callback=lambda: len(bookmark_storage.bookmarks))
+registry.gauge("vocabulary_entries", "저장된 어휘 수", callback=lambda: storage.count())
+registry.gauge("ai_generation_cache_entries", "AI 생성 결과 캐시 항목 수", callback=lambda: len(generation_cache))
+
+# 메모리 리포트 대상
+register_memory_source("chat_sessions", lambda: chat_storage.sessions)
+register_memory_source("bookmarks", lambda: bookmark_storage.bookmarks)
+register_memory_source("terminal_histories", lambda: history_store)
+register_memory_source("ai_generation_cache", lambda: generation_cache)
+
+def _cache_hit_ratio() -> float:
+    hits = vocabulary_cache_requests.value("hit")
+    total = hits + vocabulary_cache_requests.value("miss")
+    return hits / total if total else 0.0
+
 # 정적 파일 및 템플릿 설정
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
@@ -95,14 +167,17 @@ async def generate_vocabulary(request: VocabularyRequest):
         logger.info(f"어휘 생성 요청: {korean_word}")
         
         # 1차: 원본 단어로 기존 저장된 어휘 확인
-        existing_entry = storage.get_by_word(korean_word)
+        existing_entry = await storage.get_by_word_async(korean_word)
         if existing_entry:
+            vocabulary_cache_requests.inc("hit")
             logger.info(f"기존 어휘 반환 (원본): {korean_word}")
             return VocabularyResponse(success=True, data=existing_entry)
+        vocabulary_cache_requests.inc("miss")
         
         # 2차: AI 어휘 생성 및 맞춤법 교정
         try:
-            vocabulary_entry = await generate_vocabulary_entry(korean_word)
+            with stage_timer("ai_generate"):
+                vocabulary_entry = await generate_vocabulary_entry(korean_word)
             logger.info(f"PydanticAI로 어휘 생성 성공: {korean_word}")
         except Exception as e:
             logger.warning(f"PydanticAI 실패, 백업 함수 사용: {e}")
@@ -111,13 +186,13 @@ async def generate_vocabulary(request: VocabularyRequest):
         # 3차: 교정된 단어로 기존 어휘 재확인 (API 효율성 개선)
         corrected_word = vocabulary_entry.spelling_check.corrected_word if vocabulary_entry.spelling_check else None
         if corrected_word and corrected_word != korean_word:
-            existing_corrected = storage.get_by_word(corrected_word)
+            existing_corrected = await storage.get_by_word_async(corrected_word)
             if existing_corrected:
                 logger.info(f"기존 어휘 반환 (교정됨): {korean_word} -> {corrected_word}")
                 return VocabularyResponse(success=True, data=existing_corrected)
         
         # 4차: 새로운 어휘 저장 (교정된 단어 기준)
-        saved_entry = storage.save(vocabulary_entry)
+        saved_entry = await storage.save_async(vocabulary_entry)
         logger.info(f"어휘 저장 완료: {korean_word} -> {corrected_word or korean_word}")
         
         return VocabularyResponse(success=True, data=saved_entry)
@@ -147,17 +222,20 @@ async def generate_vocabulary_htmx(request: Request, korean_word: str = Form(...
         logger.info(f"HTMX 어휘 생성 요청: {korean_word}")
         
         # 기존 로직과 동일
-        existing_entry = storage.get_by_word(korean_word)
+        existing_entry = await storage.get_by_word_async(korean_word)
         if existing_entry:
+            vocabulary_cache_requests.inc("hit")
             logger.info(f"기존 어휘 반환 (원본): {korean_word}")
             return templates.TemplateResponse(
                 "partials/vocabulary_card.html",
                 {"request": request, "vocabulary": existing_entry}
             )
+        vocabulary_cache_requests.inc("miss")
         
         # AI 어휘 생성
         try:
-            vocabulary_entry = await generate_vocabulary_entry(korean_word)
+            with stage_timer("ai_generate"):
+                vocabulary_entry = await generate_vocabulary_entry(korean_word)
             logger.info(f"PydanticAI로 어휘 생성 성공: {korean_word}")
         except Exception as e:
             logger.warning(f"PydanticAI 실패, 백업 함수 사용: {e}")
@@ -166,7 +244,7 @@ async def generate_vocabulary_htmx(request: Request, korean_word: str = Form(...
         # 교정된 단어 재확인
         corrected_word = vocabulary_entry.spelling_check.corrected_word if vocabulary_entry.spelling_check else None
         if corrected_word and corrected_word != korean_word:
-            existing_corrected = storage.get_by_word(corrected_word)
+            existing_corrected = await storage.get_by_word_async(corrected_word)
             if existing_corrected:
                 logger.info(f"기존 어휘 반환 (교정됨): {korean_word} -> {corrected_word}")
                 return templates.TemplateResponse(
@@ -175,7 +253,7 @@ async def generate_vocabulary_htmx(request: Request, korean_word: str = Form(...
                 )
         
         # 새로운 어휘 저장
-        saved_entry = storage.save(vocabulary_entry)
+        saved_entry = await storage.save_async(vocabulary_entry)
         logger.info(f"어휘 저장 완료: {korean_word} -> {corrected_word or korean_word}")
         
         return templates.TemplateResponse(
@@ -194,7 +272,7 @@ async def generate_vocabulary_htmx(request: Request, korean_word: str = Form(...
 async def get_vocabulary_list_htmx(request: Request):
     """HTMX를 위한 어휘 목록 엔드포인트 - HTML 응답"""
     try:
-        vocabulary_list = storage.load_all()
+        vocabulary_list = await storage.load_all_async()
         vocabulary_list.sort(key=lambda x: x.created_at or "", reverse=True)
         return templates.TemplateResponse(
             "partials/vocabulary_list.html",
@@ -212,7 +290,7 @@ async def save_vocabulary_htmx(request: Request, word: str = Form(...)):
     """HTMX를 위한 어휘 저장 엔드포인트"""
     try:
         # 어휘가 이미 저장되어 있는지 확인
-        existing_entry = storage.get_by_word(word)
+        existing_entry = await storage.get_by_word_async(word)
         if existing_entry:
             return templates.TemplateResponse(
                 "partials/notification.html",
@@ -236,7 +314,7 @@ async def save_vocabulary_htmx(request: Request, word: str = Form(...)):
 async def delete_vocabulary_htmx(word: str):
     """HTMX를 위한 어휘 삭제 엔드포인트"""
     try:
-        success = storage.delete(word)
+        success = await storage.delete_async(word)
         if success:
             logger.info(f"어휘 삭제 완료: {word}")
             return HTMLResponse("")  # 빈 응답으로 요소 제거
@@ -296,7 +374,7 @@ async def validate_input_htmx(request: Request, value: str = Form(...)):
 async def get_all_vocabulary():
     """저장된 모든 어휘 목록 반환"""
     try:
-        vocabulary_list = storage.load_all()
+        vocabulary_list = await storage.load_all_async()
         # 최신 순으로 정렬
         vocabulary_list.sort(key=lambda x: x.created_at or "", reverse=True)
         return vocabulary_list
@@ -304,11 +382,34 @@ async def get_all_vocabulary():
         logger.error(f"어휘 목록 조회 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="어휘 목록을 불러올 수 없습니다")
 
+@app.get("/api/export")
+async def export_data(kind: str = "vocabulary", format: str = "ndjson"):
+    """어휘/채팅 세션/북마크를 NDJSON으로 스트리밍 내보내기 (한 줄에 레코드 하나)"""
+    if kind not in TRANSFER_MODELS:
+        raise HTTPException(status_code=400, detail=f"kind는 {', '.join(TRANSFER_MODELS)} 중 하나여야 합니다")
+    if format != "ndjson":
+        raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다 (ndjson만 지원)")
+    return StreamingResponse(
+        export_ndjson(kind),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(kind)}"'}
+    )
+
+@app.post("/api/import", dependencies=[Depends(require_admin)])
+async def import_data(request: Request, kind: str = "vocabulary"):
+    """NDJSON 본문을 읽는 대로 배치 단위로 검증·저장 (같은 키는 교체, 잘못된 줄은 건너뜀)"""
+    if kind not in TRANSFER_MODELS:
+        raise HTTPException(status_code=400, detail=f"kind는 {', '.join(TRANSFER_MODELS)} 중 하나여야 합니다")
+    summary = await import_ndjson(kind, request.stream())
+    if summary["aborted"]:
+        return JSONResponse(status_code=413, content={"success": False, "data": summary, "error": summary["aborted"]})
+    return {"success": True, "data": summary}
+
 @app.get("/api/vocabulary/{word}")
 async def get_vocabulary_by_word(word: str):
     """특정 단어의 어휘 정보 반환"""
     try:
-        entry = storage.get_by_word(word)
+        entry = await storage.get_by_word_async(word)
         if not entry:
             raise HTTPException(status_code=404, detail="해당 단어를 찾을 수 없습니다")
         return entry
@@ -322,7 +423,7 @@ async def get_vocabulary_by_word(word: str):
 async def delete_vocabulary(word: str):
     """특정 단어 삭제"""
     try:
-        success = storage.delete(word)
+        success = await storage.delete_async(word)
         if not success:
             raise HTTPException(status_code=404, detail="해당 단어를 찾을 수 없습니다")
         return {"success": True, "message": f"'{word}' 단어가 삭제되었습니다"}
@@ -337,6 +438,129 @@ async def health_check():
     """서버 상태 확인"""
     return {"status": "healthy", "message": "한국어 어휘 학습 노트 서버 정상 동작중"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return PlainTextResponse(
+        registry.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+# 관리자 프로파일 조회
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """저장된 요청 프로파일 목록 (최신순)"""
+    return {"success": True, "profiles": profile_store.list_profiles()}
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def download_profile(profile_id: str, format: str = "pstats"):
+    """프로파일 다운로드 (format: pstats 또는 collapsed)"""
+    path = profile_store.path_for(profile_id, format)
+    if not path:
+        raise HTTPException(status_code=400, detail="잘못된 프로파일 ID 또는 형식입니다")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    return FileResponse(
+        path,
+        media_type="application/octet-stream" if format == "pstats" else "text/plain",
+        filename=os.path.basename(path)
+    )
+
+# 관리자 메모리 진단
+@app.get("/admin/memory", dependencies=[Depends(require_admin)])
+async def memory_report():
+    """메모리 상주 저장소/캐시/세션 크기 리포트"""
+    # 대형 객체 그래프 순회는 이벤트 루프 밖에서 실행
+    report = await asyncio.to_thread(build_memory_report)
+    return {"success": True, "data": report}
+
+@app.post("/admin/memory/tracemalloc/start", dependencies=[Depends(require_admin)])
+async def start_tracemalloc(nframes: int = 1):
+    """tracemalloc 기준 스냅샷 생성"""
+    result = tracemalloc_session.start(max(1, min(nframes, 25)))
+    return {"success": True, "data": result}
+
+@app.post("/admin/memory/tracemalloc/stop", dependencies=[Depends(require_admin)])
+async def stop_tracemalloc(limit: int = 25):
+    """기준 스냅샷과 비교한 파일/라인별 메모리 증가량 반환"""
+    result = await asyncio.to_thread(tracemalloc_session.stop, max(1, min(limit, 200)))
+    if result is None:
+        raise HTTPException(status_code=409, detail="시작된 tracemalloc 스냅샷이 없습니다")
+    return {"success": True, "data": result}
+
+# 관리자 WebSocket 연결 현황
+@app.get("/admin/connections", dependencies=[Depends(require_admin)])
+async def websocket_connection_report():
+    """터미널 WebSocket live/peak 연결 수와 IP별 분포"""
+    return {"success": True, "data": connection_manager.snapshot()}
+
+@app.on_event("shutdown")
+async def drain_websocket_connections():
+    """종료 시 남은 터미널 WebSocket을 정상 종료 코드로 닫음"""
+    await connection_manager.drain()
+
+# 이벤트 루프 지연 측정 및 느린 콜백 감시 (event_loop_lag_seconds{loop="app"})
+app_loop_monitor = LoopLagMonitor("app")
+
+@app.get("/admin/event-loop", dependencies=[Depends(require_admin)])
+async def event_loop_report(limit: int = 20):
+    """이벤트 루프 지연 현황과 최근 느린 콜백(라우트, 코루틴, 스택) 목록"""
+    return {
+        "success": True,
+        "data": {
+            "monitor": app_loop_monitor.snapshot(),
+            "slow_callbacks": recent_slow_callbacks(max(1, min(limit, 50))),
+        }
+    }
+
+@app.on_event("startup")
+async def start_loop_monitor():
+    app_loop_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_loop_monitor():
+    await app_loop_monitor.stop()
+
+# 텔레그램 웹훅 모드 (TELEGRAM_WEBHOOK_URL 설정 시 이 프로세스에서 봇 업데이트를 직접 처리)
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")
+# 웹훅 모드가 시작된 봇 인스턴스 (비활성화 시 None)
+telegram_webhook_bot = None
+
+@app.on_event("startup")
+async def start_telegram_webhook():
+    """웹훅 URL과 봇 토큰이 설정되어 있으면 웹훅 등록 및 업데이트 처리 시작"""
+    global telegram_webhook_bot
+    if not (TELEGRAM_WEBHOOK_URL and os.getenv("TELEGRAM_BOT_TOKEN")):
+        return
+    # 텔레그램 의존성이 없는 배포에서도 앱이 뜨도록 웹훅 모드에서만 import
+    from .telegram_bot import bot_instance
+    if await bot_instance.start_webhook():
+        telegram_webhook_bot = bot_instance
+
+@app.on_event("shutdown")
+async def stop_telegram_webhook():
+    global telegram_webhook_bot
+    if telegram_webhook_bot is not None:
+        await telegram_webhook_bot.stop_webhook()
+        telegram_webhook_bot = None
+
+@app.post("/telegram/webhook")
+async def telegram_webhook(request: Request):
+    """텔레그램 업데이트 수신 (큐에 넣은 뒤 바로 200 응답, 처리는 백그라운드)"""
+    bot = telegram_webhook_bot
+    if bot is None or not bot.webhook_active:
+        raise HTTPException(status_code=404, detail="웹훅 모드가 비활성화되어 있습니다")
+    if not bot.verify_webhook_secret(request.headers.get("X-Telegram-Bot-Api-Secret-Token")):
+        raise HTTPException(status_code=403, detail="웹훅 비밀 토큰이 올바르지 않습니다")
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 업데이트 형식입니다")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="잘못된 업데이트 형식입니다")
+    await bot.process_webhook_update(data)
+    return {"ok": True}
+
 # 터미널 인터페이스 관련 라우트들
 @app.get("/terminal", response_class=HTMLResponse)
 async def terminal_interface(request: Request):
@@ -346,63 +570,445 @@ async def terminal_interface(request: Request):
         {"request": request}
     )
 
+# 연결당 동시에 처리할 수 있는 번역 요청 수
+TERMINAL_MAX_IN_FLIGHT = int(os.getenv("TERMINAL_MAX_IN_FLIGHT", "4"))
+
 # WebSocket 세션 관리
 class TerminalSession:
-    def __init__(self):
+    def __init__(self, is_admin: bool = False, max_in_flight: Optional[int] = None, latest_wins: bool = False,
+                 history: Optional[TranslationHistory] = None, codec: str = CODEC_JSON):
         self.mode = TranslationMode.AUTO
+        # 프레임 형식 (msgpack이면 바이너리 프레임 + 박스 문자열 없는 구조화 응답)
+        self.codec = codec
         self.translation_count = 0
         self.command_count = 0
+        # 최근 번역 링 버퍼 (client_token이 있으면 재연결 시에도 이어짐)
+        self.history = history if history is not None else TranslationHistory()
+        self.cancelled_count = 0
+        # latest-wins 모드: 새 번역 요청이 오면 아직 끝나지 않은 이전 번역을 취소
+        self.latest_wins = latest_wins
+        # 관리자 토큰으로 연결된 경우 메시지 단위 프로파일링 허용
+        self.is_admin = is_admin
+        # 진행 중인 번역 작업 (request_id → Task)
+        self.max_in_flight = max_in_flight or TERMINAL_MAX_IN_FLIGHT
+        self.in_flight: Dict[str, asyncio.Task] = {}
+        self._next_request_number = 0
+        # 여러 작업이 동시에 응답을 보내므로 프레임 전송을 직렬화
+        self.send_lock = asyncio.Lock()
+    
+    @property
+    def structured(self) -> bool:
+        """미리 그린 터미널 박스 대신 구조화된 필드만 보내는지 여부"""
+        return self.codec == CODEC_MSGPACK
     
     def update_stats(self, message_type: str):
         if message_type == "translation":
             self.translation_count += 1
         elif message_type == "command":
             self.command_count += 1
+    
+    def new_request_id(self) -> str:
+        """클라이언트가 request_id를 보내지 않은 요청용 내부 ID"""
+        self._next_request_number += 1
+        return f"auto-{self._next_request_number}"
+    
+    def track(self, request_id: str, task: asyncio.Task) -> None:
+        """진행 중인 번역 작업 등록 (완료되면 자동 제거)"""
+        self.in_flight[request_id] = task
+        
+        def untrack(_):
+            if self.in_flight.get(request_id) is task:
+                del self.in_flight[request_id]
+        
+        task.add_done_callback(untrack)
+    
+    def cancel(self, request_id: str, reason: str = "client") -> bool:
+        """진행 중인 번역 작업 하나 취소 (없거나 이미 끝났으면 False)"""
+        task = self.in_flight.pop(request_id, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        self.cancelled_count += 1
+        terminal_cancelled.inc(reason)
+        return True
+    
+    def cancel_superseded(self) -> List[str]:
+        """latest-wins 모드에서 새 요청에 밀린 이전 번역들 취소 후 취소된 request_id 반환"""
+        return [request_id for request_id in list(self.in_flight)
+                if self.cancel(request_id, reason="superseded")]
+    
+    def cancel_all(self) -> None:
+        """연결 종료 시 남은 번역 작업 취소"""
+        for task in list(self.in_flight.values()):
+            task.cancel()
+        self.in_flight.clear()
 
-async def safe_send_message(websocket: WebSocket, message: dict):
-    """안전한 WebSocket 메시지 전송"""
+async def safe_send_message(websocket: WebSocket, message: dict, session: Optional[TerminalSession] = None):
+    """안전한 WebSocket 메시지 전송 (session이 있으면 협상된 형식으로, 동시 전송을 직렬화)"""
     try:
-        await websocket.send_text(json.dumps(message, ensure_ascii=False))
+        payload = encode_frame(message, session.codec if session is not None else CODEC_JSON)
+    except Exception as e:
+        logger.error(f"WebSocket 메시지 직렬화 실패: {e}")
+        return False
+    return await send_frame(websocket, payload, session)
+
+async def send_frame(websocket: WebSocket, payload, session: Optional[TerminalSession] = None):
+    """이미 직렬화된 프레임 전송 (str이면 텍스트, bytes면 바이너리 프레임)"""
+    try:
+        send = websocket.send_bytes if isinstance(payload, bytes) else websocket.send_text
+        if session is not None:
+            async with session.send_lock:
+                await send(payload)
+        else:
+            await send(payload)
+        websocket_messages.inc("out")
+        websocket_message_rate.mark()
         return True
     except Exception as e:
         logger.error(f"WebSocket 메시지 전송 실패: {e}")
         return False
 
+def cancelled_response(request_id: str, reason: str) -> dict:
+    """취소된 번역 요청에 대한 응답 프레임"""
+    return {
+        "type": "translation",
+        "success": False,
+        "cancelled": True,
+        "reason": reason,
+        "request_id": request_id
+    }
+
+def with_request_id(response: dict, message: dict) -> dict:
+    """요청에 request_id가 있으면 응답에 그대로 붙여서 반환"""
+    if "request_id" in message:
+        response["request_id"] = message["request_id"]
+    return response
+
+def translation_payload(session: TerminalSession, result: dict, typing_animation: bool = False) -> dict:
+    """번역 성공 응답 필드 (구조화 모드면 박스 문자열 대신 발음/예문 필드 포함)"""
+    if session.structured:
+        return {
+            "original": result.get("original"),
+            "translation": result.get("translation"),
+            "pronunciation": result.get("pronunciation"),
+            "examples": result.get("examples", [])
+        }
+    return {
+        "data": format_terminal_response(result, typing_animation=typing_animation),
+        "original": result.get("original"),
+        "translation": result.get("translation")
+    }
+
+def resolve_translation_mode(session: TerminalSession, message: dict) -> TranslationMode:
+    """요청의 mode 필드('session'이면 세션 모드)를 번역 모드로 변환"""
+    request_mode = message.get("mode", "auto")
+    if request_mode == "session":
+        return session.mode
+    return TranslationMode(request_mode) if request_mode in ["auto", "korean", "russian"] else session.mode
+
+async def run_terminal_translation(websocket: WebSocket, session: TerminalSession, message: dict):
+    """번역 요청 하나를 처리하고 결과 전송"""
+    text = message.get("text", "")
+    mode = resolve_translation_mode(session, message)
+    
+    # 번역 처리
+    started_at = time.perf_counter()
+    translation_result = await process_terminal_translation(text, mode)
+    session.history.record(text, translation_result, (time.perf_counter() - started_at) * 1000, mode.value)
+    
+    if translation_result["success"]:
+        response = {
+            "type": "translation",
+            "success": True,
+            **translation_payload(session, translation_result, typing_animation=True)
+        }
+        session.update_stats("translation")
+    else:
+        response = {
+            "type": "translation", 
+            "success": False,
+            "error": translation_result.get("error", "번역 실패")
+        }
+    
+    await safe_send_message(websocket, with_request_id(response, message), session)
+
+async def run_terminal_batch(websocket: WebSocket, session: TerminalSession, message: dict):
+    """translate_batch 요청 처리: 항목별 결과 프레임을 끝나는 대로 보내고 마지막에 요약 전송"""
+    mode = resolve_translation_mode(session, message)
+    
+    async def send_item(index: int, text: str, result: dict):
+        if text:
+            session.history.record(text, result, result.get("latency_ms", 0.0), mode.value)
+        if result["success"]:
+            response = {
+                "type": "batch_item",
+                "index": index,
+                "success": True,
+                "cached": result.get("cached", False),
+                **translation_payload(session, result)
+            }
+            session.update_stats("translation")
+        else:
+            response = {
+                "type": "batch_item",
+                "index": index,
+                "success": False,
+                "text": text,
+                "error": result.get("error", "번역 실패")
+            }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+    
+    summary = await process_terminal_batch(message["items"], mode, send_item)
+    await safe_send_message(websocket, with_request_id({
+        "type": "batch_summary",
+        "success": True,
+        "data": summary
+    }, message), session)
+
+async def start_terminal_translation(websocket: WebSocket, session: TerminalSession, message: dict, runner=run_terminal_translation):
+    """번역을 별도 작업으로 시작 (연결당 진행 중 번역 수 제한)"""
+    if len(session.in_flight) >= session.max_in_flight:
+        response = {
+            "type": "translation",
+            "success": False,
+            "error": f"진행 중인 번역이 너무 많습니다 (최대 {session.max_in_flight}개). 잠시 후 다시 시도해주세요."
+        }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+        return
+    request_id = str(message.get("request_id") or session.new_request_id())
+    if request_id in session.in_flight:
+        # 같은 ID로 덮어쓰면 이전 작업을 더 이상 취소할 수 없으므로 거절
+        response = {
+            "type": "translation",
+            "success": False,
+            "error": f"같은 request_id의 번역이 이미 진행 중입니다: {request_id}"
+        }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+        return
+    task = asyncio.create_task(runner(websocket, session, message))
+    session.track(request_id, task)
+
+async def handle_terminal_message(websocket: WebSocket, session: TerminalSession, message: dict, inline: bool = False):
+    """
+    터미널 메시지 하나를 타입별로 처리하고 응답 전송.
+    번역은 별도 작업으로 실행되어 수신 루프를 막지 않으며(inline=True면 완료까지 대기),
+    명령어와 통계 요청은 진행 중인 번역과 관계없이 즉시 응답합니다.
+    """
+    message_type = message.get("type")
+    text = message.get("text", "")
+    
+    # 메시지 타입별 처리
+    if message_type == "translate":
+        # 번역 요청 처리
+        if not text.strip():
+            response = {
+                "type": "translation",
+                "success": False,
+                "error": "빈 텍스트는 번역할 수 없습니다."
+            }
+            await safe_send_message(websocket, with_request_id(response, message), session)
+        elif inline:
+            await run_terminal_translation(websocket, session, message)
+        else:
+            if session.latest_wins:
+                for request_id in session.cancel_superseded():
+                    await safe_send_message(websocket, cancelled_response(request_id, "superseded"), session)
+            await start_terminal_translation(websocket, session, message)
+    
+    elif message_type == "translate_batch":
+        # 여러 단어 일괄 번역 (배치 전체가 진행 중 작업 하나로 취급되어 cancel 가능)
+        items = message.get("items")
+        if not isinstance(items, list) or not items:
+            error = "items에 번역할 텍스트 목록이 필요합니다."
+        elif len(items) > TERMINAL_BATCH_MAX_ITEMS:
+            error = f"한 번에 최대 {TERMINAL_BATCH_MAX_ITEMS}개까지 번역할 수 있습니다."
+        else:
+            error = None
+        
+        if error:
+            response = {"type": "batch_summary", "success": False, "error": error}
+            await safe_send_message(websocket, with_request_id(response, message), session)
+        elif inline:
+            await run_terminal_batch(websocket, session, message)
+        else:
+            await start_terminal_translation(websocket, session, message, runner=run_terminal_batch)
+    
+    elif message_type == "cancel":
+        # 진행 중인 번역 취소 (이미 끝났거나 없는 요청이면 cancel_result 실패 응답)
+        request_id = str(message.get("request_id", ""))
+        if session.cancel(request_id):
+            response = cancelled_response(request_id, "client")
+        else:
+            response = {
+                "type": "cancel_result",
+                "success": False,
+                "request_id": request_id,
+                "error": "진행 중인 번역이 없습니다."
+            }
+        await safe_send_message(websocket, response, session)
+    
+    elif message_type == "config":
+        # 세션 설정 변경 (현재는 latest_wins만 지원)
+        if "latest_wins" in message:
+            session.latest_wins = bool(message["latest_wins"])
+        response = {
+            "type": "config",
+            "success": True,
+            "data": {"latest_wins": session.latest_wins}
+        }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+    
+    elif message_type == "command":
+        # 명령어 처리
+        command_result = parse_terminal_command(text)
+        
+        if command_result is None:
+            payload = command_error_frame("명령어가 아닙니다. '/'로 시작해야 합니다.", session.codec)
+        elif command_result["type"] == "invalid":
+            payload = command_error_frame(command_result["error"], session.codec)
+        elif command_result["type"] in ("help", "clear", "mode"):
+            # 고정 응답: 미리 직렬화된 프레임 재사용
+            if command_result["type"] == "mode":
+                session.mode = TranslationMode(command_result["mode"])
+            payload = static_command_frame(command_result["type"], command_result.get("mode"), session.codec)
+            session.update_stats("command")
+        else:
+            # /history, /stats (details: 구조화 모드에서 박스 대신 보낼 필드)
+            if command_result["type"] == "history":
+                details = {"history": session.history.recent()}
+            else:
+                details = {"stats": session.history.stats()}
+            
+            response = {
+                "type": "command_result",
+                "success": True,
+                "command_type": command_result["type"]
+            }
+            if session.structured:
+                response.update(details)
+            else:
+                response["data"] = format_terminal_response(
+                    None, command_type=command_result["type"], **details
+                )
+            payload = encode_frame(response, session.codec)
+            session.update_stats("command")
+        
+        if "request_id" in message:
+            payload = add_request_id(payload, message["request_id"], session.codec)
+        await send_frame(websocket, payload, session)
+    
+    elif message_type == "ping":
+        # 클라이언트 하트비트
+        await safe_send_message(websocket, {"type": "pong"}, session)
+    
+    elif message_type == "pong":
+        # 서버 ping에 대한 응답 (수신 시각은 연결 관리자가 기록)
+        pass
+    
+    elif message_type == "get_stats":
+        # 통계 정보 (향후 구현)
+        response = {
+            "type": "stats",
+            "data": {
+                "translation_count": session.translation_count,
+                "command_count": session.command_count,
+                "current_mode": session.mode.value,
+                "in_flight": len(session.in_flight),
+                "cancelled_count": session.cancelled_count,
+                "latest_wins": session.latest_wins,
+                "recent": session.history.stats()
+            }
+        }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+    
+    else:
+        # 지원되지 않는 메시지 타입
+        response = {
+            "type": "error",
+            "message": f"지원되지 않는 메시지 타입: {message_type}"
+        }
+        await safe_send_message(websocket, with_request_id(response, message), session)
+
 @app.websocket("/ws/terminal")
 async def websocket_terminal_endpoint(websocket: WebSocket):
     """터미널 WebSocket 엔드포인트"""
-    await websocket.accept()
-    session = TerminalSession()
+    # 제한 확인과 자리 예약을 await 전에 한 번에 (동시 핸드셰이크가 함께 제한을 넘지 않도록)
+    ip = client_ip(websocket)
+    rejection = connection_manager.reserve(ip)
+    codec, subprotocol = negotiate_codec(websocket)
+    if rejection:
+        # 연결 제한 초과: 이유를 알려주고 1013(try again later)으로 종료
+        await websocket.accept(subprotocol=subprotocol)
+        websocket_rejected.inc(rejection)
+        await safe_send_message(websocket, {
+            "type": "error",
+            "message": "동시 연결 수가 너무 많습니다. 잠시 후 다시 연결해주세요.",
+            "reason": rejection
+        })
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER)
+        return
+    
+    try:
+        await websocket.accept(subprotocol=subprotocol)
+        admin_token = websocket.headers.get(ADMIN_TOKEN_HEADER) or websocket.query_params.get("admin_token")
+        session = TerminalSession(
+            is_admin=is_admin_token(admin_token),
+            latest_wins=websocket.query_params.get("latest_wins", "").lower() in ("1", "true", "yes"),
+            history=history_store.get(websocket.query_params.get("client_token")),
+            codec=codec
+        )
+        connection = connection_manager.register(
+            websocket, session,
+            send=lambda message: safe_send_message(websocket, message, session)
+        )
+    except BaseException:
+        # 등록 전에 실패(핸드셰이크 중 끊김 등)하면 예약한 자리 반납
+        connection_manager.release(ip)
+        raise
+    websocket_connections.inc()
     
     # 연결 환영 메시지
     welcome_message = {
         "type": "connection",
         "status": "connected",
         "message": "터미널에 연결되었습니다. /help를 입력하여 사용법을 확인하세요.",
-        "mode": session.mode.value
+        "mode": session.mode.value,
+        "format": session.codec
     }
-    if not await safe_send_message(websocket, welcome_message):
+    if not await safe_send_message(websocket, welcome_message, session):
+        connection_manager.unregister(connection)
+        websocket_connections.dec()
         return
     
     try:
         while True:
             # 메시지 수신
             try:
-                data = await websocket.receive_text()
-                message = json.loads(data)
-            except json.JSONDecodeError:
+                frame = await websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000))
+                websocket_messages.inc("in")
+                websocket_message_rate.mark()
+                # 텍스트 프레임은 JSON, 바이너리 프레임은 MessagePack
+                message = decode_frame(frame)
+                connection.touch(message.get("type") if isinstance(message, dict) else None)
+            except ValueError:
+                connection.touch()
                 error_response = {
                     "type": "error",
-                    "message": "잘못된 JSON 형식입니다."
+                    "message": "잘못된 JSON 형식입니다." if session.codec == CODEC_JSON else "잘못된 메시지 형식입니다."
                 }
-                await safe_send_message(websocket, error_response)
+                await safe_send_message(websocket, error_response, session)
                 continue
+            except WebSocketDisconnect:
+                # 연결 종료는 바깥에서 처리 (계속 수신을 시도하면 루프가 멈추지 않음)
+                raise
             except Exception as e:
                 error_response = {
                     "type": "error", 
                     "message": f"메시지 수신 오류: {str(e)}"
                 }
-                await safe_send_message(websocket, error_response)
+                await safe_send_message(websocket, error_response, session)
                 continue
             
             # 필수 필드 확인
@@ -411,124 +1017,39 @@ async def websocket_terminal_endpoint(websocket: WebSocket):
                     "type": "error",
                     "message": "'type' 필드가 필요합니다."
                 }
-                await safe_send_message(websocket, error_response)
+                await safe_send_message(websocket, error_response, session)
                 continue
             
-            message_type = message.get("type")
-            text = message.get("text", "")
-            
-            # 메시지 타입별 처리
-            if message_type == "translate":
-                # 번역 요청 처리
-                if not text.strip():
-                    response = {
-                        "type": "translation",
-                        "success": False,
-                        "error": "빈 텍스트는 번역할 수 없습니다."
-                    }
-                else:
-                    # 모드 설정
-                    request_mode = message.get("mode", "auto")
-                    if request_mode == "session":
-                        mode = session.mode
-                    else:
-                        mode = TranslationMode(request_mode) if request_mode in ["auto", "korean", "russian"] else session.mode
-                    
-                    # 번역 처리
-                    translation_result = await process_terminal_translation(text, mode)
-                    
-                    if translation_result["success"]:
-                        formatted_response = format_terminal_response(
-                            translation_result, 
-                            typing_animation=True
-                        )
-                        response = {
-                            "type": "translation",
-                            "success": True,
-                            "data": formatted_response,
-                            "original": translation_result.get("original"),
-                            "translation": translation_result.get("translation")
-                        }
-                        session.update_stats("translation")
-                    else:
-                        response = {
-                            "type": "translation", 
-                            "success": False,
-                            "error": translation_result.get("error", "번역 실패")
-                        }
-                
-                await safe_send_message(websocket, response)
-            
-            elif message_type == "command":
-                # 명령어 처리
-                command_result = parse_terminal_command(text)
-                
-                if command_result is None:
-                    response = {
-                        "type": "command_result",
-                        "success": False,
-                        "error": "명령어가 아닙니다. '/'로 시작해야 합니다."
-                    }
-                elif command_result["type"] == "invalid":
-                    response = {
-                        "type": "command_result",
-                        "success": False,
-                        "error": command_result["error"]
-                    }
-                else:
-                    # 유효한 명령어 처리
-                    if command_result["type"] == "help":
-                        formatted_response = format_terminal_response(None, command_type="help")
-                    elif command_result["type"] == "clear":
-                        formatted_response = format_terminal_response(None, command_type="clear")
-                    elif command_result["type"] == "mode":
-                        new_mode = command_result["mode"]
-                        session.mode = TranslationMode(new_mode)
-                        formatted_response = format_terminal_response(
-                            None, 
-                            command_type="mode_change", 
-                            mode=new_mode
-                        )
-                    
-                    response = {
-                        "type": "command_result",
-                        "success": True,
-                        "data": formatted_response,
-                        "command_type": command_result["type"]
-                    }
-                    session.update_stats("command")
-                
-                await safe_send_message(websocket, response)
-            
-            elif message_type == "get_stats":
-                # 통계 정보 (향후 구현)
-                response = {
-                    "type": "stats",
-                    "data": {
-                        "translation_count": session.translation_count,
-                        "command_count": session.command_count,
-                        "current_mode": session.mode.value
-                    }
-                }
-                await safe_send_message(websocket, response)
-            
+            # 관리자 연결에서 profile 플래그가 있으면 이 메시지 처리만 프로파일링 (완료까지 대기)
+            if message.get("profile") and session.is_admin:
+                async with RequestProfile(f"ws_{message.get('type')}") as profile:
+                    await handle_terminal_message(websocket, session, message, inline=True)
+                if profile.active:
+                    await safe_send_message(websocket, with_request_id({
+                        "type": "profile",
+                        "profile_id": profile.profile_id,
+                        "message_type": message.get("type")
+                    }, message), session)
             else:
-                # 지원되지 않는 메시지 타입
-                response = {
-                    "type": "error",
-                    "message": f"지원되지 않는 메시지 타입: {message_type}"
-                }
-                await safe_send_message(websocket, response)
+                await handle_terminal_message(websocket, session, message)
     
     except WebSocketDisconnect:
         logger.info("터미널 WebSocket 연결이 종료되었습니다")
+    except asyncio.CancelledError:
+        # 연결 관리자가 정리한 연결이면 정상 종료, 그 외의 취소는 그대로 전파
+        if not connection.closing:
+            raise
     except Exception as e:
         logger.error(f"터미널 WebSocket 오류: {str(e)}")
         error_response = {
             "type": "error",
             "message": f"서버 오류: {str(e)}"
         }
-        await safe_send_message(websocket, error_response)
+        await safe_send_message(websocket, error_response, session)
+    finally:
+        session.cancel_all()
+        connection_manager.unregister(connection)
+        websocket_connections.dec()
 
 # 채팅 관련 API 엔드포인트들
 
@@ -548,14 +1069,15 @@ async def send_chat_message(request: ChatRequest):
         
         # 세션 확인 또는 생성
         if request.session_id:
-            session = chat_storage.get_session(request.session_id)
+            with stage_timer("session_lookup"):
+                session = await chat_storage.get_session_async(request.session_id)
             if not session:
                 # 세션이 없으면 새로 생성
-                session = chat_storage.create_session(request.message)
+                session = await chat_storage.create_session_async(request.message)
                 logger.info(f"기존 세션을 찾을 수 없어 새 세션 생성: {session.session_id}")
         else:
             # 새 세션 생성
-            session = chat_storage.create_session(request.message)
+            session = await chat_storage.create_session_async(request.message)
             logger.info(f"새 채팅 세션 생성: {session.session_id}")
         
         # 사용자 메시지가 이미 추가되지 않았으면 추가
@@ -564,11 +1086,12 @@ async def send_chat_message(request: ChatRequest):
                 type="user",
                 text=request.message
             )
-            chat_storage.add_message_to_session(session.session_id, user_message)
+            await chat_storage.add_message_to_session_async(session.session_id, user_message)
         
         # AI 응답 생성
         try:
-            vocabulary_entry = await generate_vocabulary_entry(request.message)
+            with stage_timer("ai_generate"):
+                vocabulary_entry = await generate_vocabulary_entry(request.message)
             logger.info(f"AI 응답 생성 성공: {request.message}")
             
             # AI 응답 메시지 생성
@@ -589,13 +1112,16 @@ async def send_chat_message(request: ChatRequest):
             )
         
         # AI 응답을 세션에 추가
-        chat_storage.add_message_to_session(session.session_id, ai_message)
+        await chat_storage.add_message_to_session_async(session.session_id, ai_message)
         
-        return ChatResponse(
-            success=True,
-            session_id=session.session_id,
-            message=ai_message
-        )
+        # 직렬화 시간도 Server-Timing에 포함되도록 직접 인코딩
+        with stage_timer("serialize"):
+            content = jsonable_encoder(ChatResponse(
+                success=True,
+                session_id=session.session_id,
+                message=ai_message
+            ))
+        return JSONResponse(content=content)
         
     except Exception as e:
         logger.error(f"채팅 메시지 처리 오류: {str(e)}")
@@ -609,7 +1135,7 @@ async def send_chat_message(request: ChatRequest):
 async def get_chat_sessions():
     """모든 채팅 세션 목록 반환 (날짜별 그룹핑)"""
     try:
-        sessions_by_date = chat_storage.get_sessions_by_date()
+        sessions_by_date = await chat_storage.get_sessions_by_date_async()
         all_sessions = []
         
         # 날짜별 그룹을 평면 리스트로 변환
@@ -631,7 +1157,7 @@ async def get_chat_sessions():
 async def get_chat_session(session_id: str):
     """특정 채팅 세션 상세 정보 반환"""
     try:
-        session = chat_storage.get_session(session_id)
+        session = await chat_storage.get_session_async(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
         
@@ -646,7 +1172,7 @@ async def get_chat_session(session_id: str):
 async def delete_chat_session(session_id: str):
     """채팅 세션 삭제"""
     try:
-        success = chat_storage.delete_session(session_id)
+        success = await chat_storage.delete_session_async(session_id)
         if not success:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
         
@@ -661,7 +1187,7 @@ async def delete_chat_session(session_id: str):
 async def create_new_chat_session():
     """새로운 채팅 세션 생성"""
     try:
-        session = chat_storage.create_session()
+        session = await chat_storage.create_session_async()
         
         # 환영 메시지를 응답으로 반환
         welcome_message = session.messages[0] if session.messages else None
@@ -683,7 +1209,7 @@ async def create_new_chat_session():
 async def get_chat_stats():
     """채팅 세션 통계 정보"""
     try:
-        stats = chat_storage.get_session_stats()
+        stats = await chat_storage.get_session_stats_async()
         return {
             "success": True,
             "data": stats
@@ -702,7 +1228,7 @@ async def create_bookmark(request: BookmarkRequest):
     """메시지를 북마크로 추가"""
     try:
         # 세션과 메시지 확인
-        session = chat_storage.get_session(request.session_id)
+        session = await chat_storage.get_session_async(request.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
         
@@ -720,7 +1246,7 @@ async def create_bookmark(request: BookmarkRequest):
             raise HTTPException(status_code=400, detail="AI 응답만 북마크할 수 있습니다")
         
         # 북마크 생성
-        bookmark = bookmark_storage.create_bookmark(request.session_id, target_message)
+        bookmark = await bookmark_storage.create_bookmark_async(request.session_id, target_message)
         
         logger.info(f"북마크 생성 완료: {bookmark.korean_text[:20]}...")
         return BookmarkResponse(success=True, bookmark=bookmark)
@@ -738,7 +1264,7 @@ async def create_bookmark(request: BookmarkRequest):
 async def get_all_bookmarks(limit: int = 50):
     """모든 북마크 목록 반환"""
     try:
-        bookmarks = bookmark_storage.get_all_bookmarks(limit)
+        bookmarks = await bookmark_storage.get_all_bookmarks_async(limit)
         return BookmarkListResponse(
             success=True,
             bookmarks=bookmarks,
@@ -755,7 +1281,7 @@ async def get_all_bookmarks(limit: int = 50):
 async def get_review_bookmarks():
     """복습이 필요한 북마크들 반환"""
     try:
-        bookmarks = bookmark_storage.get_bookmarks_for_review()
+        bookmarks = await bookmark_storage.get_bookmarks_for_review_async()
         return BookmarkListResponse(
             success=True,
             bookmarks=bookmarks,
@@ -775,7 +1301,7 @@ async def complete_review(bookmark_id: str, difficulty_rating: int):
         if not (1 <= difficulty_rating <= 5):
             raise HTTPException(status_code=400, detail="난이도는 1-5 사이의 값이어야 합니다")
         
-        success = bookmark_storage.update_review(bookmark_id, difficulty_rating)
+        success = await bookmark_storage.update_review_async(bookmark_id, difficulty_rating)
         if not success:
             raise HTTPException(status_code=404, detail="북마크를 찾을 수 없습니다")
         
@@ -791,7 +1317,7 @@ async def complete_review(bookmark_id: str, difficulty_rating: int):
 async def delete_bookmark(bookmark_id: str):
     """북마크 삭제"""
     try:
-        success = bookmark_storage.delete_bookmark(bookmark_id)
+        success = await bookmark_storage.delete_bookmark_async(bookmark_id)
         if not success:
             raise HTTPException(status_code=404, detail="북마크를 찾을 수 없습니다")
         
@@ -809,7 +1335,7 @@ async def search_bookmarks(q: str, limit: int = 20):
         if not q.strip():
             return BookmarkListResponse(success=True, bookmarks=[], total_count=0)
         
-        bookmarks = bookmark_storage.search_bookmarks(q)[:limit]
+        bookmarks = (await bookmark_storage.search_bookmarks_async(q))[:limit]
         return BookmarkListResponse(
             success=True,
             bookmarks=bookmarks,
@@ -826,7 +1352,7 @@ async def search_bookmarks(q: str, limit: int = 20):
 async def get_bookmark_stats():
     """북마크 통계 정보"""
     try:
-        stats = bookmark_storage.get_bookmark_stats()
+        stats = await bookmark_storage.get_bookmark_stats_async()
         return {
             "success": True,
             "data": stats
@@ -842,7 +1368,7 @@ async def get_bookmark_stats():
 async def get_session_bookmarks(session_id: str):
     """특정 세션의 북마크들 반환"""
     try:
-        bookmarks = bookmark_storage.get_bookmarks_by_session(session_id)
+        bookmarks = await bookmark_storage.get_bookmarks_by_session_async(session_id)
         return BookmarkListResponse(
             success=True,
             bookmarks=bookmarks,
@@ -0,0 +1,162 @@
+"""
+메모리 사용량 진단
+
+메모리에 상주하는 저장소/캐시/세션의 대략적인 깊은 크기(deep size)를 추정하고,
+tracemalloc 스냅샷 비교(시작 ↔ 종료)로 파일/라인별 메모리 증가를 보여줍니다.
+"""
+import gc
+import logging
+import sys
+import threading
+import tracemalloc
+import types
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .metrics import process_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+# 깊은 크기 계산 시 한 번에 방문할 최대 객체 수 (대형 저장소에서 무한정 걸리지 않도록)
+MAX_VISITED_OBJECTS = 2_000_000
+
+# 공유 객체(모듈, 클래스, 함수 등)는 특정 저장소의 크기로 보지 않음
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+# 이름 → 측정 대상 객체를 돌려주는 함수
+_memory_sources: Dict[str, Callable[[], Any]] = {}
+
+
+def register_memory_source(name: str, getter: Callable[[], Any]) -> None:
+    """메모리 리포트에 포함할 객체 등록 (getter는 리포트 생성 시점에 호출됨)"""
+    _memory_sources[name] = getter
+
+
+def deep_sizeof(obj: Any, max_objects: int = MAX_VISITED_OBJECTS) -> Dict[str, Any]:
+    """gc 참조 그래프를 따라가며 객체가 점유한 바이트 수 추정"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    truncated = False
+
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIP_TYPES):
+            continue
+        if len(seen) >= max_objects:
+            truncated = True
+            break
+        seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+        stack.extend(gc.get_referents(current))
+
+    return {"bytes": total, "objects": len(seen), "truncated": truncated}
+
+
+class TracemallocSession:
+    """tracemalloc 시작/종료 사이의 스냅샷 차이를 계산"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_at: Optional[datetime] = None
+        self._started_tracing = False
+
+    @property
+    def active(self) -> bool:
+        return self._baseline is not None
+
+    def start(self, nframes: int = 1) -> Dict[str, Any]:
+        with self._lock:
+            if self._baseline is not None:
+                return {"started": False, "started_at": self._started_at.isoformat()}
+            # 다른 곳에서 이미 추적 중이면 그대로 사용하고 종료 시 멈추지 않음
+            self._started_tracing = not tracemalloc.is_tracing()
+            if self._started_tracing:
+                tracemalloc.start(nframes)
+            self._baseline = tracemalloc.take_snapshot()
+            self._started_at = datetime.now()
+            logger.info("🧪 tracemalloc 스냅샷 시작")
+            return {"started": True, "started_at": self._started_at.isoformat()}
+
+    def stop(self, limit: int = 25) -> Optional[Dict[str, Any]]:
+        """종료 스냅샷과 비교하여 파일/라인별 증가량 상위 limit개 반환 (시작 전이면 None)"""
+        with self._lock:
+            if self._baseline is None:
+                return None
+            snapshot = tracemalloc.take_snapshot()
+            filters = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+            diff = snapshot.filter_traces(filters).compare_to(
+                self._baseline.filter_traces(filters), "lineno"
+            )
+            current, peak = tracemalloc.get_traced_memory()
+            started_at = self._started_at
+            if self._started_tracing:
+                tracemalloc.stop()
+            self._baseline = None
+            self._started_at = None
+            logger.info("🧪 tracemalloc 스냅샷 종료")
+
+        return {
+            "started_at": started_at.isoformat(),
+            "stopped_at": datetime.now().isoformat(),
+            "traced_current_bytes": current,
+            "traced_peak_bytes": peak,
+            "top": [_format_stat(stat) for stat in diff[:limit]],
+        }
+
+
+def _format_stat(stat: tracemalloc.StatisticDiff) -> Dict[str, Any]:
+    frame = stat.traceback[0]
+    return {
+        "location": f"{frame.filename}:{frame.lineno}",
+        "size_diff_bytes": stat.size_diff,
+        "size_bytes": stat.size,
+        "count_diff": stat.count_diff,
+        "count": stat.count,
+    }
+
+
+def build_memory_report(sources: Optional[List[str]] = None) -> Dict[str, Any]:
+    """등록된 객체들의 크기와 프로세스 메모리 정보를 모은 리포트"""
+    stores = {}
+    for name, getter in list(_memory_sources.items()):
+        if sources and name not in sources:
+            continue
+        try:
+            obj = getter()
+        except Exception as e:
+            stores[name] = {"error": str(e)}
+            continue
+        if obj is None:
+            continue
+        entry = deep_sizeof(obj)
+        try:
+            entry["items"] = len(obj)
+        except TypeError:
+            pass
+        stores[name] = entry
+
+    tracing = tracemalloc.is_tracing()
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "rss_bytes": process_rss_bytes(),
+        "gc_counts": gc.get_count(),
+        "gc_objects": len(gc.get_objects()),
+        "stores": stores,
+        "tracemalloc": {
+            "tracing": tracing,
+            "snapshot_active": tracemalloc_session.active,
+            "traced_current_bytes": tracemalloc.get_traced_memory()[0] if tracing else None,
+        },
+    }
+
+
+# 전역 tracemalloc 세션
+tracemalloc_session = TracemallocSession()
@@ -0,0 +1,306 @@
+"""
+프로세스 내부 메트릭 레지스트리
+
+외부 서비스 없이 카운터/게이지/히스토그램을 메모리에 누적하고
+Prometheus 텍스트 노출 형식으로 렌더링합니다.
+관측(observe)은 버킷 탐색 한 번과 짧은 락만 사용하므로 핫패스에서 호출해도 부담이 적습니다.
+"""
+import bisect
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 기본 버킷 (0.5ms ~ 30s, AI 호출의 긴 꼬리까지 포함)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class Histogram:
+    """레이블별 누적 히스토그램"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 레이블 값 → [버킷별 개수(+Inf 포함), 합계, 개수]
+        self._series: Dict[LabelValues, List] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        """값 하나를 기록"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[labelvalues] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self) -> Dict[LabelValues, Dict]:
+        """레이블별 스냅샷 반환 (버킷은 누적 개수)"""
+        with self._lock:
+            snapshot = {key: (list(value[0]), value[1], value[2]) for key, value in self._series.items()}
+
+        result = {}
+        for labelvalues, (counts, total, count) in snapshot.items():
+            cumulative = []
+            running = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                running += bucket_count
+                cumulative.append((bound, running))
+            result[labelvalues] = {"buckets": cumulative, "sum": total, "count": count}
+        return result
+
+    def quantile(self, q: float, *labelvalues: str) -> Optional[float]:
+        """버킷 경계 기준 근사 분위수 (데이터가 없으면 None)"""
+        series = self.collect().get(labelvalues)
+        if not series or series["count"] == 0:
+            return None
+        target = q * series["count"]
+        for bound, cumulative in series["buckets"]:
+            if cumulative >= target:
+                return bound
+        return None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def collect(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge:
+    """현재 값 게이지 (callback을 주면 수집 시점에 값을 계산)"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def collect(self) -> Dict[LabelValues, float]:
+        if self.callback is not None:
+            try:
+                return {(): float(self.callback())}
+            except Exception as e:
+                logger.warning(f"게이지 수집 실패 ({self.name}): {e}")
+                return {}
+        with self._lock:
+            return dict(self._values)
+
+
+class RateMeter:
+    """최근 window초 동안의 초당 이벤트 수 측정기"""
+
+    def __init__(self, window: float = 60.0):
+        self.window = window
+        self._lock = threading.Lock()
+        self._events = collections.deque()
+
+    def mark(self, count: int = 1) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, count))
+            self._trim(now)
+
+    def rate(self) -> float:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return sum(count for _, count in self._events) / self.window
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+
+
+class MetricsRegistry:
+    """이름으로 메트릭을 등록/조회하는 레지스트리"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def _get_or_register(self, name: str, kind: type, create: Callable[[], object]):
+        """같은 이름이 있으면 그 메트릭을, 없으면 새로 만든 메트릭을 반환 (종류가 다르면 ValueError)"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = create()
+                self._metrics[name] = metric
+            elif type(metric) is not kind:
+                raise ValueError(
+                    f"메트릭 '{name}'은(는) 이미 {type(metric).__name__}(으)로 등록되어 있습니다 (요청: {kind.__name__})"
+                )
+            return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """히스토그램을 가져오거나 새로 등록"""
+        return self._get_or_register(name, Histogram, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """카운터를 가져오거나 새로 등록"""
+        return self._get_or_register(name, Counter, lambda: Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None
+    ) -> Gauge:
+        """게이지를 가져오거나 새로 등록"""
+        return self._get_or_register(name, Gauge, lambda: Gauge(name, documentation, labelnames, callback))
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def all_metrics(self) -> List[object]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식(0.0.4)으로 렌더링"""
+        lines: List[str] = []
+        for metric in self.all_metrics():
+            if isinstance(metric, Histogram):
+                metric_type = "histogram"
+            elif isinstance(metric, Counter):
+                metric_type = "counter"
+            else:
+                metric_type = "gauge"
+
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric_type}")
+
+            if isinstance(metric, Histogram):
+                for labelvalues, series in sorted(metric.collect().items()):
+                    for bound, cumulative in series["buckets"]:
+                        labels = _format_labels(metric.labelnames, labelvalues, ("le", _format_value(bound)))
+                        lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                    labels = _format_labels(metric.labelnames, labelvalues)
+                    lines.append(f"{metric.name}_sum{labels} {_format_value(series['sum'])}")
+                    lines.append(f"{metric.name}_count{labels} {series['count']}")
+            else:
+                values = metric.collect()
+                if not values and not metric.labelnames and getattr(metric, "callback", None) is None:
+                    # 레이블 없는 메트릭은 아직 값이 없어도 0으로 노출
+                    values = {(): 0.0}
+                for labelvalues, value in sorted(values.items()):
+                    labels = _format_labels(metric.labelnames, labelvalues)
+                    lines.append(f"{metric.name}{labels} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Tuple[str, ...], labelvalues: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def process_rss_bytes() -> float:
+    """현재 프로세스의 RSS(바이트). /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        # Linux는 KB, macOS는 바이트 단위
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage if sys.platform == "darwin" else usage * 1024
+
+
+# 전역 메트릭 레지스트리
+registry = MetricsRegistry()
+
+registry.gauge(
+    "process_resident_memory_bytes",
+    "프로세스 상주 메모리(RSS) 크기",
+    callback=process_rss_bytes
+)
@@ -0,0 +1,136 @@
+"""
+어휘 접두사 색인
+
+정렬된 키 목록에서 bisect로 접두사 범위를 찾아 입력 중인 검색어에 즉시 답합니다.
+텔레그램 인라인 모드처럼 키 입력마다 요청이 오는 경로에서 AI 호출 없이
+저장된 어휘와 AI 생성 캐시만으로 결과를 만들기 위한 용도입니다.
+"""
+import bisect
+import logging
+import threading
+from typing import Any, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from .ai_service import GenerationCache, generation_cache
+from .models import VocabularyEntry
+from .storage import VocabularyStorage, storage
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+# AI 캐시 (버전, [((방향, 입력), 항목), ...]) 사본
+CacheSnapshot = Tuple[int, List[Tuple[Tuple[str, str], VocabularyEntry]]]
+
+
+def normalize_key(text: str) -> str:
+    """대소문자/앞뒤 공백 차이를 무시하는 검색 키"""
+    return text.strip().casefold()
+
+
+class PrefixIndex(Generic[V]):
+    """정렬된 (키, 값) 목록 기반 접두사 검색 (생성 후 변경하지 않음)"""
+
+    def __init__(self, items: Iterable[Tuple[str, V]] = ()):
+        pairs = sorted(
+            ((normalize_key(key), value) for key, value in items if key and key.strip()),
+            key=lambda pair: pair[0]
+        )
+        self._keys: List[str] = [key for key, _ in pairs]
+        self._values: List[V] = [value for _, value in pairs]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def search(self, prefix: str, limit: int = 10) -> List[V]:
+        """접두사로 시작하는 값들을 키 순서대로 최대 limit개 반환 (같은 값은 한 번만)"""
+        key = normalize_key(prefix)
+        if not key:
+            return []
+        results: List[V] = []
+        seen = set()
+        index = bisect.bisect_left(self._keys, key)
+        while index < len(self._keys) and len(results) < limit:
+            if not self._keys[index].startswith(key):
+                break
+            value = self._values[index]
+            if id(value) not in seen:
+                seen.add(id(value))
+                results.append(value)
+            index += 1
+        return results
+
+    def exact(self, text: str) -> Optional[V]:
+        key = normalize_key(text)
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._values[index]
+        return None
+
+
+class VocabularyIndex:
+    """
+    저장된 어휘 + AI 생성 캐시의 접두사 색인.
+    저장 파일 시그니처(inode, mtime, 크기)나 캐시 버전이 바뀌었을 때만 다시 만듭니다.
+    """
+
+    def __init__(self, vocabulary_storage: VocabularyStorage = storage,
+                 cache: GenerationCache = generation_cache):
+        self.storage = vocabulary_storage
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._signature: Any = None
+        self._index: PrefixIndex[VocabularyEntry] = PrefixIndex()
+
+    def _current_signature(self) -> Any:
+        return self.storage.signature(), self.cache.version
+
+    @property
+    def stale(self) -> bool:
+        return self._signature != self._current_signature()
+
+    @property
+    def current(self) -> PrefixIndex[VocabularyEntry]:
+        """마지막으로 만든 색인 (변경 확인/재생성 없음)"""
+        return self._index
+
+    def cache_snapshot(self) -> CacheSnapshot:
+        """AI 캐시의 (버전, 항목 목록) 사본 (캐시를 수정하는 이벤트 루프 스레드에서 호출)"""
+        return self.cache.version, self.cache.items()
+
+    def refresh(self, cache_snapshot: Optional[CacheSnapshot] = None) -> PrefixIndex[VocabularyEntry]:
+        """
+        변경이 있으면 색인을 다시 만들고 현재 색인 반환 (파일을 읽으므로 스레드에서 호출 권장).
+        스레드에서 호출할 때는 루프에서 만든 cache_snapshot()을 넘겨야 합니다
+        (루프가 캐시 OrderedDict를 수정하는 도중에 순회하지 않도록).
+        """
+        cache_version, cache_items = cache_snapshot if cache_snapshot is not None else self.cache_snapshot()
+        with self._lock:
+            signature = (self.storage.signature(), cache_version)
+            if signature == self._signature:
+                return self._index
+
+            entries = {}
+            keys: List[Tuple[str, VocabularyEntry]] = []
+            # AI 캐시 먼저, 저장된 어휘가 같은 단어를 덮어씀
+            for (_, input_text), entry in cache_items:
+                entries[normalize_key(entry.original_word)] = entry
+                keys.append((input_text, entry))
+            for entry in self.storage.load_all():
+                entries[normalize_key(entry.original_word)] = entry
+            keys = [(text, entries[normalize_key(entry.original_word)]) for text, entry in keys]
+            keys.extend((entry.original_word, entry) for entry in entries.values())
+
+            self._index = PrefixIndex(keys)
+            self._signature = signature
+            logger.debug(f"🔎 어휘 접두사 색인 재생성: {len(entries)}개 단어")
+            return self._index
+
+    def search(self, prefix: str, limit: int = 10) -> List[VocabularyEntry]:
+        """변경이 있으면 호출한 스레드에서 색인을 다시 만든 뒤 검색 (이벤트 루프에서는 refresh 결과를 직접 검색할 것)"""
+        return self.refresh().search(prefix, limit)
+
+    def exact(self, text: str) -> Optional[VocabularyEntry]:
+        return self.refresh().exact(text)
+
+
+# 전역 어휘 색인
+vocabulary_index = VocabularyIndex()
@@ -0,0 +1,238 @@
+"""
+요청 단위 온디맨드 프로파일링
+
+관리자 토큰과 함께 X-Profile: 1 헤더(또는 ?profile=1)를 보내면 해당 요청 하나만
+cProfile(결정적)과 스택 샘플러로 측정합니다.
+결과는 pstats와 collapsed-stack(flamegraph 입력) 형식으로 디스크 링 버퍼에 저장됩니다.
+
+주의: asyncio는 한 스레드에서 여러 요청을 번갈아 실행하므로,
+측정 구간 동안 같은 이벤트 루프에서 실행된 다른 작업도 함께 기록됩니다.
+"""
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter as TallyCounter
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+from .admin import is_admin_token
+from .storage_executor import run_storage
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_RING_SIZE = int(os.getenv("PROFILE_RING_SIZE", "20"))
+# 스택 샘플링 간격 (초)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}-[0-9]{12}-[a-z0-9_]{1,40}-[0-9a-f]{6}$")
+PROFILE_FORMATS = {"pstats": ".pstats", "collapsed": ".collapsed"}
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링하여 collapsed-stack 형태로 집계"""
+
+    def __init__(self, thread_id: int, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: TallyCounter = TallyCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """프로파일 결과를 보관하는 크기 제한 디스크 링 버퍼"""
+
+    def __init__(self, directory: str = PROFILE_DIR, max_profiles: int = PROFILE_RING_SIZE):
+        self.directory = directory
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def new_profile_id(self, label: str) -> str:
+        safe_label = re.sub(r"[^a-z0-9_]+", "_", label.lower()).strip("_")[:40] or "request"
+        # 마이크로초까지 포함해 ID 정렬 순서 = 생성 순서
+        return f"{datetime.now().strftime('%Y%m%d-%H%M%S%f')}-{safe_label}-{uuid.uuid4().hex[:6]}"
+
+    def save(self, profile_id: str, profiler: cProfile.Profile, sampler: StackSampler, meta: Dict) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(self.path_for(profile_id, "pstats"))
+            with open(self.path_for(profile_id, "collapsed"), 'w', encoding='utf-8') as f:
+                f.write(sampler.collapsed())
+            with open(os.path.join(self.directory, f"{profile_id}.json"), 'w', encoding='utf-8') as f:
+                json.dump({"id": profile_id, **meta}, f, ensure_ascii=False)
+            self._evict()
+
+    def _evict(self) -> None:
+        """가장 오래된 프로파일부터 삭제하여 링 크기 유지"""
+        ids = self._profile_ids()
+        excess = len(ids) - self.max_profiles
+        for profile_id in ids[:max(0, excess)]:
+            for suffix in list(PROFILE_FORMATS.values()) + [".json"]:
+                try:
+                    os.remove(os.path.join(self.directory, f"{profile_id}{suffix}"))
+                except FileNotFoundError:
+                    pass
+
+    def _profile_ids(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        ids = [name[:-5] for name in os.listdir(self.directory) if name.endswith(".json")]
+        return sorted(profile_id for profile_id in ids if PROFILE_ID_PATTERN.match(profile_id))
+
+    def list_profiles(self) -> List[Dict]:
+        """최신순 프로파일 메타데이터 목록"""
+        profiles = []
+        for profile_id in reversed(self._profile_ids()):
+            try:
+                with open(os.path.join(self.directory, f"{profile_id}.json"), 'r', encoding='utf-8') as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def path_for(self, profile_id: str, fmt: str) -> Optional[str]:
+        """프로파일 파일 경로 (잘못된 ID/형식이면 None)"""
+        if fmt not in PROFILE_FORMATS or not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}{PROFILE_FORMATS[fmt]}")
+
+
+# 전역 프로파일 저장소
+profile_store = ProfileStore()
+
+# cProfile은 스레드당 하나만 활성화할 수 있으므로 동시에 하나의 요청만 측정
+_profiling_lock = threading.Lock()
+
+
+class RequestProfile:
+    """
+    `async with RequestProfile("label") as profile:` 형태로 사용하는 단일 요청 프로파일러.
+    이미 다른 요청을 측정 중이면 profile.active가 False이고 아무것도 기록하지 않습니다.
+    결과 파일 쓰기와 링 정리는 저장소 스레드 풀에서 실행되어 이벤트 루프를 막지 않습니다
+    (동기 `with`도 지원하지만 그 경우 호출한 스레드에서 저장).
+    """
+
+    def __init__(self, label: str, store: ProfileStore = profile_store):
+        self.label = label
+        self.store = store
+        self.profile_id = store.new_profile_id(label)
+        self.active = False
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started_at = 0.0
+
+    def __enter__(self) -> "RequestProfile":
+        if not _profiling_lock.acquire(blocking=False):
+            logger.info(f"⏭️ 다른 프로파일링이 진행 중이라 건너뜀: {self.label}")
+            return self
+        self.active = True
+        self._sampler = StackSampler(threading.get_ident())
+        self._profiler = cProfile.Profile()
+        self._started_at = time.perf_counter()
+        self._sampler.start()
+        self._profiler.enable()
+        return self
+
+    def _stop(self, exc_type) -> Dict:
+        """측정을 멈추고 저장할 메타데이터 반환"""
+        self._profiler.disable()
+        self._sampler.stop()
+        return {
+            "label": self.label,
+            "created_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - self._started_at) * 1000, 3),
+            "samples": sum(self._sampler.stacks.values()),
+            "error": exc_type.__name__ if exc_type else None
+        }
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self.active:
+            return
+        try:
+            meta = self._stop(exc_type)
+            self.store.save(self.profile_id, self._profiler, self._sampler, meta)
+            logger.info(f"🔬 프로파일 저장: {self.profile_id} ({meta['duration_ms']:.1f}ms)")
+        except Exception as e:
+            logger.error(f"❌ 프로파일 저장 실패: {e}")
+        finally:
+            _profiling_lock.release()
+
+    async def __aenter__(self) -> "RequestProfile":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self.active:
+            return
+        try:
+            meta = self._stop(exc_type)
+            await run_storage(self.store.save, self.profile_id, self._profiler, self._sampler, meta)
+            logger.info(f"🔬 프로파일 저장: {self.profile_id} ({meta['duration_ms']:.1f}ms)")
+        except Exception as e:
+            logger.error(f"❌ 프로파일 저장 실패: {e}")
+        finally:
+            _profiling_lock.release()
+
+
+def should_profile_request(scope) -> bool:
+    """관리자 토큰과 프로파일 플래그(X-Profile 헤더 또는 profile 쿼리)가 모두 있는지 확인"""
+    headers = dict(scope.get("headers") or [])
+    token = headers.get(b"x-admin-token", b"").decode("latin-1")
+    if not is_admin_token(token):
+        return False
+    if headers.get(b"x-profile", b"").decode("latin-1").lower() in ("1", "true", "yes"):
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[0].lower() in ("1", "true", "yes")
+
+
+class ProfilingMiddleware:
+    """요청 단위 프로파일링 ASGI 미들웨어 (플래그가 없으면 헤더 확인 외 오버헤드 없음)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not should_profile_request(scope):
+            await self.app(scope, receive, send)
+            return
+
+        label = f"{scope['method']}_{scope['path']}"
+        async with RequestProfile(label) as profile:
+            async def send_with_profile_id(message):
+                if message["type"] == "http.response.start" and profile.active:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-profile-id", profile.profile_id.encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_profile_id)
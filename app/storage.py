@@ -1,93 +1,282 @@
+import asyncio
 import json
+import logging
 import os
+import threading
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from .models import VocabularyEntry
+from .timing import stage_timer
+from .file_lock import atomic_write_json, file_lock, file_signature
+from .metrics import registry
+from .storage_executor import run_storage
+
+logger = logging.getLogger(__name__)
 
 STORAGE_FILE = "vocabulary_data.json"
+# 작성자 태스크가 한 번의 파일 저장으로 묶어 처리하는 최대 변경 수
+VOCAB_WRITE_BATCH = int(os.getenv("VOCAB_WRITE_BATCH", "64"))
+
+vocabulary_write_batch = registry.histogram(
+    "vocabulary_write_batch_size",
+    "파일 저장 한 번에 묶어 적용한 어휘 변경 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+# 변경 연산: ("save", VocabularyEntry) 또는 ("delete", 단어)
+Operation = Tuple[str, Any]
+
+
+def word_positions(entries: Sequence[VocabularyEntry]) -> Dict[str, int]:
+    """단어 → 목록 위치 (같은 단어가 여러 번 있으면 처음 위치)"""
+    positions: Dict[str, int] = {}
+    for index, entry in enumerate(entries):
+        positions.setdefault(entry.original_word, index)
+    return positions
+
+
+class _Snapshot:
+    """한 시점의 어휘 목록 (교체만 하고 수정하지 않으므로 잠금 없이 읽어도 일관됨)"""
+
+    __slots__ = ("signature", "entries", "by_word")
+
+    def __init__(self, signature: Any, entries: Sequence[VocabularyEntry]):
+        self.signature = signature
+        self.entries: Tuple[VocabularyEntry, ...] = tuple(entries)
+        self.by_word: Dict[str, VocabularyEntry] = {}
+        for entry in self.entries:
+            self.by_word.setdefault(entry.original_word, entry)
+
+
+class VocabularyWriter:
+    """
+    VocabularyStorage 변경을 하나의 asyncio 태스크가 도착 순서대로 적용하는 단일 작성자.
+    파일 저장 중에 들어온 변경은 큐에 쌓였다가 다음 저장 한 번으로 함께 반영됩니다.
+    태스크는 첫 변경 요청 시 현재 이벤트 루프에서 시작합니다.
+    """
+
+    def __init__(self, vocabulary_storage: "VocabularyStorage", max_batch: int = VOCAB_WRITE_BATCH):
+        self.storage = vocabulary_storage
+        self.max_batch = max(1, max_batch)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, operation: Operation) -> Any:
+        """변경을 큐에 넣고 파일에 반영될 때까지 대기한 뒤 결과 반환"""
+        return (await self.submit_many([operation]))[0]
+
+    async def submit_many(self, operations: Sequence[Operation]) -> List[Any]:
+        """여러 변경을 한 번에 큐에 넣음 (다른 요청의 변경과 섞이지 않고 연속으로 적용됨)"""
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((list(operations), future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            pending = len(batch[0][0])
+            while pending < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+                pending += len(batch[-1][0])
+            try:
+                results = await run_storage(
+                    self.storage.apply, [operation for operations, _ in batch for operation in operations]
+                )
+            except Exception as e:
+                logger.error(f"❌ 어휘 일괄 저장 실패 ({pending}건): {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            position = 0
+            for operations, future in batch:
+                if not future.done():
+                    future.set_result(results[position:position + len(operations)])
+                position += len(operations)
+
+    async def close(self) -> None:
+        """작성자 태스크 종료 (대기 중인 변경은 취소됨)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
 
 class VocabularyStorage:
+    """
+    어휘 저장소.
+    조회는 메모리 스냅샷에서 바로 답하고(다른 프로세스가 파일을 바꾼 경우에만 다시 읽음),
+    변경은 파일 잠금 안에서 스냅샷에 순서대로 적용한 뒤 한 번에 저장합니다.
+    비동기 코드에서는 *_async 메서드를 사용합니다. 변경은 단일 작성자 태스크를 거치고,
+    파일 읽기가 필요할 수 있는 조회는 저장소 스레드 풀에서 실행됩니다.
+    """
+
     def __init__(self, file_path: str = STORAGE_FILE):
         self.file_path = file_path
+        self._snapshot = _Snapshot(None, ())
+        # 같은 프로세스의 스레드끼리 변경 순서 보장 (프로세스 간에는 파일 잠금)
+        self._apply_lock = threading.Lock()
+        self.writer = VocabularyWriter(self)
         self.ensure_file_exists()
-    
+
     def ensure_file_exists(self):
         """저장 파일이 없으면 생성"""
-        if not os.path.exists(self.file_path):
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump([], f, ensure_ascii=False)
-    
+        with file_lock(self.file_path):
+            if not os.path.exists(self.file_path):
+                atomic_write_json(self.file_path, [], ensure_ascii=False)
+
+    def signature(self):
+        """파일 변경 감지용 시그니처 (다른 프로세스가 저장하면 바뀜)"""
+        return file_signature(self.file_path)
+
+    def _current(self) -> _Snapshot:
+        """최신 스냅샷 (파일이 바뀌었을 때만 다시 읽고, 읽기 실패 시 이전 스냅샷 유지)"""
+        snapshot = self._snapshot
+        signature = self.signature()
+        if signature != snapshot.signature:
+            try:
+                snapshot = _Snapshot(signature, self._load_unlocked())
+                self._snapshot = snapshot
+            except Exception as e:
+                logger.error(f"❌ 어휘 데이터 로드 실패: {e}")
+        return snapshot
+
     def load_all(self) -> List[VocabularyEntry]:
-        """모든 어휘 데이터 로드"""
+        """모든 어휘 데이터 (스냅샷을 복사한 목록이라 정렬 등으로 바꿔도 됨)"""
+        return list(self._current().entries)
+
+    async def _read_async(self, func, *args):
+        # 스냅샷이 최신이면 루프에서 바로 답하고, 파일을 다시 읽어야 할 때만 스레드 풀 사용
+        if self.signature() == self._snapshot.signature:
+            return func(*args)
+        return await run_storage(func, *args)
+
+    async def load_all_async(self) -> List[VocabularyEntry]:
+        return await self._read_async(self.load_all)
+
+    def _load_unlocked(self) -> List[VocabularyEntry]:
+        """파일이 없으면 빈 목록, 손상되었으면 예외 (저장 경로에서 손상된 파일을 덮어쓰지 않도록)"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [VocabularyEntry(**item) for item in data]
-        except Exception:
+            with stage_timer("vocab_load"):
+                with open(self.file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    return [VocabularyEntry(**item) for item in data]
+        except FileNotFoundError:
             return []
-    
-    def save(self, entry: VocabularyEntry) -> VocabularyEntry:
-        """새 어휘 항목 저장"""
-        # ID와 생성시간 설정
-        if not entry.id:
-            entry.id = str(uuid.uuid4())
-        if not entry.created_at:
-            entry.created_at = datetime.now()
-        
-        # 기존 데이터 로드
-        all_entries = self.load_all()
-        
-        # 중복 확인 (같은 단어가 있으면 업데이트)
-        existing_index = -1
-        for i, existing_entry in enumerate(all_entries):
-            if existing_entry.original_word == entry.original_word:
-                existing_index = i
-                break
-        
-        if existing_index >= 0:
-            all_entries[existing_index] = entry
-        else:
-            all_entries.append(entry)
-        
-        # 파일에 저장
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(
-                [entry.dict() for entry in all_entries], 
-                f, 
-                ensure_ascii=False, 
+
+    def _write_unlocked(self, entries: Sequence[VocabularyEntry]) -> None:
+        with stage_timer("vocab_persist"):
+            atomic_write_json(
+                self.file_path,
+                [entry.dict() for entry in entries],
+                ensure_ascii=False,
                 indent=2,
                 default=str
             )
-        
-        return entry
-    
+
+    def apply(self, operations: Sequence[Operation]) -> List[Any]:
+        """
+        변경들을 순서대로 적용하고 파일에 한 번만 저장 (배타 잠금 안에서 최신 파일 기준).
+        반환값은 연산별 결과입니다 (save: 저장된 항목, delete: 삭제 여부).
+        """
+        with self._apply_lock, file_lock(self.file_path):
+            signature = self.signature()
+            if signature == self._snapshot.signature:
+                entries = list(self._snapshot.entries)
+            else:
+                entries = self._load_unlocked()
+            positions = word_positions(entries)
+
+            results: List[Any] = []
+            changed = False
+            for kind, value in operations:
+                if kind == "save":
+                    entry = value
+                    # ID와 생성시간 설정
+                    if not entry.id:
+                        entry.id = str(uuid.uuid4())
+                    if not entry.created_at:
+                        entry.created_at = datetime.now()
+                    # 중복 확인 (같은 단어가 있으면 업데이트)
+                    index = positions.get(entry.original_word)
+                    if index is None:
+                        positions[entry.original_word] = len(entries)
+                        entries.append(entry)
+                    else:
+                        entries[index] = entry
+                    changed = True
+                    results.append(entry)
+                elif kind == "delete":
+                    if value not in positions:
+                        results.append(False)
+                        continue
+                    entries = [entry for entry in entries if entry.original_word != value]
+                    positions = word_positions(entries)
+                    changed = True
+                    results.append(True)
+                else:
+                    raise ValueError(f"알 수 없는 어휘 변경: {kind}")
+
+            if changed:
+                self._write_unlocked(entries)
+                signature = self.signature()
+            self._snapshot = _Snapshot(signature, entries)
+        vocabulary_write_batch.observe(len(operations))
+        return results
+
+    async def apply_async(self, operations: Sequence[Operation]) -> List[Any]:
+        """여러 변경을 단일 작성자 태스크를 거쳐 파일 저장 한 번으로 적용 (일괄 가져오기용)"""
+        if not operations:
+            return []
+        return await self.writer.submit_many(operations)
+
+    def save(self, entry: VocabularyEntry) -> VocabularyEntry:
+        """새 어휘 항목 저장 (같은 단어가 있으면 교체)"""
+        return self.apply([("save", entry)])[0]
+
+    async def save_async(self, entry: VocabularyEntry) -> VocabularyEntry:
+        """단일 작성자 태스크를 거쳐 저장 (동시에 들어온 저장은 파일 쓰기 한 번으로 묶임)"""
+        return await self.writer.submit(("save", entry))
+
     def get_by_word(self, word: str) -> Optional[VocabularyEntry]:
         """특정 단어로 검색"""
-        all_entries = self.load_all()
-        for entry in all_entries:
-            if entry.original_word == word:
-                return entry
-        return None
-    
+        return self._current().by_word.get(word)
+
+    async def get_by_word_async(self, word: str) -> Optional[VocabularyEntry]:
+        return await self._read_async(self.get_by_word, word)
+
+    def get_page(self, offset: int, limit: int) -> List[VocabularyEntry]:
+        """저장 순서로 offset부터 limit개 (전체 목록을 복사하지 않음, 내보내기용)"""
+        return list(self._current().entries[offset:offset + limit])
+
+    async def get_page_async(self, offset: int, limit: int) -> List[VocabularyEntry]:
+        return await self._read_async(self.get_page, offset, limit)
+
+    def count(self) -> int:
+        """저장된 어휘 수"""
+        return len(self._current().entries)
+
     def delete(self, word: str) -> bool:
         """어휘 항목 삭제"""
-        all_entries = self.load_all()
-        original_count = len(all_entries)
-        
-        all_entries = [entry for entry in all_entries if entry.original_word != word]
-        
-        if len(all_entries) < original_count:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(
-                    [entry.dict() for entry in all_entries], 
-                    f, 
-                    ensure_ascii=False, 
-                    indent=2,
-                    default=str
-                )
-            return True
-        return False
+        return self.apply([("delete", word)])[0]
+
+    async def delete_async(self, word: str) -> bool:
+        """단일 작성자 태스크를 거쳐 삭제"""
+        return await self.writer.submit(("delete", word))
 
 # 전역 스토리지 인스턴스
-storage = VocabularyStorage()
\ No newline at end of file
+storage = VocabularyStorage()
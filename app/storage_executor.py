@@ -0,0 +1,65 @@
+"""
+저장소 I/O 전용 스레드 풀
+
+JSON 파일 읽기/쓰기와 (역)직렬화를 이벤트 루프 밖의 고정 크기 스레드 풀에서 실행합니다.
+기본 스레드 풀(asyncio.to_thread)과 분리해 AI 호출·메모리 리포트 같은 다른 작업이
+저장소 작업 대기열을 밀어내지 않도록 하고, 동시에 실행되는 저장소 작업 수를 제한합니다.
+요청 컨텍스트를 복사해 실행하므로 stage_timer 측정값도 해당 요청의 Server-Timing에 포함됩니다.
+"""
+import asyncio
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .metrics import registry
+
+T = TypeVar("T")
+
+# 저장소 작업을 동시에 실행할 스레드 수
+STORAGE_IO_WORKERS = int(os.getenv("STORAGE_IO_WORKERS", "4"))
+
+storage_io_duration = registry.histogram(
+    "storage_io_duration_seconds",
+    "저장소 스레드 풀 작업 시간 (대기 제외)",
+    labelnames=("operation",)
+)
+storage_io_wait = registry.histogram(
+    "storage_io_wait_seconds",
+    "저장소 스레드 풀에서 실행되기까지 기다린 시간",
+    labelnames=("operation",)
+)
+storage_io_pending = registry.gauge(
+    "storage_io_pending",
+    "저장소 스레드 풀에 제출되어 끝나지 않은 작업 수 (대기 + 실행 중)"
+)
+
+storage_executor = ThreadPoolExecutor(max_workers=max(1, STORAGE_IO_WORKERS), thread_name_prefix="storage-io")
+
+
+def _operation_name(func: Callable) -> str:
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", "call")
+    return f"{type(owner).__name__}.{name}" if owner is not None else name
+
+
+async def run_storage(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """func(*args, **kwargs)를 저장소 스레드 풀에서 실행하고 결과 반환"""
+    operation = _operation_name(func)
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+
+    def call() -> T:
+        started = time.perf_counter()
+        storage_io_wait.observe(started - submitted, operation)
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            storage_io_duration.observe(time.perf_counter() - started, operation)
+
+    storage_io_pending.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(storage_executor, call)
+    finally:
+        storage_io_pending.dec()
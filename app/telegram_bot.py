@@ -1,11 +1,24 @@
 import os
 import asyncio
+import hashlib
+import hmac
 import logging
-from typing import Dict, Any
-from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
+from telegram.request import BaseRequest
+from telegram.ext import Application, CommandHandler, InlineQueryHandler, MessageHandler, filters, ContextTypes
 from .ai_service import generate_vocabulary_entry
+from .storage import storage
 from .models import VocabularyEntry
+from .memory_report import register_memory_source
+from .metrics import registry
+from .bot_session_store import BotSessionStore
+from .bot_update_processor import build_update_processor
+from .telegram_sender import TelegramSender
+from .prefix_index import vocabulary_index
+from .loop_monitor import LoopLagMonitor
 
 # 환경변수 로드
 try:
@@ -24,10 +37,51 @@ logger = logging.getLogger(__name__)
 # 텔레그램 봇 토큰
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
 
+# 웹훅 모드: 공개 URL이 설정되면 웹 앱(FastAPI) 프로세스가 업데이트를 직접 받음
+TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "").rstrip("/")
+TELEGRAM_WEBHOOK_PATH = "/telegram/webhook"
+# 텔레그램이 X-Telegram-Bot-Api-Secret-Token 헤더로 돌려보내는 값 (미설정 시 시작할 때마다 생성)
+TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+TELEGRAM_SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# 인라인 모드: 색인 결과는 즉시 응답하고, 일치 항목이 없을 때만 입력이 멈추길 기다렸다가 AI 생성
+INLINE_RESULT_LIMIT = 10
+INLINE_GENERATE_MIN_LENGTH = int(os.getenv("INLINE_GENERATE_MIN_LENGTH", "2"))
+INLINE_DEBOUNCE_SECONDS = float(os.getenv("INLINE_DEBOUNCE_SECONDS", "0.8"))
+# 텔레그램 인라인 응답 제한(약 10초) 안에 답하도록 AI 생성 대기 상한
+INLINE_GENERATE_TIMEOUT = float(os.getenv("INLINE_GENERATE_TIMEOUT", "6"))
+# 텔레그램 서버가 같은 검색어 결과를 캐시하는 시간 (초)
+INLINE_CACHE_SECONDS = 300
+
+# 웹 앱과 같은 이름의 메트릭 (웹 앱과 저장소를 공유하므로 재사용 비율도 같은 기준으로 집계)
+vocabulary_cache_requests = registry.counter(
+    "vocabulary_cache_requests_total",
+    "저장된 어휘 재사용(캐시) 조회 결과",
+    labelnames=("result",)
+)
+telegram_inline_latency = registry.histogram(
+    "telegram_inline_duration_seconds",
+    "인라인 검색 응답 시간 (source: index, generated, timeout, error, empty)",
+    labelnames=("source",)
+)
+
+
+def inline_debounce_delay(query: str) -> float:
+    """짧은 검색어일수록 더 입력할 가능성이 크므로 오래 기다림"""
+    return INLINE_DEBOUNCE_SECONDS if len(query) < 4 else INLINE_DEBOUNCE_SECONDS / 2
+
 class KoreanVocabBot:
     def __init__(self):
         self.application = None
-        self.user_sessions: Dict[int, Dict[str, Any]] = {}
+        self.user_sessions = BotSessionStore()
+        self._snapshot_task = None
+        # 채팅별 순서를 지키는 동시 처리기 (TELEGRAM_UPDATE_WORKERS가 1이면 None → 순차 처리)
+        self.update_processor = build_update_processor()
+        self.webhook_secret: Optional[str] = None
+        # 전송 제한을 지키는 발신 스케줄러 (Application 생성 시 설정)
+        self.sender: Optional[TelegramSender] = None
+        # 사용자 ID → 가장 최근 인라인 검색 ID (이전 검색어의 AI 생성 생략용)
+        self._latest_inline: Dict[int, str] = {}
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Start 명령어 핸들러"""
@@ -52,14 +106,11 @@ class KoreanVocabBot:
 
 지금 한국어 단어를 입력해보세요! ✨"""
         
-        await update.message.reply_text(welcome_message)
+        await self.sender.send(update.effective_chat.id, welcome_message)
         
         # 사용자 세션 초기화
         user_id = update.effective_user.id
-        self.user_sessions[user_id] = {
-            'last_word': None,
-            'vocab_count': 0
-        }
+        self.user_sessions.reset(user_id)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Help 명령어 핸들러"""
@@ -89,7 +140,7 @@ class KoreanVocabBot:
 
 궁금한 한국어 단어를 입력해보세요! 🎯"""
         
-        await update.message.reply_text(help_text)
+        await self.sender.send(update.effective_chat.id, help_text)
     
     async def about_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """About 명령어 핸들러"""
@@ -117,52 +168,147 @@ class KoreanVocabBot:
 📝 피드백은 언제든 환영합니다!
 즐거운 한국어 학습 되세요! 🇰🇷❤️🇷🇺"""
         
-        await update.message.reply_text(about_text)
+        await self.sender.send(update.effective_chat.id, about_text)
     
     async def translate_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """일반 텍스트 메시지 처리 - 한국어 번역"""
         user_id = update.effective_user.id
+        chat_id = update.effective_chat.id
         korean_word = update.message.text.strip()
         
         # 세션 초기화 (필요시)
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = {
-                'last_word': None,
-                'vocab_count': 0
-            }
+        self.user_sessions.get(user_id)
         
         # 빈 메시지 체크
         if not korean_word:
-            await update.message.reply_text("한국어 단어를 입력해주세요! 🤔")
+            await self.sender.send(chat_id, "한국어 단어를 입력해주세요! 🤔")
             return
         
         # 처리 중 메시지
-        processing_msg = await update.message.reply_text("🔄 번역 중입니다... 잠시만 기다려주세요!")
+        processing_msg = await self.sender.send(chat_id, "🔄 번역 중입니다... 잠시만 기다려주세요!")
         
         try:
-            # AI 서비스를 통한 어휘 생성
-            vocab_entry: VocabularyEntry = await generate_vocabulary_entry(korean_word)
+            vocab_entry = await self.lookup_or_generate(korean_word)
             
             # 세션 업데이트
-            self.user_sessions[user_id]['last_word'] = vocab_entry.original_word
-            self.user_sessions[user_id]['vocab_count'] += 1
+            vocab_count = self.user_sessions.record_word(user_id, vocab_entry.original_word)
             
             # 응답 메시지 구성
-            response = self._format_vocabulary_response(vocab_entry, self.user_sessions[user_id]['vocab_count'])
+            response = self._format_vocabulary_response(vocab_entry, vocab_count)
             
-            # 처리 중 메시지 삭제 후 결과 전송
-            await processing_msg.delete()
-            await update.message.reply_text(response, parse_mode='HTML')
+            # 처리 중 메시지를 결과로 수정 (삭제 + 새 메시지 대신 API 호출 한 번)
+            await self.sender.replace(chat_id, processing_msg, response, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"번역 처리 중 오류: {e}")
-            await processing_msg.delete()
-            await update.message.reply_text(
+            await self.sender.replace(
+                chat_id,
+                processing_msg,
                 f"⚠️ 번역 처리 중 오류가 발생했습니다.\n\n"
                 f"🔄 다시 시도해주세요.\n"
                 f"문제가 계속되면 /help를 확인해보세요."
             )
     
+    async def lookup_or_generate(self, word: str) -> VocabularyEntry:
+        """
+        웹 앱과 공유하는 어휘 저장소를 먼저 확인하고, 없으면 AI로 생성해 저장합니다.
+        다른 프로세스가 바꾼 파일을 다시 읽어야 할 때만 저장소 스레드 풀을 쓰고,
+        저장은 단일 작성자 태스크를 거칩니다.
+        """
+        existing_entry = await storage.get_by_word_async(word)
+        if existing_entry:
+            vocabulary_cache_requests.inc("hit")
+            return existing_entry
+        vocabulary_cache_requests.inc("miss")
+        
+        # AI 서비스를 통한 어휘 생성
+        vocab_entry: VocabularyEntry = await generate_vocabulary_entry(word)
+        
+        # 교정된 단어로 기존 어휘 재확인
+        corrected_word = vocab_entry.spelling_check.corrected_word if vocab_entry.spelling_check else None
+        if corrected_word and corrected_word != word:
+            existing_corrected = await storage.get_by_word_async(corrected_word)
+            if existing_corrected:
+                return existing_corrected
+        
+        return await storage.save_async(vocab_entry)
+    
+    async def inline_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """인라인 검색 핸들러 - 접두사 색인으로 즉시 응답"""
+        inline_query = update.inline_query
+        query = inline_query.query.strip()
+        started = time.perf_counter()
+        
+        entries: List[VocabularyEntry] = []
+        source = "empty"
+        if query:
+            # 색인 재생성은 파일을 읽으므로 변경이 있을 때만 스레드에서 실행하고,
+            # 루프에서는 그 결과(또는 마지막 색인)만 검색 (루프에서 다시 refresh하지 않음)
+            if vocabulary_index.stale:
+                # AI 캐시(OrderedDict)는 루프에서 계속 바뀌므로 목록은 루프에서 떠서 넘김
+                index = await asyncio.to_thread(vocabulary_index.refresh, vocabulary_index.cache_snapshot())
+            else:
+                index = vocabulary_index.current
+            entries = index.search(query, INLINE_RESULT_LIMIT)
+            source = "index" if entries else "empty"
+            if not entries and len(query) >= INLINE_GENERATE_MIN_LENGTH:
+                entries, source = await self._generate_inline(inline_query.from_user.id, inline_query.id, query)
+                if source == "superseded":
+                    # 사용자가 이미 다음 검색어를 입력함 (이 검색에는 응답하지 않음)
+                    return
+        
+        results = [self._inline_result(entry) for entry in entries]
+        await inline_query.answer(results, cache_time=INLINE_CACHE_SECONDS if results else 0)
+        telegram_inline_latency.observe(time.perf_counter() - started, source)
+    
+    async def _generate_inline(self, user_id: int, query_id: str, query: str) -> Tuple[List[VocabularyEntry], str]:
+        """입력이 멈춘 검색어에 대해서만 AI 생성 (시간 초과 시에도 생성은 계속되어 캐시에 남음)"""
+        self._latest_inline[user_id] = query_id
+        try:
+            await self._inline_debounce(query)
+            if self._latest_inline.get(user_id) != query_id:
+                return [], "superseded"
+            generation = asyncio.ensure_future(generate_vocabulary_entry(query))
+            entry = await asyncio.wait_for(asyncio.shield(generation), INLINE_GENERATE_TIMEOUT)
+            return [entry], "generated"
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ 인라인 AI 생성 시간 초과: {query}")
+            return [], "timeout"
+        except Exception as e:
+            logger.error(f"인라인 AI 생성 오류: {e}")
+            return [], "error"
+        finally:
+            if self._latest_inline.get(user_id) == query_id:
+                del self._latest_inline[user_id]
+    
+    async def _inline_debounce(self, query: str) -> None:
+        """검색어 입력이 멈출 때까지 대기 (짧은 검색어일수록 오래 기다림)"""
+        await asyncio.sleep(inline_debounce_delay(query))
+    
+    def _inline_result(self, vocab: VocabularyEntry) -> InlineQueryResultArticle:
+        """인라인 검색 결과 항목 (선택하면 단어 카드가 채팅에 전송됨)"""
+        result_id = vocab.id or hashlib.sha1(vocab.original_word.encode("utf-8")).hexdigest()
+        return InlineQueryResultArticle(
+            id=result_id[:64],
+            title=f"{vocab.original_word} → {vocab.russian_translation}",
+            description=vocab.pronunciation,
+            input_message_content=InputTextMessageContent(
+                self._format_inline_message(vocab), parse_mode='HTML'
+            )
+        )
+    
+    def _format_inline_message(self, vocab: VocabularyEntry) -> str:
+        """인라인으로 보낼 간단한 단어 카드 (예문 1개)"""
+        message = f"""🇰🇷 <b>{vocab.original_word}</b> → 🇷🇺 {vocab.russian_translation}
+🗣️ {vocab.pronunciation}"""
+        if vocab.usage_examples:
+            example = vocab.usage_examples[0]
+            message += f"""
+
+💬 {example.korean_sentence}
+   🇷🇺 {example.russian_translation}"""
+        return message
+    
     def _format_vocabulary_response(self, vocab: VocabularyEntry, count: int) -> str:
         """어휘 응답을 텔레그램 메시지 형식으로 포맷팅"""
         
@@ -206,8 +352,9 @@ class KoreanVocabBot:
         """에러 핸들러"""
         logger.error(f"Update {update} caused error {context.error}")
         
-        if isinstance(update, Update) and update.effective_message:
-            await update.effective_message.reply_text(
+        if isinstance(update, Update) and update.effective_chat and self.sender:
+            await self.sender.send(
+                update.effective_chat.id,
                 "⚠️ 예상치 못한 오류가 발생했습니다.\n"
                 "🔄 다시 시도해주세요.\n"
                 "문제가 계속되면 /start로 재시작하세요."
@@ -226,20 +373,95 @@ class KoreanVocabBot:
         # 메시지 핸들러 (일반 텍스트)
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.translate_message))
         
+        # 인라인 검색 (디바운스 대기 중에 작업 슬롯을 차지하지 않도록 별도 작업으로 실행)
+        self.application.add_handler(InlineQueryHandler(self.inline_query, block=False))
+        
         # 에러 핸들러
         self.application.add_error_handler(self.error_handler)
     
+    def build_application(self, token: str = TELEGRAM_BOT_TOKEN, webhook: bool = False,
+                          request: Optional[BaseRequest] = None) -> Application:
+        """Application 생성 및 핸들러 등록 (request: 테스트용 Bot API 대체 구현)"""
+        builder = Application.builder().token(token)
+        if self.update_processor is not None:
+            builder = builder.concurrent_updates(self.update_processor)
+        if webhook:
+            # 웹훅 모드에서는 getUpdates를 호출하는 Updater가 필요 없음
+            builder = builder.updater(None)
+        if request is not None:
+            builder = builder.request(request)
+            if not webhook:
+                builder = builder.get_updates_request(request)
+        self.application = builder.build()
+        self.sender = TelegramSender(self.application.bot)
+        self.setup_handlers()
+        return self.application
+    
+    async def start_webhook(self, webhook_url: str = TELEGRAM_WEBHOOK_URL,
+                            secret_token: str = TELEGRAM_WEBHOOK_SECRET,
+                            token: str = TELEGRAM_BOT_TOKEN,
+                            request: Optional[BaseRequest] = None) -> bool:
+        """웹훅 모드 시작 (업데이트는 process_webhook_update로 전달받음)"""
+        if not token:
+            logger.error("TELEGRAM_BOT_TOKEN이 설정되지 않았습니다!")
+            return False
+        
+        self.build_application(token, webhook=True, request=request)
+        self.webhook_secret = secret_token or secrets.token_urlsafe(32)
+        
+        try:
+            await self.application.initialize()
+            await self.application.start()
+            await self.application.bot.set_webhook(
+                url=f"{webhook_url}{TELEGRAM_WEBHOOK_PATH}",
+                secret_token=self.webhook_secret,
+                allowed_updates=Update.ALL_TYPES
+            )
+        except Exception as e:
+            logger.error(f"❌ 웹훅 설정 실패: {e}")
+            await self.stop_webhook()
+            return False
+        
+        self._snapshot_task = asyncio.create_task(self.user_sessions.run_snapshots())
+        logger.info(f"🪝 웹훅 모드 시작: {webhook_url}{TELEGRAM_WEBHOOK_PATH}")
+        return True
+    
+    @property
+    def webhook_active(self) -> bool:
+        return self.webhook_secret is not None and self.application is not None and self.application.running
+    
+    def verify_webhook_secret(self, token: Optional[str]) -> bool:
+        """웹훅 요청 헤더의 비밀 토큰 확인"""
+        if not self.webhook_secret or not token:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.webhook_secret.encode("utf-8"))
+    
+    async def process_webhook_update(self, data: Dict[str, Any]) -> None:
+        """웹훅으로 받은 업데이트를 큐에 넣기만 하고 바로 반환 (처리는 Application이 담당)"""
+        update = Update.de_json(data, self.application.bot)
+        await self.application.update_queue.put(update)
+    
+    async def stop_webhook(self) -> None:
+        """웹훅 모드 종료 (웹훅 등록은 유지하여 재시작 동안의 업데이트는 텔레그램이 보관)"""
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+        self.user_sessions.save()
+        self.webhook_secret = None
+        if self.application is not None:
+            if self.application.running:
+                await self.application.stop()
+            await self.application.shutdown()
+        logger.info("🛑 웹훅 모드 종료")
+    
     async def start_polling(self):
         """봇 polling 시작"""
         if not TELEGRAM_BOT_TOKEN:
             logger.error("TELEGRAM_BOT_TOKEN이 설정되지 않았습니다!")
             return
         
-        # Application 생성
-        self.application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-        
-        # 핸들러 설정
-        self.setup_handlers()
+        # Application 생성 및 핸들러 설정
+        self.build_application()
         
         logger.info("🤖 Korean Vocab Bot 시작중...")
         
@@ -256,6 +478,9 @@ class KoreanVocabBot:
             await self.application.initialize()
             await self.application.start()
             await self.application.updater.start_polling(drop_pending_updates=True)
+            self._snapshot_task = asyncio.create_task(self.user_sessions.run_snapshots())
+            # polling 프로세스의 루프 지연/느린 콜백 측정 (웹훅 모드에서는 웹 앱 루프의 모니터가 담당)
+            loop_monitor.start()
             logger.info("🚀 Polling 시작됨. 봇이 메시지를 기다리고 있습니다...")
             
             # 무한 대기
@@ -266,11 +491,30 @@ class KoreanVocabBot:
         except Exception as e:
             logger.error(f"❌ Polling 오류: {e}")
         finally:
+            if self._snapshot_task is not None:
+                self._snapshot_task.cancel()
+            await loop_monitor.stop()
+            self.user_sessions.save()
+            logger.info(f"💾 텔레그램 세션 저장: {self.user_sessions.stats()}")
             await self.application.stop()
             await self.application.shutdown()
 
 # 싱글톤 봇 인스턴스
 bot_instance = KoreanVocabBot()
+# polling 모드 이벤트 루프 모니터 (event_loop_lag_seconds{loop="telegram"})
+loop_monitor = LoopLagMonitor("telegram")
+register_memory_source("telegram_user_sessions", lambda: bot_instance.user_sessions.sessions)
+registry.gauge(
+    "telegram_update_queue_depth",
+    "같은 채팅의 이전 업데이트 또는 작업 슬롯을 기다리는 텔레그램 업데이트 수",
+    callback=lambda: bot_instance.update_processor.queued if bot_instance.update_processor else 0
+)
+registry.gauge(
+    "telegram_updates_in_progress",
+    "핸들러가 실행 중인 텔레그램 업데이트 수",
+    callback=lambda: bot_instance.update_processor.active if bot_instance.update_processor else 0
+)
+registry.gauge("telegram_sessions", "메모리에 유지 중인 텔레그램 사용자 세션 수", callback=lambda: len(bot_instance.user_sessions))
 
 async def run_bot():
     """봇 실행 함수"""
@@ -0,0 +1,189 @@
+"""
+텔레그램 발신 스케줄러
+
+모든 봇 응답을 이 모듈을 거쳐 보냅니다. 텔레그램 전송 제한(채팅당 약 1건/초, 전체 약 30건/초)에
+맞춰 채팅별·전체 토큰 버킷으로 전송 간격을 조절하고, 그래도 RetryAfter(flood control)가 오면
+지정된 시간만큼 해당 채팅과 봇 전체 전송을 멈췄다가 다시 보냅니다.
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Optional
+
+from telegram.error import RetryAfter
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# 초당 전송 수 (전체 / 채팅별) 및 채팅별 순간 허용량
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "25"))
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+TELEGRAM_CHAT_BURST = int(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+# RetryAfter를 받았을 때 다시 시도하는 최대 횟수
+TELEGRAM_SEND_MAX_RETRIES = int(os.getenv("TELEGRAM_SEND_MAX_RETRIES", "3"))
+# 메모리에 유지할 채팅별 버킷 수 (오래 쓰지 않은 채팅부터 제거)
+MAX_CHAT_BUCKETS = 10_000
+
+telegram_send_latency = registry.histogram(
+    "telegram_send_duration_seconds",
+    "텔레그램 Bot API 전송 호출 시간 (대기 제외)",
+    labelnames=("method",)
+)
+telegram_send_wait = registry.histogram(
+    "telegram_send_wait_seconds",
+    "전송 제한 때문에 전송 전에 대기한 시간",
+    labelnames=("scope",)
+)
+telegram_send_throttled = registry.counter(
+    "telegram_send_throttled_total",
+    "전송 제한으로 대기한 전송 수 (chat/global: 토큰 버킷, retry_after: 텔레그램 flood control)",
+    labelnames=("scope",)
+)
+telegram_send_total = registry.counter(
+    "telegram_send_total",
+    "텔레그램 Bot API 전송 결과",
+    labelnames=("method", "result")
+)
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 capacity개까지 모이는 토큰 버킷 (대기 순서는 FIFO)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.validate(rate, capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def validate(rate: float, capacity: float) -> None:
+        """설정값 확인 (rate로 나눠 대기 시간을 계산하므로 0 이하이면 영원히 채워지지 않음)"""
+        if rate <= 0:
+            raise ValueError(f"토큰 버킷 rate는 0보다 커야 합니다: {rate}")
+        if capacity < 1:
+            raise ValueError(f"토큰 버킷 capacity는 1 이상이어야 합니다: {capacity}")
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def pause(self, seconds: float) -> None:
+        """flood control 응답을 받은 경우 지정 시간 동안 토큰 발급 중단"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 대기하고 대기한 시간(초) 반환"""
+        async with self._lock:
+            started = time.monotonic()
+            waited = False
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = max(self.paused_until - now, (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0)
+                if delay <= 0:
+                    break
+                waited = True
+                await asyncio.sleep(delay)
+            self.tokens -= 1
+            return time.monotonic() - started if waited else 0.0
+
+
+def retry_after_seconds(error: RetryAfter) -> float:
+    retry_after = error.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class TelegramSender:
+    """채팅별/전체 전송 제한을 지키며 메시지를 보내는 스케줄러"""
+
+    def __init__(
+        self,
+        bot: Any,
+        global_rate: float = TELEGRAM_GLOBAL_RATE,
+        chat_rate: float = TELEGRAM_CHAT_RATE,
+        chat_burst: int = TELEGRAM_CHAT_BURST,
+        max_retries: int = TELEGRAM_SEND_MAX_RETRIES
+    ):
+        # 채팅별 버킷은 처음 보낼 때 만들어지므로 설정 오류는 여기서 미리 확인
+        TokenBucket.validate(chat_rate, chat_burst)
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self.global_bucket = TokenBucket(global_rate, max(1.0, global_rate))
+        self._chat_buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_rate, self.chat_burst)
+            self._chat_buckets[chat_id] = bucket
+            if len(self._chat_buckets) > MAX_CHAT_BUCKETS:
+                self._chat_buckets.popitem(last=False)
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    async def _wait_turn(self, chat_id: int) -> None:
+        for scope, bucket in (("chat", self._chat_bucket(chat_id)), ("global", self.global_bucket)):
+            waited = await bucket.acquire()
+            if waited > 0:
+                telegram_send_throttled.inc(scope)
+                telegram_send_wait.observe(waited, scope)
+
+    async def _call(self, method: str, chat_id: int, **kwargs) -> Any:
+        """전송 제한을 지켜 Bot API 호출 (RetryAfter는 최대 max_retries번 재시도)"""
+        api = getattr(self.bot, method)
+        for attempt in range(self.max_retries + 1):
+            await self._wait_turn(chat_id)
+            started = time.perf_counter()
+            try:
+                result = await api(chat_id=chat_id, **kwargs)
+            except RetryAfter as e:
+                delay = retry_after_seconds(e)
+                telegram_send_throttled.inc("retry_after")
+                telegram_send_total.inc(method, "retry_after")
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"⏳ 텔레그램 전송 제한 (chat {chat_id}): {delay}초 후 재시도")
+                # flood wait는 봇 전체 한도에도 걸리므로 다른 채팅 전송도 함께 멈춤
+                self._chat_bucket(chat_id).pause(delay)
+                self.global_bucket.pause(delay)
+                continue
+            except Exception:
+                telegram_send_total.inc(method, "error")
+                raise
+            finally:
+                telegram_send_latency.observe(time.perf_counter() - started, method)
+            telegram_send_total.inc(method, "ok")
+            return result
+
+    async def send(self, chat_id: int, text: str, **kwargs) -> Any:
+        return await self._call("send_message", chat_id, text=text, **kwargs)
+
+    async def edit(self, chat_id: int, message_id: int, text: str, **kwargs) -> Any:
+        return await self._call("edit_message_text", chat_id, message_id=message_id, text=text, **kwargs)
+
+    async def replace(self, chat_id: int, message: Optional[Any], text: str, **kwargs) -> Any:
+        """
+        처리 중 메시지를 결과로 교체합니다.
+        삭제 후 새로 보내는 대신 edit 한 번으로 처리하고, 수정할 메시지가 없거나 수정에 실패하면 새로 보냅니다.
+        """
+        if message is not None:
+            try:
+                return await self.edit(chat_id, message.message_id, text, **kwargs)
+            except RetryAfter:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ 처리 중 메시지 수정 실패, 새 메시지로 전송: {e}")
+        return await self.send(chat_id, text, **kwargs)
@@ -1,11 +1,41 @@
 """
 터미널 인터페이스를 위한 핵심 서비스 로직
 """
+import os
 import re
 import enum
-from typing import Optional, Dict, List, Any
-from pydantic import BaseModel
+import time
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Awaitable, Callable, Hashable, Union
 from .ai_service import generate_vocabulary_entry
+from .language_detection import KOREAN, RUSSIAN, LanguageDetectionResult, detect_language as _detect_language
+from .metrics import registry
+from .models import VocabularyEntry
+from .storage import storage
+from .ws_codec import CODEC_JSON, CODEC_MSGPACK, encode_frame
+
+# translate_batch 한 번에 받을 수 있는 최대 항목 수
+TERMINAL_BATCH_MAX_ITEMS = int(os.getenv("TERMINAL_BATCH_MAX_ITEMS", "50"))
+# translate_batch에서 동시에 실행할 AI 호출 수
+TERMINAL_BATCH_CONCURRENCY = int(os.getenv("TERMINAL_BATCH_CONCURRENCY", "3"))
+# 연결(또는 클라이언트 토큰)당 보관할 최근 번역 수
+TERMINAL_HISTORY_SIZE = int(os.getenv("TERMINAL_HISTORY_SIZE", "100"))
+# 재연결 시 히스토리를 이어받을 수 있도록 메모리에 보관할 클라이언트 토큰 수
+TERMINAL_HISTORY_CLIENTS = int(os.getenv("TERMINAL_HISTORY_CLIENTS", "1000"))
+# /history에 표시할 항목 수
+HISTORY_DISPLAY_COUNT = 10
+
+ai_upstream_cancelled = registry.counter(
+    "ai_upstream_cancelled_total",
+    "기다리는 요청이 모두 취소되어 중단된 AI 호출 수"
+)
+ai_calls_shared = registry.counter(
+    "ai_calls_shared_total",
+    "이미 진행 중인 같은 AI 호출에 합류한 요청 수"
+)
 
 
 class TranslationMode(enum.Enum):
@@ -15,15 +45,6 @@ class TranslationMode(enum.Enum):
     RUSSIAN_TO_KOREAN = "russian"
 
 
-class LanguageDetectionResult(BaseModel):
-    """언어 감지 결과"""
-    language: str  # korean, russian, mixed, unknown
-    confidence: float  # 0.0 ~ 1.0
-    text: str
-    should_translate_to: Optional[str] = None
-    forced_language: Optional[str] = None
-
-
 def detect_language(text: str, forced_mode: Optional[TranslationMode] = None) -> LanguageDetectionResult:
     """
     입력 텍스트의 언어를 감지합니다.
@@ -35,110 +56,160 @@ def detect_language(text: str, forced_mode: Optional[TranslationMode] = None) ->
     Returns:
         LanguageDetectionResult: 언어 감지 결과
     """
-    # 입력 텍스트 정리
-    cleaned_text = text.strip()
-    
-    # 빈 입력 처리
-    if not cleaned_text:
-        return LanguageDetectionResult(
-            language="unknown",
-            confidence=0.0,
-            text=text
-        )
+    forced_language = {
+        TranslationMode.KOREAN_TO_RUSSIAN: KOREAN,
+        TranslationMode.RUSSIAN_TO_KOREAN: RUSSIAN,
+    }.get(forced_mode)
+    return _detect_language(text, forced_language)
+
+
+def detect_language_batch(texts: List[str], forced_mode: Optional[TranslationMode] = None) -> List[LanguageDetectionResult]:
+    """여러 텍스트의 언어를 한 번에 감지 (입력 순서대로 반환)"""
+    return [detect_language(text, forced_mode) for text in texts]
+
+
+class SharedCalls:
+    """
+    같은 키의 비동기 호출을 하나로 공유합니다.
+    기다리던 요청이 취소되면 대기만 중단하고, 마지막 대기자까지 취소되면 실제 호출도 취소합니다.
+    """
     
-    # 강제 모드 처리
-    if forced_mode:
-        if forced_mode == TranslationMode.KOREAN_TO_RUSSIAN:
-            return LanguageDetectionResult(
-                language="korean",
-                confidence=1.0,
-                text=text,
-                forced_language="korean",
-                should_translate_to="russian"
-            )
-        elif forced_mode == TranslationMode.RUSSIAN_TO_KOREAN:
-            return LanguageDetectionResult(
-                language="russian",
-                confidence=1.0,
-                text=text,
-                forced_language="russian",
-                should_translate_to="korean"
-            )
-    
-    # 정규식 패턴 정의
-    korean_pattern = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
-    russian_pattern = re.compile(r'[а-яёА-ЯЁ]')
-    
-    # 문자 분석
-    korean_chars = len(korean_pattern.findall(cleaned_text))
-    russian_chars = len(russian_pattern.findall(cleaned_text))
-    total_chars = len(re.sub(r'[^\w]', '', cleaned_text))  # 문자와 숫자만
-    
-    # 유효한 문자가 없는 경우
-    if total_chars == 0:
-        return LanguageDetectionResult(
-            language="unknown",
-            confidence=0.0,
-            text=text
-        )
+    def __init__(self):
+        # 키 → [실제 호출 Task, 대기자 수]
+        self._calls: Dict[Hashable, List[Any]] = {}
     
-    # 신뢰도 계산
-    korean_ratio = korean_chars / total_chars if total_chars > 0 else 0
-    russian_ratio = russian_chars / total_chars if total_chars > 0 else 0
-    
-    # 언어 결정
-    if korean_ratio > 0.7:
-        return LanguageDetectionResult(
-            language="korean",
-            confidence=korean_ratio,
-            text=text,
-            should_translate_to="russian"
-        )
-    elif russian_ratio > 0.7:
-        return LanguageDetectionResult(
-            language="russian",
-            confidence=russian_ratio,
-            text=text,
-            should_translate_to="korean"
-        )
-    elif korean_ratio > 0 and russian_ratio > 0:
-        return LanguageDetectionResult(
-            language="mixed",
-            confidence=max(korean_ratio, russian_ratio),
-            text=text
-        )
-    else:
-        return LanguageDetectionResult(
-            language="unknown",
-            confidence=0.0,
-            text=text
-        )
+    def __len__(self) -> int:
+        return len(self._calls)
+    
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._calls.get(key)
+        if entry is None:
+            entry = [asyncio.ensure_future(factory()), 0]
+            self._calls[key] = entry
+            
+            def forget(_, entry=entry):
+                if self._calls.get(key) is entry:
+                    del self._calls[key]
+            
+            entry[0].add_done_callback(forget)
+        else:
+            ai_calls_shared.inc()
+        
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # shield: 대기자 하나가 취소되어도 공유 중인 호출은 계속 진행
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                # 취소 완료 콜백을 기다리지 않고 바로 빼 두어야 곧바로 들어온 같은 요청이 죽어가는 호출에 합류하지 않음
+                if self._calls.get(key) is entry:
+                    del self._calls[key]
+                task.cancel()
+                ai_upstream_cancelled.inc()
 
 
-def format_terminal_response(
-    data: Optional[Dict[str, Any]], 
-    success: bool = True, 
-    error: Optional[str] = None,
-    command_type: Optional[str] = None,
-    typing_animation: bool = False,
-    mode: Optional[str] = None
-) -> str:
-    """
-    터미널 스타일로 응답을 포맷팅합니다.
+# 터미널 번역용 공유 AI 호출 (같은 입력/모드의 동시 요청은 AI 호출 한 번만 사용)
+shared_translations = SharedCalls()
+
+
+class TranslationHistory:
+    """최근 번역 기록 링 버퍼 (크기가 고정되어 메모리 사용량이 일정함)"""
     
-    Args:
-        data: 번역 데이터
-        success: 성공 여부
-        error: 에러 메시지 (실패시)
-        command_type: 명령어 타입 (help, clear 등)
-        typing_animation: 타이핑 애니메이션 사용 여부
+    def __init__(self, maxlen: int = TERMINAL_HISTORY_SIZE):
+        self.entries: deque = deque(maxlen=maxlen)
     
-    Returns:
-        str: 포맷팅된 터미널 응답
-    """
-    # 타이핑 애니메이션 마커
-    typing_start = "{{TYPING_START}}" if typing_animation else ""
-    typing_end = "{{TYPING_END}}" if typing_animation else ""
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def record(self, text: str, result: Dict[str, Any], latency_ms: float, mode: str) -> None:
+        self.entries.append({
+            "text": text,
+            "success": bool(result.get("success")),
+            "original": result.get("original"),
+            "translation": result.get("translation"),
+            "cached": bool(result.get("cached")),
+            "latency_ms": round(latency_ms, 1),
+            "mode": mode,
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        })
+    
+    def recent(self, limit: int = HISTORY_DISPLAY_COUNT) -> List[Dict[str, Any]]:
+        """최신순 최근 기록"""
+        return list(self.entries)[-limit:][::-1]
+    
+    def stats(self) -> Dict[str, Any]:
+        """버퍼에 남아 있는 기록 기준 통계 (전역 저장소를 읽지 않음)"""
+        entries = list(self.entries)
+        successes = [entry for entry in entries if entry["success"]]
+        latencies = sorted(entry["latency_ms"] for entry in successes)
+        
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+        
+        return {
+            "count": len(entries),
+            "succeeded": len(successes),
+            "failed": len(entries) - len(successes),
+            "cache_hits": sum(1 for entry in successes if entry["cached"]),
+            "latency_avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+            "window": self.entries.maxlen
+        }
+
+
+class TranslationHistoryStore:
+    """클라이언트 토큰별 히스토리 보관소 (프로세스 메모리, 오래 안 쓴 토큰부터 제거)"""
+    
+    def __init__(self, max_clients: int = TERMINAL_HISTORY_CLIENTS):
+        self.max_clients = max_clients
+        self._histories: "OrderedDict[str, TranslationHistory]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._histories)
+    
+    def get(self, client_token: Optional[str]) -> TranslationHistory:
+        """토큰의 히스토리 반환 (토큰이 없으면 연결 전용 히스토리)"""
+        if not client_token:
+            return TranslationHistory()
+        history = self._histories.get(client_token)
+        if history is None:
+            history = TranslationHistory()
+            self._histories[client_token] = history
+            while len(self._histories) > self.max_clients:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(client_token)
+        return history
+
+
+# 전역 터미널 히스토리 보관소
+history_store = TranslationHistoryStore()
+
+
+# 입력과 관계없이 결과가 고정된 명령어 응답
+STATIC_COMMAND_TYPES = ("help", "clear", "mode_change")
+
+MODE_NAMES = {
+    "korean": "한국어 → 러시아어 (korean)",
+    "russian": "러시아어 → 한국어 (russian)", 
+    "auto": "자동 언어 감지 (auto)"
+}
+
+
+def _typing_markers(typing_animation: bool):
+    if typing_animation:
+        return "{{TYPING_START}}", "{{TYPING_END}}"
+    return "", ""
+
+
+def render_static_response(command_type: str, typing_animation: bool = False, mode: Optional[str] = None) -> Optional[str]:
+    """고정 명령어 응답 박스를 새로 그림 (보통은 캐시된 static_response 사용)"""
+    typing_start, typing_end = _typing_markers(typing_animation)
     
     # 명령어 도움말
     if command_type == "help":
@@ -151,6 +222,8 @@ def format_terminal_response(
 │ /mode korean   - 한국어 → 러시아어 모드             │
 │ /mode russian  - 러시아어 → 한국어 모드             │
 │ /mode auto     - 자동 언어 감지 모드                 │
+│ /history       - 최근 번역 기록                      │
+│ /stats         - 최근 번역 통계                      │
 ├─────────────────────────────────────────────────────┤
 │ 사용법: 메시지를 입력하면 자동으로 번역됩니다        │
 ╰─────────────────────────────────────────────────────╯{typing_end}"""
@@ -161,54 +234,167 @@ def format_terminal_response(
     
     # 모드 변경 확인
     if command_type == "mode_change" and mode:
-        mode_names = {
-            "korean": "한국어 → 러시아어 (korean)",
-            "russian": "러시아어 → 한국어 (russian)", 
-            "auto": "자동 언어 감지 (auto)"
-        }
-        mode_name = mode_names.get(mode, mode)
+        mode_name = MODE_NAMES.get(mode, mode)
         return f"""{typing_start}
 ╭─ 모드 변경 ─────────────────────────────────────────╮
 │ ✅ {mode_name} 모드로 변경되었습니다
 ╰─────────────────────────────────────────────────────╯{typing_end}"""
     
-    # 에러 응답
-    if not success or error:
-        return f"""{typing_start}
+    return None
+
+
+@lru_cache(maxsize=64)
+def static_response(command_type: str, typing_animation: bool = False, mode: Optional[str] = None) -> Optional[str]:
+    """고정 명령어 응답 (조합이 몇 개뿐이므로 한 번 그린 결과를 재사용)"""
+    return render_static_response(command_type, typing_animation, mode)
+
+
+@lru_cache(maxsize=256)
+def _error_box(error: str, typing_animation: bool) -> str:
+    typing_start, typing_end = _typing_markers(typing_animation)
+    return f"""{typing_start}
 ╭─ ERROR ─────────────────────────────────────────────╮
-│ ❌ {error or '알 수 없는 오류가 발생했습니다'}
+│ ❌ {error}
+╰─────────────────────────────────────────────────────╯{typing_end}"""
+
+
+def _compile_translation_template(typing_animation: bool) -> Dict[str, str]:
+    """번역 박스의 고정 부분을 타이핑 마커와 함께 미리 만들어 둔 템플릿"""
+    typing_start, typing_end = _typing_markers(typing_animation)
+    # 타이핑 마커의 중괄호가 str.format에 해석되지 않도록 마커는 별도 조각으로 둠
+    return {
+        "start": typing_start,
+        "header": """
+╭─ 번역 결과 ─────────────────────────────────────────╮
+│ 📝 원문: {original}
+│ 🔄 번역: {translation}""",
+        "pronunciation": "\n│ 🔊 발음: {pronunciation}",
+        "examples": "\n├─ 활용 예제 ─────────────────────────────────────────┤",
+        "example": "\n│ ✓ {index}. {korean}\n│    → {russian}",
+        "footer": "\n╰─────────────────────────────────────────────────────╯" + typing_end,
+    }
+
+
+TRANSLATION_TEMPLATES = {flag: _compile_translation_template(flag) for flag in (False, True)}
+
+
+def format_terminal_response(
+    data: Optional[Dict[str, Any]], 
+    success: bool = True, 
+    error: Optional[str] = None,
+    command_type: Optional[str] = None,
+    typing_animation: bool = False,
+    mode: Optional[str] = None,
+    history: Optional[List[Dict[str, Any]]] = None,
+    stats: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    터미널 스타일로 응답을 포맷팅합니다.
+    
+    Args:
+        data: 번역 데이터
+        success: 성공 여부
+        error: 에러 메시지 (실패시)
+        command_type: 명령어 타입 (help, clear 등)
+        typing_animation: 타이핑 애니메이션 사용 여부
+        history: /history 명령어용 최근 번역 목록
+        stats: /stats 명령어용 통계
+    
+    Returns:
+        str: 포맷팅된 터미널 응답
+    """
+    # 도움말/화면 지우기/모드 변경은 미리 그려둔 응답 사용
+    if command_type in STATIC_COMMAND_TYPES:
+        cached = static_response(command_type, typing_animation, mode)
+        if cached is not None:
+            return cached
+    
+    # 타이핑 애니메이션 마커
+    typing_start, typing_end = _typing_markers(typing_animation)
+    
+    # 최근 번역 기록
+    if command_type == "history":
+        result = f"""{typing_start}
+╭─ 최근 번역 ─────────────────────────────────────────╮"""
+        if not history:
+            result += "\n│ 아직 번역 기록이 없습니다"
+        for entry in history or []:
+            if entry["success"]:
+                result += f"\n│ {entry['timestamp'][11:]}  {entry['original']} → {entry['translation']}"
+            else:
+                result += f"\n│ {entry['timestamp'][11:]}  {entry['text']} ❌"
+        result += f"\n╰─────────────────────────────────────────────────────╯{typing_end}"
+        return result
+    
+    # 최근 번역 통계
+    if command_type == "stats" and stats is not None:
+        def ms(value):
+            return f"{value:.0f}ms" if value is not None else "-"
+        return f"""{typing_start}
+╭─ 번역 통계 (최근 {stats['count']}/{stats['window']}건) ─────────────────────╮
+│ ✅ 성공: {stats['succeeded']}  ❌ 실패: {stats['failed']}  💾 캐시: {stats['cache_hits']}
+│ ⏱️ 평균 {ms(stats['latency_avg_ms'])} · p50 {ms(stats['latency_p50_ms'])} · p95 {ms(stats['latency_p95_ms'])}
 ╰─────────────────────────────────────────────────────╯{typing_end}"""
     
+    # 에러 응답
+    if not success or error:
+        return _error_box(error or '알 수 없는 오류가 발생했습니다', typing_animation)
+    
     # 번역 응답
     if data:
-        original = data.get("original", "")
-        translation = data.get("translation", "")
-        pronunciation = data.get("pronunciation", "")
-        examples = data.get("examples", [])
-        
-        result = f"""{typing_start}
-╭─ 번역 결과 ─────────────────────────────────────────╮
-│ 📝 원문: {original}
-│ 🔄 번역: {translation}"""
+        template = TRANSLATION_TEMPLATES[bool(typing_animation)]
+        parts = [template["start"], template["header"].format(
+            original=data.get("original", ""),
+            translation=data.get("translation", "")
+        )]
         
+        pronunciation = data.get("pronunciation", "")
         if pronunciation:
-            result += f"\n│ 🔊 발음: {pronunciation}"
-        
-        result += "\n├─ 활용 예제 ─────────────────────────────────────────┤"
+            parts.append(template["pronunciation"].format(pronunciation=pronunciation))
         
-        for i, example in enumerate(examples[:3], 1):
-            korean = example.get("korean", "")
-            russian = example.get("russian", "")
-            result += f"\n│ ✓ {i}. {korean}"
-            result += f"\n│    → {russian}"
+        parts.append(template["examples"])
+        for i, example in enumerate(data.get("examples", [])[:3], 1):
+            parts.append(template["example"].format(
+                index=i,
+                korean=example.get("korean", ""),
+                russian=example.get("russian", "")
+            ))
         
-        result += f"\n╰─────────────────────────────────────────────────────╯{typing_end}"
-        
-        return result
+        parts.append(template["footer"])
+        return "".join(parts)
     
     return f"{typing_start}응답 데이터가 없습니다.{typing_end}"
 
 
+@lru_cache(maxsize=64)
+def static_command_frame(command_type: str, mode: Optional[str] = None, codec: str = CODEC_JSON) -> Union[str, bytes]:
+    """
+    고정 명령어(help/clear/mode)의 command_result 프레임을 직렬화된 상태로 캐시합니다.
+    request_id는 ws_codec.add_request_id로 전송 직전에 덧붙입니다.
+    """
+    response = {
+        "type": "command_result",
+        "success": True,
+        "command_type": command_type
+    }
+    if codec == CODEC_MSGPACK:
+        if mode:
+            response["mode"] = mode
+    else:
+        response["data"] = static_response("mode_change" if command_type == "mode" else command_type, False, mode)
+    return encode_frame(response, codec)
+
+
+@lru_cache(maxsize=256)
+def command_error_frame(error: str, codec: str = CODEC_JSON) -> Union[str, bytes]:
+    """명령어 오류 command_result 프레임 (오류 문구별로 직렬화 결과 캐시)"""
+    return encode_frame({
+        "type": "command_result",
+        "success": False,
+        "error": error
+    }, codec)
+
+
 async def process_terminal_translation(text: str, mode: TranslationMode = TranslationMode.AUTO) -> Dict[str, Any]:
     """
     터미널 입력을 처리하여 번역 결과를 반환합니다.
@@ -231,24 +417,14 @@ async def process_terminal_translation(text: str, mode: TranslationMode = Transl
                 "error": "지원되지 않는 언어이거나 혼합된 언어입니다. 한국어 또는 러시아어로 입력해주세요."
             }
         
-        # 기존 AI 서비스 활용하여 번역
-        vocabulary_entry = await generate_vocabulary_entry(text)
-        
-        # 터미널 형식으로 데이터 변환
-        examples = []
-        for example in vocabulary_entry.usage_examples:
-            examples.append({
-                "korean": example.korean_sentence,
-                "russian": example.russian_translation
-            })
+        # 감지한 입력 언어를 그대로 AI 서비스에 전달 (같은 방향/입력의 진행 중 호출이 있으면 합류)
+        source_language = detection_result.language
+        vocabulary_entry = await shared_translations.run(
+            (source_language, text.strip()),
+            lambda: generate_vocabulary_entry(text, source_language=source_language)
+        )
         
-        return {
-            "success": True,
-            "original": vocabulary_entry.original_word,
-            "translation": vocabulary_entry.russian_translation,
-            "pronunciation": vocabulary_entry.pronunciation,
-            "examples": examples
-        }
+        return entry_to_translation_result(vocabulary_entry)
         
     except Exception as e:
         return {
@@ -257,6 +433,72 @@ async def process_terminal_translation(text: str, mode: TranslationMode = Transl
         }
 
 
+def entry_to_translation_result(vocabulary_entry: VocabularyEntry) -> Dict[str, Any]:
+    """어휘 항목을 터미널 번역 결과 형식으로 변환"""
+    examples = []
+    for example in vocabulary_entry.usage_examples:
+        examples.append({
+            "korean": example.korean_sentence,
+            "russian": example.russian_translation
+        })
+    
+    return {
+        "success": True,
+        "original": vocabulary_entry.original_word,
+        "translation": vocabulary_entry.russian_translation,
+        "pronunciation": vocabulary_entry.pronunciation,
+        "examples": examples
+    }
+
+
+async def process_terminal_batch(
+    texts: List[str],
+    mode: TranslationMode,
+    on_result: Callable[[int, str, Dict[str, Any]], Awaitable[None]],
+    concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    여러 텍스트를 번역하고 항목이 끝날 때마다 on_result(index, text, result)를 호출합니다.
+    AI로 번역한 항목의 result에는 latency_ms가 포함됩니다.
+    저장된 어휘는 AI 호출 없이 바로 반환하고, 나머지는 동시 실행 수를 제한하여 AI로 번역합니다.
+    한 항목의 실패는 다른 항목에 영향을 주지 않습니다.
+    
+    Returns:
+        Dict[str, Any]: 전체/성공/실패/저장소 적중 수와 소요 시간 요약
+    """
+    started_at = time.perf_counter()
+    # 저장소는 배치당 한 번만 읽음 (항목마다 파일 전체를 다시 파싱하지 않도록)
+    known_entries = {entry.original_word: entry for entry in await storage.load_all_async()}
+    semaphore = asyncio.Semaphore(concurrency or TERMINAL_BATCH_CONCURRENCY)
+    
+    async def run_item(index: int, raw_text: Any) -> Dict[str, Any]:
+        text = raw_text.strip() if isinstance(raw_text, str) else ""
+        if not text:
+            result = {"success": False, "error": "빈 텍스트는 번역할 수 없습니다."}
+        elif text in known_entries:
+            result = {**entry_to_translation_result(known_entries[text]), "cached": True}
+        else:
+            async with semaphore:
+                item_started_at = time.perf_counter()
+                result = await process_terminal_translation(text, mode)
+                result = {**result, "latency_ms": (time.perf_counter() - item_started_at) * 1000}
+        await on_result(index, text, result)
+        return result
+    
+    results = await asyncio.gather(
+        *(run_item(index, text) for index, text in enumerate(texts)),
+        return_exceptions=True
+    )
+    succeeded = sum(1 for result in results if isinstance(result, dict) and result.get("success"))
+    return {
+        "total": len(texts),
+        "succeeded": succeeded,
+        "failed": len(texts) - succeeded,
+        "cache_hits": sum(1 for result in results if isinstance(result, dict) and result.get("cached")),
+        "duration_ms": round((time.perf_counter() - started_at) * 1000, 1)
+    }
+
+
 def parse_terminal_command(text: str) -> Optional[Dict[str, Any]]:
     """
     터미널 명령어를 파싱합니다.
@@ -304,7 +546,8 @@ def parse_terminal_command(text: str) -> Optional[Dict[str, Any]]:
             return {"type": "invalid", "error": "올바른 모드를 입력해주세요: korean, russian, auto"}
         return {"type": "mode", "mode": args[0], "args": args}
     elif command in ["/history", "/stats"]:
-        # 향후 구현 예정인 명령어들
-        return {"type": "invalid", "error": f"{command} 명령어는 아직 구현되지 않았습니다"}
+        if args:
+            return {"type": "invalid", "error": f"{command} 명령어는 추가 인자를 받지 않습니다"}
+        return {"type": command[1:], "args": args}
     else:
         return {"type": "invalid", "error": f"알 수 없는 명령어: {command}"}
\ No newline at end of file
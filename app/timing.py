@@ -0,0 +1,123 @@
+"""
+요청 단계별 시간 측정 (Server-Timing)
+
+핫패스에서 `with stage_timer("ai_generate"):` 형태로 사용합니다.
+측정값은 항상 전역 히스토그램에 누적되고, 요청 컨텍스트가 활성화되어 있으면
+해당 요청의 Server-Timing 헤더에도 포함됩니다.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .loop_monitor import task_label
+from .metrics import registry
+
+# Server-Timing 헤더 노출 여부 (기본: 활성화)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
+stage_duration = registry.histogram(
+    "app_stage_duration_seconds",
+    "요청 처리 단계별 소요 시간",
+    labelnames=("stage",)
+)
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "라우트별 HTTP 요청 처리 시간",
+    labelnames=("method", "route", "status")
+)
+
+# 현재 요청의 (단계, 소요시간) 목록. 요청 밖에서는 None
+_request_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_stages", default=None)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """코드 블록의 소요 시간을 단계 이름으로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(elapsed, stage)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((stage, elapsed))
+
+
+def format_server_timing(stages: List[Tuple[str, float]], total: Optional[float] = None) -> str:
+    """단계 목록을 Server-Timing 헤더 값으로 변환 (같은 단계는 합산하고 횟수를 desc에 표시)"""
+    merged: Dict[str, List[float]] = {}
+    for stage, elapsed in stages:
+        entry = merged.setdefault(stage, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+
+    parts = []
+    for stage, (elapsed, count) in merged.items():
+        metric = f"{stage};dur={elapsed * 1000:.2f}"
+        if count > 1:
+            metric += f';desc="x{count}"'
+        parts.append(metric)
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def route_path(scope) -> str:
+    """경로 템플릿 (라우팅 전이거나 일치하는 라우트가 없으면 unmatched, 레이블 폭증 방지)"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def route_label(scope) -> str:
+    return f"{scope.get('method', 'WS')} {route_path(scope)}"
+
+
+class RequestTimingMiddleware:
+    """
+    HTTP 요청마다 단계 수집을 시작하고 라우트별 지연 시간을 기록하는 ASGI 미들웨어.
+    server_timing이 켜져 있으면 응답 헤더에 Server-Timing을 추가합니다.
+    HTTP/WebSocket 요청을 처리하는 태스크에는 느린 콜백 보고용 라우트 이름을 붙입니다.
+    """
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING_ENABLED):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            if scope["type"] == "websocket":
+                with task_label(lambda: route_label(scope)):
+                    await self.app(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+            return
+
+        stages: List[Tuple[str, float]] = []
+        token = _request_stages.set(stages)
+        start = time.perf_counter()
+        status = "500"
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+                if self.server_timing:
+                    header = format_server_timing(stages, time.perf_counter() - start)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", header.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with task_label(lambda: route_label(scope)):
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stages.reset(token)
+            # 경로 템플릿 기준으로 기록 (레이블 폭증 방지)
+            http_request_duration.observe(
+                time.perf_counter() - start, scope["method"], route_path(scope), status
+            )
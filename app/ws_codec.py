@@ -0,0 +1,69 @@
+"""
+터미널 WebSocket 프레임 인코딩
+
+기본은 JSON 텍스트 프레임입니다. 클라이언트가 연결 시 `msgpack` 서브프로토콜
+(Sec-WebSocket-Protocol) 또는 `?format=msgpack` 쿼리로 요청하면 MessagePack 바이너리
+프레임을 사용하고, 미리 그려진 박스 문자열 대신 구조화된 필드만 보냅니다.
+msgpack 패키지가 설치되지 않은 경우 항상 JSON으로 동작합니다.
+"""
+import json
+from typing import Any, Optional, Tuple, Union
+
+from fastapi import WebSocket
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성
+    msgpack = None
+
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+
+def negotiate_codec(websocket: WebSocket) -> Tuple[str, Optional[str]]:
+    """(사용할 코덱, accept 시 응답할 서브프로토콜) 결정"""
+    if msgpack is None:
+        return CODEC_JSON, None
+    if MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        return CODEC_MSGPACK, MSGPACK_SUBPROTOCOL
+    if websocket.query_params.get("format") == CODEC_MSGPACK:
+        return CODEC_MSGPACK, None
+    return CODEC_JSON, None
+
+
+def encode_frame(message: dict, codec: str = CODEC_JSON) -> Union[str, bytes]:
+    """전송할 프레임 (JSON이면 str, MessagePack이면 bytes)"""
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(message, use_bin_type=True)
+    return json.dumps(message, ensure_ascii=False)
+
+
+def decode_frame(frame: dict) -> Any:
+    """
+    websocket.receive()로 받은 ASGI 메시지를 디코딩합니다.
+    바이너리 프레임은 MessagePack, 텍스트 프레임은 JSON으로 해석하며
+    형식이 잘못되면 ValueError를 발생시킵니다.
+    """
+    raw = frame.get("bytes")
+    if raw is not None:
+        if msgpack is None:
+            raise ValueError("바이너리 프레임은 지원되지 않습니다")
+        try:
+            return msgpack.unpackb(raw, raw=False)
+        except Exception as e:
+            raise ValueError(str(e)) from e
+    return json.loads(frame.get("text") or "")
+
+
+def add_request_id(payload: Union[str, bytes], request_id: Any, codec: str = CODEC_JSON) -> Union[str, bytes]:
+    """
+    이미 직렬화된 객체 프레임 끝에 request_id 필드를 덧붙입니다.
+    캐시된 정적 프레임을 다시 직렬화하지 않고 요청별 ID만 붙이기 위한 용도입니다.
+    """
+    if codec == CODEC_MSGPACK:
+        # fixmap(필드 15개 미만)이면 헤더의 필드 수만 1 늘리고 키/값을 이어 붙임
+        if 0x80 <= payload[0] < 0x8f:
+            return bytes([payload[0] + 1]) + payload[1:] + msgpack.packb("request_id") + msgpack.packb(request_id, use_bin_type=True)
+        return encode_frame({**msgpack.unpackb(payload, raw=False), "request_id": request_id}, codec)
+    return f'{payload[:-1]}, "request_id": {json.dumps(request_id, ensure_ascii=False)}}}'
@@ -0,0 +1,3 @@
+"""
+저장소/서비스 성능 측정용 벤치마크 모음
+"""
@@ -0,0 +1,135 @@
+"""
+벤치마크용 합성 데이터 생성기
+
+실제 데이터와 비슷한 한국어/러시아어 어휘, 채팅 세션, 북마크를 만들어
+저장소 클래스를 다양한 규모로 채울 때 사용합니다.
+"""
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from app.models import (
+    VocabularyEntry, UsageExample, SpellCheckInfo,
+    ChatSession, ChatMessage, BookmarkEntry
+)
+
+# 자주 쓰이는 한국어 어근과 어미 (조합해서 고유한 단어를 만든다)
+KOREAN_STEMS = [
+    "사랑", "행복", "친구", "가족", "마음", "약속", "기억", "여행", "하늘", "바다",
+    "노래", "웃음", "눈물", "선물", "아침", "저녁", "주말", "생일", "편지", "꿈",
+    "보고싶", "고마", "미안", "좋아", "기다리", "만나", "먹", "마시", "걷", "듣",
+]
+KOREAN_ENDINGS = ["", "해", "해요", "하다", "스럽다", "했어", "할게", "하자", "이야", "이에요"]
+
+RUSSIAN_WORDS = [
+    "любовь", "счастье", "друг", "семья", "сердце", "обещание", "память", "путешествие",
+    "небо", "море", "песня", "улыбка", "слёзы", "подарок", "утро", "вечер", "выходные",
+    "день рождения", "письмо", "мечта", "скучаю", "спасибо", "извини", "нравится",
+    "ждать", "встречаться", "есть", "пить", "гулять", "слушать",
+]
+RUSSIAN_PHRASES = [
+    "Я тебя люблю", "Мне очень приятно", "Давай встретимся завтра",
+    "Я скучаю по тебе", "Спасибо за всё", "Как прошёл твой день?",
+]
+ROMANIZATION_SYLLABLES = ["sa", "rang", "haeng", "bok", "chin", "gu", "ga", "jok", "ma", "eum", "yo", "hae"]
+
+
+class SyntheticDataGenerator:
+    """재현 가능한(seed 고정) 합성 데이터 생성기"""
+
+    def __init__(self, seed: int = 42):
+        self.random = random.Random(seed)
+        self._word_counter = 0
+
+    def korean_word(self) -> str:
+        """고유한 한국어 단어 생성 (어근 + 어미 + 일련번호)"""
+        self._word_counter += 1
+        stem = self.random.choice(KOREAN_STEMS)
+        ending = self.random.choice(KOREAN_ENDINGS)
+        return f"{stem}{ending}{self._word_counter}"
+
+    def russian_text(self) -> str:
+        return self.random.choice(RUSSIAN_WORDS)
+
+    def pronunciation(self) -> str:
+        syllables = self.random.choices(ROMANIZATION_SYLLABLES, k=self.random.randint(2, 4))
+        return f"[{'-'.join(syllables)}]"
+
+    def usage_examples(self, word: str) -> List[UsageExample]:
+        return [
+            UsageExample(
+                korean_sentence=f"정말 {word}요",
+                russian_translation=self.random.choice(RUSSIAN_PHRASES),
+                grammar_note="기본형에 '-요'가 붙은 존댓말 표현입니다",
+                grammar_note_russian="Вежливая форма с окончанием '-요'",
+                context="연인에게 메시지를 보낼 때",
+                context_russian="когда пишешь сообщение любимому человеку"
+            )
+            for _ in range(3)
+        ]
+
+    def vocabulary_entry(self, word: Optional[str] = None) -> VocabularyEntry:
+        word = word or self.korean_word()
+        return VocabularyEntry(
+            id=str(uuid.uuid4()),
+            original_word=word,
+            russian_translation=self.russian_text(),
+            pronunciation=self.pronunciation(),
+            usage_examples=self.usage_examples(word),
+            spelling_check=SpellCheckInfo(
+                original_word=word,
+                corrected_word=word,
+                has_spelling_error=False
+            ),
+            created_at=datetime.now() - timedelta(minutes=self.random.randint(0, 60 * 24 * 90))
+        )
+
+    def vocabulary_entries(self, count: int) -> List[VocabularyEntry]:
+        return [self.vocabulary_entry() for _ in range(count)]
+
+    def ai_message(self, word: Optional[str] = None) -> ChatMessage:
+        word = word or self.korean_word()
+        translation = self.russian_text()
+        return ChatMessage(
+            type="ai",
+            text=translation,
+            pronunciation=self.pronunciation(),
+            russian_translation=translation,
+            usage_examples=self.usage_examples(word)
+        )
+
+    def chat_session(self, message_pairs: int = 3) -> ChatSession:
+        updated = datetime.now() - timedelta(minutes=self.random.randint(0, 60 * 24 * 60))
+        session = ChatSession(created_at=updated, last_updated=updated)
+        session.session_id = f"{updated.strftime('%Y-%m-%d')}-{uuid.uuid4().hex[:8]}"
+        session.add_message(ChatMessage(type="system", text="👋 안녕하세요!"))
+        for _ in range(message_pairs):
+            word = self.korean_word()
+            session.add_message(ChatMessage(type="user", text=word))
+            session.add_message(self.ai_message(word))
+        session.last_updated = updated
+        return session
+
+    def chat_sessions(self, count: int, message_pairs: int = 3) -> List[ChatSession]:
+        return [self.chat_session(message_pairs) for _ in range(count)]
+
+    def bookmark_entry(self) -> BookmarkEntry:
+        word = self.korean_word()
+        created = datetime.now() - timedelta(days=self.random.randint(0, 90))
+        return BookmarkEntry(
+            session_id=f"{created.strftime('%Y-%m-%d')}-{uuid.uuid4().hex[:8]}",
+            message_id=str(uuid.uuid4()),
+            korean_text=word,
+            russian_translation=self.russian_text(),
+            pronunciation=self.pronunciation(),
+            usage_examples=self.usage_examples(word),
+            created_at=created,
+            review_count=self.random.randint(0, 5),
+            difficulty_level=self.random.randint(1, 5),
+            # 약 절반은 이미 복습 시점이 지난 상태로 만든다
+            next_review_date=datetime.now() + timedelta(days=self.random.randint(-30, 30))
+        )
+
+    def bookmark_entries(self, count: int) -> List[BookmarkEntry]:
+        return [self.bookmark_entry() for _ in range(count)]
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+저장소 마이크로 벤치마크
+
+VocabularyStorage, ChatStorage, BookmarkStorage의 주요 연산을
+데이터 규모별(기본 1k/10k/100k)로 측정하고 결과를 JSON으로 저장합니다.
+
+사용법:
+    python -m benchmarks.storage_benchmark
+    python -m benchmarks.storage_benchmark --sizes 1000 10000 --iterations 10
+    python -m benchmarks.storage_benchmark --compare benchmarks/results/이전결과.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.storage import VocabularyStorage
+from app.chat_storage import ChatStorage
+from app.bookmark_storage import BookmarkStorage
+from benchmarks.data_generator import SyntheticDataGenerator
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_ITERATIONS = 5
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(operation: Callable[[], object], iterations: int) -> Dict[str, float]:
+    """연산을 반복 실행하여 소요 시간 통계(ms)를 반환"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+    return {
+        "iterations": iterations,
+        "min_ms": round(samples[0], 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[p95_index], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def seed_vocabulary(path: str, generator: SyntheticDataGenerator, size: int) -> List[str]:
+    """어휘 파일을 한 번에 채우고 저장된 단어 목록 반환 (save를 size번 호출하면 O(n²))"""
+    entries = generator.vocabulary_entries(size)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([entry.dict() for entry in entries], f, ensure_ascii=False, indent=2, default=str)
+    return [entry.original_word for entry in entries]
+
+
+def bench_vocabulary(workdir: str, generator: SyntheticDataGenerator, size: int, iterations: int) -> List[Dict]:
+    path = os.path.join(workdir, f"vocabulary_{size}.json")
+    words = seed_vocabulary(path, generator, size)
+    store = VocabularyStorage(path)
+
+    return [
+        {"operation": "save", **measure(lambda: store.save(generator.vocabulary_entry()), iterations)},
+        {"operation": "get_by_word", **measure(lambda: store.get_by_word(generator.random.choice(words)), iterations)},
+        {"operation": "load_all", **measure(store.load_all, iterations)},
+    ]
+
+
+def bench_chat(workdir: str, generator: SyntheticDataGenerator, size: int, iterations: int) -> List[Dict]:
+    path = os.path.join(workdir, f"chat_sessions_{size}.json")
+    store = ChatStorage(path)
+    for session in generator.chat_sessions(size):
+        store.sessions[session.session_id] = session
+    store.save_all_sessions()
+    session_ids = list(store.sessions.keys())
+
+    def add_message():
+        store.add_message_to_session(generator.random.choice(session_ids), generator.ai_message())
+
+    return [
+        {"operation": "add_message_to_session", **measure(add_message, iterations)},
+        {"operation": "get_all_sessions", **measure(store.get_all_sessions, iterations)},
+        {"operation": "load_all_sessions", **measure(store.load_all_sessions, iterations)},
+    ]
+
+
+def bench_bookmarks(workdir: str, generator: SyntheticDataGenerator, size: int, iterations: int) -> List[Dict]:
+    path = os.path.join(workdir, f"bookmarks_{size}.json")
+    store = BookmarkStorage(path)
+    for bookmark in generator.bookmark_entries(size):
+        store.bookmarks[bookmark.id] = bookmark
+    store.save_all_bookmarks()
+
+    def create_bookmark():
+        store.create_bookmark(f"bench-{generator.random.random()}", generator.ai_message())
+
+    return [
+        {"operation": "create_bookmark", **measure(create_bookmark, iterations)},
+        {"operation": "search_bookmarks", **measure(lambda: store.search_bookmarks("사랑"), iterations)},
+        {"operation": "get_bookmarks_for_review", **measure(store.get_bookmarks_for_review, iterations)},
+    ]
+
+
+BENCHMARKS = {
+    "VocabularyStorage": bench_vocabulary,
+    "ChatStorage": bench_chat,
+    "BookmarkStorage": bench_bookmarks,
+}
+
+
+def run_benchmarks(sizes: List[int], iterations: int, seed: int, stores: Optional[List[str]] = None) -> Dict:
+    """모든 벤치마크를 실행하고 JSON 직렬화 가능한 결과 반환"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vocab-bench-") as workdir:
+        for size in sizes:
+            for store_name, bench in BENCHMARKS.items():
+                if stores and store_name not in stores:
+                    continue
+                generator = SyntheticDataGenerator(seed)
+                print(f"⏱️  {store_name} @ {size:,}개 측정 중...", flush=True)
+                for row in bench(workdir, generator, size, iterations):
+                    results.append({"store": store_name, "size": size, **row})
+
+    return {
+        "benchmark": "storage",
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": sizes,
+        "results": results,
+    }
+
+
+def print_report(report: Dict, baseline: Optional[Dict] = None) -> None:
+    """결과 표 출력 (baseline이 있으면 중앙값 비율 함께 표시)"""
+    baseline_index = {}
+    if baseline:
+        baseline_index = {
+            (row["store"], row["operation"], row["size"]): row
+            for row in baseline.get("results", [])
+        }
+
+    print(f"\n{'store':<18} {'operation':<26} {'size':>8} {'median ms':>11} {'p95 ms':>10} {'vs base':>8}")
+    print("-" * 86)
+    for row in report["results"]:
+        ratio = ""
+        base = baseline_index.get((row["store"], row["operation"], row["size"]))
+        if base and base["median_ms"] > 0:
+            ratio = f"{row['median_ms'] / base['median_ms']:.2f}x"
+        print(
+            f"{row['store']:<18} {row['operation']:<26} {row['size']:>8,} "
+            f"{row['median_ms']:>11.3f} {row['p95_ms']:>10.3f} {ratio:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="저장소 마이크로 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="데이터 규모 목록")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="연산별 반복 횟수")
+    parser.add_argument("--seed", type=int, default=42, help="합성 데이터 시드")
+    parser.add_argument("--stores", nargs="+", choices=list(BENCHMARKS), help="측정할 저장소 (기본: 전체)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/storage_<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    # 저장소의 INFO 로그가 측정 출력을 덮지 않도록
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
+
+    report = run_benchmarks(args.sizes, args.iterations, args.seed, args.stores)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"storage_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+    print(f"\n💾 결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
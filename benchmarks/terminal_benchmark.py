@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+터미널 메시지 처리 마이크로 벤치마크
+
+WebSocket 터미널에서 메시지 하나를 처리할 때 드는 CPU 비용을 경로별로 측정합니다.
+각 항목은 이전 방식(baseline)과 현재 방식(current)을 같은 입력으로 비교합니다.
+
+사용법:
+    python -m benchmarks.terminal_benchmark
+    python -m benchmarks.terminal_benchmark --loops 50000 --benchmarks command
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import timeit
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.terminal_service import (
+    parse_terminal_command,
+    render_static_response,
+    static_command_frame,
+    command_error_frame,
+    format_terminal_response,
+)
+from app.ws_codec import CODEC_JSON, add_request_id
+from app.language_detection import LanguageDetectionResult, detect_language, count_scripts, count_scripts_batch
+
+DEFAULT_LOOPS = 20_000
+DEFAULT_REPEAT = 5
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+COMMAND_INPUTS = ["/help", "/clear", "/mode korean", "/mode auto", "/unknown"]
+
+DETECTION_INPUTS = {
+    "korean_word": "사랑",
+    "russian_word": "любовь",
+    "korean_sentence": "오늘 저녁에 같이 영화 보러 갈래요? 정말 보고 싶었어요",
+    "mixed": "안녕 привет hello",
+}
+
+# 정규식 다중 패스 집계 (코드 포인트 단일 패스 도입 전)
+_REGEX_HANGUL = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
+_REGEX_CYRILLIC = re.compile(r'[а-яёА-ЯЁ]')
+_REGEX_NON_WORD = re.compile(r'[^\w]')
+
+SAMPLE_TRANSLATION = {
+    "original": "사랑",
+    "translation": "любовь",
+    "pronunciation": "саран",
+    "examples": [
+        {"korean": "사랑해요", "russian": "Я люблю тебя"},
+        {"korean": "사랑은 아름다워요", "russian": "Любовь прекрасна"},
+        {"korean": "첫사랑", "russian": "Первая любовь"},
+    ],
+}
+
+
+def per_call_us(operation: Callable[[], object], loops: int, repeat: int) -> float:
+    """repeat번 측정 중 가장 빠른 회차의 호출당 시간(µs)"""
+    return min(timeit.repeat(operation, number=loops, repeat=repeat)) / loops * 1_000_000
+
+
+def command_before(text: str, request_id: str) -> str:
+    """캐시 도입 전 방식: 매번 박스를 그리고 응답 dict 전체를 직렬화"""
+    command = parse_terminal_command(text)
+    if command["type"] == "invalid":
+        response = {"type": "command_result", "success": False, "error": command["error"]}
+    else:
+        command_type = "mode_change" if command["type"] == "mode" else command["type"]
+        response = {
+            "type": "command_result",
+            "success": True,
+            "data": render_static_response(command_type, False, command.get("mode")),
+            "command_type": command["type"],
+        }
+    response["request_id"] = request_id
+    return json.dumps(response, ensure_ascii=False)
+
+
+def command_after(text: str, request_id: str) -> str:
+    """현재 방식: 미리 직렬화된 프레임에 request_id만 덧붙임"""
+    command = parse_terminal_command(text)
+    if command["type"] == "invalid":
+        payload = command_error_frame(command["error"], CODEC_JSON)
+    else:
+        payload = static_command_frame(command["type"], command.get("mode"), CODEC_JSON)
+    return add_request_id(payload, request_id, CODEC_JSON)
+
+
+def bench_command(loops: int, repeat: int) -> List[Dict]:
+    rows = []
+    for text in COMMAND_INPUTS:
+        # 두 방식이 같은 프레임을 만드는지 먼저 확인
+        assert json.loads(command_before(text, "req-1")) == json.loads(command_after(text, "req-1"))
+        before = per_call_us(lambda: command_before(text, "req-1"), loops, repeat)
+        after = per_call_us(lambda: command_after(text, "req-1"), loops, repeat)
+        rows.append({"case": text, "baseline_us": round(before, 3), "current_us": round(after, 3)})
+    return rows
+
+
+def bench_translation_format(loops: int, repeat: int) -> List[Dict]:
+    """번역 박스 렌더링 + 직렬화 (입력마다 달라 캐시할 수 없는 경로, 절대값만 측정)"""
+    def render():
+        return json.dumps({
+            "type": "translation",
+            "success": True,
+            "data": format_terminal_response(SAMPLE_TRANSLATION, typing_animation=True),
+        }, ensure_ascii=False)
+
+    return [{"case": "translation_box", "baseline_us": None, "current_us": round(per_call_us(render, loops, repeat), 3)}]
+
+
+def legacy_detect_twice(text: str) -> str:
+    """통합 전 방식: 터미널 감지(호출마다 패턴 생성) 후 AI 서비스에서 같은 입력을 다시 감지"""
+    cleaned_text = text.strip()
+    korean_chars = len(re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]').findall(cleaned_text))
+    russian_chars = len(re.compile(r'[а-яёА-ЯЁ]').findall(cleaned_text))
+    total_chars = len(re.sub(r'[^\w]', '', cleaned_text))
+    korean_ratio = korean_chars / total_chars if total_chars else 0
+    russian_ratio = russian_chars / total_chars if total_chars else 0
+    if korean_ratio > 0.7:
+        LanguageDetectionResult(language="korean", confidence=korean_ratio, text=text, should_translate_to="russian")
+    elif russian_ratio > 0.7:
+        LanguageDetectionResult(language="russian", confidence=russian_ratio, text=text, should_translate_to="korean")
+    else:
+        LanguageDetectionResult(language="mixed", confidence=max(korean_ratio, russian_ratio), text=text)
+    # ai_service.detect_language
+    if re.compile(r'[\u0400-\u04FF]').search(text):
+        return "russian"
+    if re.compile(r'[가-힣]').search(text):
+        return "korean"
+    return "korean"
+
+
+def bench_language_detection(loops: int, repeat: int) -> List[Dict]:
+    """요청 하나당 언어 감지 비용 (통합 전: 2회 감지, 현재: 1회 감지 후 방향 전달)"""
+    rows = []
+    for case, text in DETECTION_INPUTS.items():
+        before = per_call_us(lambda: legacy_detect_twice(text), loops, repeat)
+        after = per_call_us(lambda: detect_language(text), loops, repeat)
+        rows.append({"case": case, "baseline_us": round(before, 3), "current_us": round(after, 3)})
+    return rows
+
+
+def regex_count_scripts(text: str):
+    return (
+        len(_REGEX_HANGUL.findall(text)),
+        len(_REGEX_CYRILLIC.findall(text)),
+        len(_REGEX_NON_WORD.sub('', text)),
+    )
+
+
+def bench_script_counting(loops: int, repeat: int) -> List[Dict]:
+    """문자 집계: 정규식 3회 패스 대비 코드 포인트 단일 패스 (배치는 입력 100개 기준)"""
+    cases = dict(DETECTION_INPUTS)
+    cases["long_paragraph"] = DETECTION_INPUTS["korean_sentence"] * 20
+    rows = []
+    for case, text in cases.items():
+        before = per_call_us(lambda: regex_count_scripts(text), loops, repeat)
+        after = per_call_us(lambda: count_scripts(text), loops, repeat)
+        rows.append({"case": case, "baseline_us": round(before, 3), "current_us": round(after, 3)})
+
+    words = list(DETECTION_INPUTS.values()) * 25
+    batch_loops = max(1, loops // 100)
+    before = per_call_us(lambda: [regex_count_scripts(word) for word in words], batch_loops, repeat)
+    after = per_call_us(lambda: count_scripts_batch(words), batch_loops, repeat)
+    rows.append({"case": "batch_100", "baseline_us": round(before, 3), "current_us": round(after, 3)})
+    return rows
+
+
+BENCHMARKS = {
+    "command": bench_command,
+    "language_detection": bench_language_detection,
+    "script_counting": bench_script_counting,
+    "translation_format": bench_translation_format,
+}
+
+
+def run_benchmarks(loops: int, repeat: int, names: Optional[List[str]] = None) -> Dict:
+    """선택한 벤치마크를 실행하고 JSON 직렬화 가능한 결과 반환"""
+    results = []
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        print(f"⏱️  {name} 측정 중...", flush=True)
+        for row in bench(loops, repeat):
+            results.append({"benchmark": name, **row})
+
+    return {
+        "benchmark": "terminal",
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "loops": loops,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n{'benchmark':<20} {'case':<18} {'baseline µs':>12} {'current µs':>11} {'speedup':>8}")
+    print("-" * 73)
+    for row in report["results"]:
+        baseline = row["baseline_us"]
+        speedup = f"{baseline / row['current_us']:.1f}x" if baseline and row["current_us"] else ""
+        baseline_text = f"{baseline:.3f}" if baseline is not None else "-"
+        print(
+            f"{row['benchmark']:<20} {row['case']:<18} {baseline_text:>12} "
+            f"{row['current_us']:>11.3f} {speedup:>8}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="터미널 메시지 처리 마이크로 벤치마크")
+    parser.add_argument("--loops", type=int, default=DEFAULT_LOOPS, help="회차당 호출 수")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="측정 회차 수 (최솟값 사용)")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="측정할 항목 (기본: 전체)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/terminal_<시각>.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_benchmarks(args.loops, args.repeat, args.benchmarks)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"terminal_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_report(report)
+    print(f"\n💾 결과 저장: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
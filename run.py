@@ -21,5 +21,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=port,
         reload=False,  # 프로덕션 환경에서는 reload=False
-        log_level="info"
+        log_level="info",
+        # WebSocket permessage-deflate 압축 (클라이언트가 지원하면 협상됨)
+        ws_per_message_deflate=os.environ.get("WS_PER_MESSAGE_DEFLATE", "true").lower() in ("1", "true", "yes")
     )
\ No newline at end of file
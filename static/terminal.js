@@ -14,6 +14,8 @@ class KoreanTerminal {
         this.commandHistory = [];
         this.historyIndex = -1;
         this.stats = { translations: 0, commands: 0 };
+        this.requestCounter = 0; // 응답 매칭용 request_id 일련번호
+        this.clientToken = this.getClientToken(); // 재연결 후에도 /history 유지
         this.typingAnimation = true;
         this.autoScroll = true;
         
@@ -134,9 +136,22 @@ class KoreanTerminal {
         });
     }
 
+    getClientToken() {
+        try {
+            let token = localStorage.getItem('terminal_client_token');
+            if (!token) {
+                token = Math.random().toString(36).slice(2) + Date.now().toString(36);
+                localStorage.setItem('terminal_client_token', token);
+            }
+            return token;
+        } catch (error) {
+            return '';
+        }
+    }
+
     initializeWebSocket() {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws/terminal`;
+        const wsUrl = `${protocol}//${window.location.host}/ws/terminal?client_token=${encodeURIComponent(this.clientToken)}`;
         
         try {
             this.websocket = new WebSocket(wsUrl);
@@ -201,12 +216,26 @@ class KoreanTerminal {
             case 'translation':
                 this.handleTranslationMessage(message);
                 break;
+            case 'batch_item':
+                this.handleTranslationMessage(message);
+                return; // 요약 프레임이 올 때까지 로딩 표시 유지
+            case 'batch_summary':
+                this.handleBatchSummary(message);
+                break;
             case 'command_result':
                 this.handleCommandMessage(message);
                 break;
             case 'stats':
                 this.handleStatsMessage(message);
                 break;
+            case 'ping':
+                // 서버 하트비트에 응답 (응답이 없으면 끊긴 연결로 정리됨)
+                if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
+                    this.websocket.send(JSON.stringify({ type: 'pong' }));
+                }
+                return;
+            case 'pong':
+                return;
             case 'error':
                 this.addSystemMessage(message.message, 'error');
                 break;
@@ -228,11 +257,23 @@ class KoreanTerminal {
             this.addAIMessage(message.data);
             this.stats.translations++;
             this.updateStatsDisplay();
+        } else if (message.cancelled) {
+            // 취소된 번역은 조용히 무시 (latest-wins 모드에서 새 입력에 밀린 요청 등)
+            return;
         } else {
             this.addSystemMessage(`번역 실패: ${message.error}`, 'error');
         }
     }
 
+    handleBatchSummary(message) {
+        if (message.success) {
+            const { total, succeeded, failed } = message.data;
+            this.addSystemMessage(`일괄 번역 완료: ${succeeded}/${total} 성공` + (failed ? `, ${failed} 실패` : ''), failed ? 'error' : 'success');
+        } else {
+            this.addSystemMessage(`일괄 번역 실패: ${message.error}`, 'error');
+        }
+    }
+
     handleCommandMessage(message) {
         if (message.success) {
             if (message.command_type === 'clear') {
@@ -316,7 +357,8 @@ class KoreanTerminal {
         const message = {
             type: messageType,
             text: text,
-            mode: 'session' // 세션 모드 사용
+            mode: 'session', // 세션 모드 사용
+            request_id: `req-${++this.requestCounter}` // 번역은 완료 순서대로 응답됨
         };
         
         try {
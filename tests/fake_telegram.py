@@ -0,0 +1,101 @@
+"""
+오프라인 테스트용 가짜 텔레그램 Bot API
+
+python-telegram-bot의 BaseRequest 구현으로, 실제 네트워크 대신 메모리에서 Bot API 호출을
+받아 기록하고 그럴듯한 응답을 돌려줍니다. api_latency로 API 지연을 흉내 낼 수 있어
+웹훅 모드의 부하 테스트에도 사용합니다.
+"""
+import asyncio
+import itertools
+import json
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from telegram.request import BaseRequest, RequestData
+
+FAKE_BOT_TOKEN = "123456:TEST-TOKEN"
+
+
+def make_update(update_id: int, chat_id: int, text: str) -> Dict[str, Any]:
+    """텔레그램이 웹훅으로 보내는 텍스트 메시지 업데이트 JSON"""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": f"user{chat_id}"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": f"user{chat_id}"},
+            "text": text,
+        },
+    }
+
+
+class FakeTelegramServer(BaseRequest):
+    """Bot API 호출을 기록하는 가짜 서버"""
+
+    def __init__(self, api_latency: float = 0.0):
+        self.api_latency = api_latency
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.webhook: Dict[str, Any] = {}
+        # 채팅 ID → 봇이 보낸(또는 수정한) 메시지 텍스트 목록
+        self.sent: Dict[int, List[str]] = defaultdict(list)
+        self._message_ids = itertools.count(1000)
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        return None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def methods(self) -> List[str]:
+        return [method for method, _ in self.calls]
+
+    def _message(self, params: Dict[str, Any], message_id: Optional[int] = None) -> Dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        return {
+            "message_id": message_id or next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "text": params.get("text", ""),
+        }
+
+    def _handle(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "Fake", "username": "fake_vocab_bot"}
+        if method == "setWebhook":
+            self.webhook = params
+            return True
+        if method == "deleteWebhook":
+            self.webhook = {}
+            return True
+        if method == "sendMessage":
+            self.sent[int(params["chat_id"])].append(params["text"])
+            return self._message(params)
+        if method == "editMessageText":
+            self.sent[int(params["chat_id"])].append(params["text"])
+            return self._message(params, int(params["message_id"]))
+        return True
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None,
+                         pool_timeout=None) -> Tuple[int, bytes]:
+        api_method = url.rsplit("/", 1)[-1]
+        params = request_data.parameters if request_data else {}
+        self.calls.append((api_method, params))
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+        payload = {"ok": True, "result": self._handle(api_method, params)}
+        return 200, json.dumps(payload).encode("utf-8")
+
+    async def wait_for(self, predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+        """조건이 참이 될 때까지 대기 (시간 초과 시 AssertionError)"""
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise AssertionError(f"가짜 텔레그램 서버 대기 시간 초과: {self.methods()[-10:]}")
+            await asyncio.sleep(0.01)
@@ -0,0 +1,109 @@
+"""
+관리자 진단 기능 (요청 프로파일링, 메모리 리포트) 테스트
+"""
+import pytest
+import app.admin
+from app.profiling import profile_store
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+@pytest.fixture
+def admin_profiling(monkeypatch, tmp_path):
+    """관리자 토큰을 설정하고 프로파일 저장 위치를 임시 디렉토리로 변경"""
+    monkeypatch.setattr(app.admin, "ADMIN_TOKEN", "test-admin-token")
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    monkeypatch.setattr(profile_store, "max_profiles", 2)
+    return tmp_path
+
+class TestRequestProfiling:
+    """HTTP 요청 프로파일링 테스트"""
+
+    def test_profile_header_requires_admin_token(self, client, admin_profiling):
+        """관리자 토큰 없이 X-Profile 헤더만 보내면 프로파일링하지 않음"""
+        response = client.get("/health", headers={"X-Profile": "1"})
+        assert "x-profile-id" not in response.headers
+        assert list(admin_profiling.iterdir()) == []
+
+    def test_profiled_request_is_listed_and_downloadable(self, client, admin_profiling):
+        """프로파일 저장, 목록 조회, 두 형식 다운로드 테스트"""
+        response = client.get("/health?profile=1", headers=ADMIN_HEADERS)
+        profile_id = response.headers["x-profile-id"]
+
+        listing = client.get("/admin/profiles", headers=ADMIN_HEADERS).json()
+        assert listing["profiles"][0]["id"] == profile_id
+
+        pstats = client.get(f"/admin/profiles/{profile_id}?format=pstats", headers=ADMIN_HEADERS)
+        assert pstats.status_code == 200
+        assert len(pstats.content) > 0
+        collapsed = client.get(f"/admin/profiles/{profile_id}?format=collapsed", headers=ADMIN_HEADERS)
+        assert collapsed.status_code == 200
+
+    def test_profile_ring_is_bounded(self, client, admin_profiling):
+        """링 크기를 넘으면 오래된 프로파일이 삭제되는지 테스트"""
+        for _ in range(4):
+            client.get("/health", headers={**ADMIN_HEADERS, "X-Profile": "1"})
+        assert len(profile_store.list_profiles()) == 2
+
+    def test_profile_is_saved_off_the_event_loop(self, client, admin_profiling, monkeypatch):
+        """프로파일 파일 쓰기가 이벤트 루프가 아닌 저장소 스레드에서 실행되는지 테스트"""
+        import threading
+        threads = []
+        original_save = profile_store.save
+
+        def recording_save(*args):
+            threads.append(threading.current_thread().name)
+            original_save(*args)
+
+        monkeypatch.setattr(profile_store, "save", recording_save)
+        response = client.get("/health", headers={**ADMIN_HEADERS, "X-Profile": "1"})
+
+        assert threads and threads[0].startswith("storage-io")
+        assert profile_store.list_profiles()[0]["id"] == response.headers["x-profile-id"]
+
+    def test_admin_endpoints_reject_invalid_token(self, client, admin_profiling):
+        """잘못된 토큰과 경로 조작 ID 거부 테스트"""
+        assert client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        response = client.get("/admin/profiles/..%2F..%2Fetc?format=pstats", headers=ADMIN_HEADERS)
+        assert response.status_code in (400, 404)
+
+    def test_websocket_message_profiling(self, client, admin_profiling):
+        """관리자 WebSocket 연결에서 메시지 단위 프로파일링 테스트"""
+        with client.websocket_connect("/ws/terminal?admin_token=test-admin-token") as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "command", "text": "/help", "profile": True})
+            assert websocket.receive_json()["type"] == "command_result"
+            profile_message = websocket.receive_json()
+            assert profile_message["type"] == "profile"
+            assert profile_message["message_type"] == "command"
+
+class TestMemoryReport:
+    """메모리 진단 엔드포인트 테스트"""
+
+    def test_deep_sizeof_counts_nested_objects(self):
+        """중첩 객체가 크기에 포함되는지 테스트"""
+        from app.memory_report import deep_sizeof
+        small = deep_sizeof({"a": 1})
+        large = deep_sizeof({"a": ["x" * 10_000]})
+        assert large["bytes"] > small["bytes"] + 10_000
+        assert deep_sizeof(list(range(100)), max_objects=10)["truncated"] is True
+
+    def test_memory_report_lists_stores(self, client, admin_profiling):
+        """저장소 크기 리포트 테스트"""
+        response = client.get("/admin/memory", headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        stores = response.json()["data"]["stores"]
+        assert "chat_sessions" in stores
+        assert "bookmarks" in stores
+        assert stores["chat_sessions"]["bytes"] > 0
+
+    def test_tracemalloc_start_stop_diff(self, client, admin_profiling):
+        """tracemalloc 시작/종료 스냅샷 비교 테스트"""
+        assert client.post("/admin/memory/tracemalloc/stop", headers=ADMIN_HEADERS).status_code == 409
+        assert client.post("/admin/memory/tracemalloc/start", headers=ADMIN_HEADERS).json()["data"]["started"]
+        leak = [bytearray(1024) for _ in range(100)]
+        response = client.post("/admin/memory/tracemalloc/stop?limit=5", headers=ADMIN_HEADERS)
+        assert response.status_code == 200
+        top = response.json()["data"]["top"]
+        assert len(top) <= 5
+        assert all(":" in stat["location"] for stat in top)
+        del leak
@@ -0,0 +1,56 @@
+"""
+AI 서비스 번역 방향 및 생성 결과 캐시 테스트
+"""
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.ai_service import generate_vocabulary_entry, generation_cache, create_basic_entry
+from app.terminal_service import process_terminal_translation, TranslationMode
+
+class TestDirectionAwareGeneration:
+    """입력 언어(번역 방향) 전달 테스트"""
+    
+    @pytest.fixture(autouse=True)
+    def fake_agent(self):
+        """프롬프트를 기록하고 입력 그대로의 기본 항목을 돌려주는 가짜 에이전트"""
+        generation_cache.clear()
+        agent = SimpleNamespace(prompts=[])
+        
+        async def run(prompt):
+            agent.prompts.append(prompt)
+            return SimpleNamespace(data=create_basic_entry("사랑", source_language="korean"))
+        
+        agent.run = run
+        with patch('app.ai_service.vocabulary_agent', agent):
+            yield agent
+        generation_cache.clear()
+    
+    @pytest.mark.asyncio
+    async def test_cache_is_per_direction(self, fake_agent):
+        """같은 입력이라도 방향이 다르면 따로 생성/캐시되는지 테스트"""
+        await generate_vocabulary_entry("사랑", source_language="korean")
+        await generate_vocabulary_entry("사랑", source_language="korean")
+        assert len(fake_agent.prompts) == 1
+        
+        await generate_vocabulary_entry("사랑", source_language="russian")
+        assert len(fake_agent.prompts) == 2
+        assert "러시아어 단어/표현" in fake_agent.prompts[1]
+    
+    @pytest.mark.asyncio
+    async def test_cached_entry_is_a_copy(self, fake_agent):
+        """캐시된 항목을 수정해도 캐시에 영향이 없는지 테스트"""
+        first = await generate_vocabulary_entry("사랑", source_language="korean")
+        first.id = "changed"
+        second = await generate_vocabulary_entry("사랑", source_language="korean")
+        assert second.id is None
+    
+    @pytest.mark.asyncio
+    async def test_terminal_forced_mode_reaches_ai_service(self):
+        """터미널의 강제 모드가 AI 서비스 방향으로 그대로 전달되는지 테스트"""
+        entry = create_basic_entry("사랑", source_language="korean")
+        with patch('app.terminal_service.generate_vocabulary_entry', new=AsyncMock(return_value=entry)) as generate:
+            result = await process_terminal_translation("사랑", TranslationMode.RUSSIAN_TO_KOREAN)
+        
+        assert result["success"] is True
+        generate.assert_awaited_once_with("사랑", source_language="russian")
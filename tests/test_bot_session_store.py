@@ -0,0 +1,68 @@
+"""
+텔레그램 봇 사용자 세션 저장소 테스트
+"""
+import json
+import time
+
+from app.bot_session_store import BotSessionStore
+
+
+class TestBotSessionStore:
+    """LRU/TTL 제한 및 스냅샷 테스트"""
+
+    def test_lru_eviction_keeps_recent_users(self):
+        """최대 사용자 수를 넘으면 가장 오래 사용하지 않은 사용자부터 제거되는지 테스트"""
+        store = BotSessionStore(storage_file=None, max_users=3)
+        for user_id in (1, 2, 3):
+            store.record_word(user_id, "사랑")
+        store.get(1)  # 1번 사용자를 최근 사용으로 갱신
+        store.get(4)
+
+        assert len(store) == 3
+        assert 2 not in store
+        assert 1 in store and 4 in store
+        assert store.evicted["lru"] == 1
+
+    def test_ttl_expiry(self):
+        """TTL이 지난 세션은 조회/정리 시 새 세션으로 대체되는지 테스트"""
+        store = BotSessionStore(storage_file=None, ttl=60)
+        store.record_word(1, "사랑")
+        store.record_word(2, "안녕")
+        store.sessions[1]['last_seen'] -= 120
+        store.sessions.move_to_end(2)
+
+        assert store.expire() == 1
+        assert 1 not in store
+        assert store.get(1)['vocab_count'] == 0
+        assert store.evicted["ttl"] == 1
+
+    def test_snapshot_roundtrip(self, tmp_path):
+        """스냅샷 저장 후 재시작 시 누적 단어 수가 이어지고 만료 세션은 제외되는지 테스트"""
+        path = tmp_path / "sessions.json"
+        store = BotSessionStore(storage_file=str(path), ttl=60)
+        store.record_word(1, "사랑")
+        store.record_word(1, "안녕")
+        store.record_word(2, "고마워")
+        store.sessions[2]['last_seen'] -= 120
+        assert store.save()
+        assert not store.dirty
+
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert set(data["sessions"]) == {"1", "2"}
+
+        restored = BotSessionStore(storage_file=str(path), ttl=60)
+        assert len(restored) == 1
+        assert restored.record_word(1, "감사") == 3
+
+    def test_load_keeps_most_recent_when_over_limit(self, tmp_path):
+        """스냅샷이 최대 사용자 수보다 크면 최근 사용자만 로드되는지 테스트"""
+        path = tmp_path / "sessions.json"
+        now = time.time()
+        sessions = {
+            str(user_id): {"last_word": None, "vocab_count": user_id, "last_seen": now - 100 + user_id}
+            for user_id in range(10)
+        }
+        path.write_text(json.dumps({"sessions": sessions}), encoding='utf-8')
+
+        store = BotSessionStore(storage_file=str(path), max_users=3)
+        assert list(store.sessions) == [7, 8, 9]
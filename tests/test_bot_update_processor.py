@@ -0,0 +1,71 @@
+"""
+텔레그램 업데이트 동시 처리기 테스트
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.bot_update_processor import ChatOrderedUpdateProcessor, build_update_processor
+
+
+def fake_update(chat_id):
+    return SimpleNamespace(effective_chat=SimpleNamespace(id=chat_id))
+
+
+class TestChatOrderedUpdateProcessor:
+    """채팅별 순서 보장 및 작업 수 제한 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_per_chat_order_and_cross_chat_concurrency(self):
+        """같은 채팅은 순서대로, 다른 채팅은 느린 채팅을 기다리지 않고 처리되는지 테스트"""
+        processor = ChatOrderedUpdateProcessor(workers=2)
+        finished = []
+        peak = 0
+
+        async def handler(name, delay):
+            nonlocal peak
+            peak = max(peak, processor.active)
+            await asyncio.sleep(delay)
+            finished.append(name)
+
+        async with processor:
+            tasks = [
+                asyncio.create_task(processor.process_update(fake_update(1), handler("a1", 0.05))),
+                asyncio.create_task(processor.process_update(fake_update(1), handler("a2", 0.01))),
+                asyncio.create_task(processor.process_update(fake_update(1), handler("a3", 0.01))),
+                asyncio.create_task(processor.process_update(fake_update(2), handler("b1", 0.01))),
+            ]
+            await asyncio.sleep(0.02)
+            # a1 처리 중: a2, a3은 같은 채팅 순서를 기다림
+            assert processor.queued == 2
+            await asyncio.gather(*tasks)
+
+        assert [name for name in finished if name.startswith("a")] == ["a1", "a2", "a3"]
+        assert finished.index("b1") < finished.index("a1")
+        assert peak <= 2
+        assert processor.stats() == {"workers": 2, "queued": 0, "active": 0, "chats_waiting": 0}
+
+    @pytest.mark.asyncio
+    async def test_failed_update_does_not_block_chat(self):
+        """핸들러 오류가 같은 채팅의 다음 업데이트를 막지 않는지 테스트"""
+        processor = ChatOrderedUpdateProcessor(workers=2)
+        finished = []
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        async def handler():
+            finished.append("next")
+
+        first = asyncio.create_task(processor.process_update(fake_update(1), broken()))
+        second = asyncio.create_task(processor.process_update(fake_update(1), handler()))
+        results = await asyncio.gather(first, second, return_exceptions=True)
+
+        assert isinstance(results[0], RuntimeError)
+        assert finished == ["next"]
+
+    def test_single_worker_uses_default_processing(self):
+        """작업 수가 1이면 PTB 기본 순차 처리를 사용하는지 테스트"""
+        assert build_update_processor(1) is None
+        assert build_update_processor(4).workers == 4
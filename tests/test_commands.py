@@ -138,20 +138,18 @@ class TestCommandValidation:
             assert result["type"] == "invalid"
 
 class TestCommandHistory:
-    """명령어 히스토리 테스트 (향후 구현 대비)"""
+    """히스토리/통계 명령어 테스트"""
     
-    def test_history_command_placeholder(self):
-        """히스토리 명령어 placeholder 테스트"""
-        # 향후 /history 명령어 구현을 위한 테스트
+    def test_history_command(self):
+        """히스토리 명령어 파싱 테스트"""
         result = parse_terminal_command("/history")
-        # 현재는 invalid이지만 향후 구현 예정
         assert result is not None
-        assert result["type"] == "invalid"
+        assert result["type"] == "history"
+        assert parse_terminal_command("/history all")["type"] == "invalid"
     
-    def test_stats_command_placeholder(self):
-        """통계 명령어 placeholder 테스트"""
-        # 향후 /stats 명령어 구현을 위한 테스트
+    def test_stats_command(self):
+        """통계 명령어 파싱 테스트"""
         result = parse_terminal_command("/stats")
-        # 현재는 invalid이지만 향후 구현 예정
         assert result is not None
-        assert result["type"] == "invalid"
\ No newline at end of file
+        assert result["type"] == "stats"
+        assert parse_terminal_command("/stats now")["type"] == "invalid"
@@ -0,0 +1,178 @@
+"""
+NDJSON 내보내기/가져오기 테스트
+"""
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.ai_service import create_basic_entry
+from app.bookmark_storage import BookmarkStorage
+from app.chat_storage import ChatStorage
+from app.data_transfer import export_ndjson, import_ndjson, iter_ndjson_lines
+from app.models import BookmarkEntry
+from app.storage import VocabularyStorage
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+
+def ndjson(records) -> bytes:
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+
+
+@pytest.fixture
+def stores(tmp_path):
+    vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+    chat_storage = ChatStorage(str(tmp_path / "chat.json"))
+    bookmark_storage = BookmarkStorage(str(tmp_path / "bookmarks.json"))
+    with patch("app.data_transfer.storage", vocabulary_storage), \
+            patch("app.data_transfer.chat_storage", chat_storage), \
+            patch("app.data_transfer.bookmark_storage", bookmark_storage):
+        yield vocabulary_storage, chat_storage, bookmark_storage
+
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    import app.admin
+    monkeypatch.setattr(app.admin, "ADMIN_TOKEN", "test-admin-token")
+
+
+class TestNdjsonLines:
+    """스트림 줄 나누기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_lines_split_across_chunks(self):
+        """묶음 경계에 걸친 줄과 마지막 줄바꿈 없는 줄을 올바르게 나누는지 테스트"""
+        lines = [line async for line in iter_ndjson_lines(stream(b'{"a":', b' 1}\n\n{"b"', b': 2}\n{"c": 3}'))]
+
+        assert lines == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+    @pytest.mark.asyncio
+    async def test_line_without_newline_is_capped(self):
+        """줄바꿈 없이 한도를 넘는 본문을 버퍼에 쌓지 않고 중단하는지 테스트"""
+        with pytest.raises(ValueError, match="2번째 줄"):
+            async for _ in iter_ndjson_lines(stream(b'{}\n', b"x" * 64, b"y" * 64), max_line_bytes=100):
+                pass
+
+
+class TestImport:
+    """배치 가져오기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_vocabulary_batches_flush_once_each(self, stores):
+        """batch_size줄마다 파일 저장 한 번으로 반영되는지 테스트"""
+        vocabulary_storage = stores[0]
+        body = ndjson(create_basic_entry(f"단어{index}").dict() for index in range(5))
+        writes = []
+        original_write = vocabulary_storage._write_unlocked
+
+        def counting_write(entries):
+            writes.append(len(entries))
+            original_write(entries)
+
+        with patch.object(vocabulary_storage, '_write_unlocked', side_effect=counting_write):
+            summary = await import_ndjson("vocabulary", stream(body), batch_size=2)
+
+        assert summary["imported"] == 5
+        assert summary["batches"] == 3
+        assert writes == [2, 4, 5]
+        assert vocabulary_storage.get_by_word("단어4") is not None
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_are_reported_and_skipped(self, stores):
+        """잘못된 줄은 줄 번호와 함께 보고되고 나머지는 저장되는지 테스트"""
+        good = json.dumps(create_basic_entry("사랑").dict(), ensure_ascii=False, default=str)
+        body = f'{good}\nnot json\n[1, 2]\n{{"original_word": "빠짐"}}\n'.encode("utf-8")
+
+        summary = await import_ndjson("vocabulary", stream(body))
+
+        assert summary["imported"] == 1
+        assert summary["failed"] == 3
+        assert [error["line"] for error in summary["errors"]] == [2, 3, 4]
+        assert stores[0].get_by_word("사랑") is not None
+
+    @pytest.mark.asyncio
+    async def test_bookmarks_replace_same_id(self, stores):
+        """같은 ID의 북마크는 중복 없이 교체되는지 테스트"""
+        bookmark_storage = stores[2]
+        bookmark = BookmarkEntry(session_id="s", message_id="m", korean_text="안녕", russian_translation="привет")
+        bookmark_storage.import_bookmarks([bookmark])
+        updated = bookmark.dict()
+        updated["russian_translation"] = "здравствуйте"
+
+        summary = await import_ndjson("bookmarks", stream(ndjson([json.loads(json.dumps(updated, default=str))])))
+
+        assert summary["imported"] == 1
+        bookmarks = bookmark_storage.get_all_bookmarks(None)
+        assert [b.id for b in bookmarks] == [bookmark.id]
+        assert bookmarks[0].russian_translation == "здравствуйте"
+
+
+class TestExport:
+    """묶음 단위 내보내기 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_export_reads_store_in_pages(self, stores):
+        """전체 목록을 한 번에 읽지 않고 chunk_size개씩 저장소에서 꺼내는지 테스트"""
+        vocabulary_storage = stores[0]
+        vocabulary_storage.apply([("save", create_basic_entry(f"단어{index}")) for index in range(5)])
+
+        with patch.object(vocabulary_storage, 'load_all', side_effect=AssertionError("전체 로드 금지")), \
+                patch.object(vocabulary_storage, 'get_page', wraps=vocabulary_storage.get_page) as get_page:
+            chunks = [chunk async for chunk in export_ndjson("vocabulary", chunk_size=2)]
+
+        assert [call.args for call in get_page.call_args_list] == [(0, 2), (2, 2), (4, 2)]
+        words = [json.loads(line)["original_word"] for chunk in chunks for line in chunk.splitlines()]
+        assert words == [f"단어{index}" for index in range(5)]
+
+
+class TestExportEndpoint:
+    """/api/export ↔ /api/import 왕복 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_round_trip(self, stores, admin_token, tmp_path):
+        """내보낸 NDJSON을 빈 저장소로 가져오면 같은 세션이 복원되는지 테스트"""
+        from app.main import app
+
+        chat_storage = stores[1]
+        for index in range(3):
+            chat_storage.create_session(f"대화 {index}")
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            exported = await client.get("/api/export", params={"kind": "sessions"})
+            assert exported.status_code == 200
+            assert exported.headers["content-type"].startswith("application/x-ndjson")
+            assert len(exported.content.splitlines()) == 3
+
+            restored = ChatStorage(str(tmp_path / "restored.json"))
+            with patch("app.data_transfer.chat_storage", restored):
+                imported = await client.post("/api/import", params={"kind": "sessions"},
+                                             content=exported.content, headers=ADMIN_HEADERS)
+
+            invalid = await client.get("/api/export", params={"kind": "users"})
+
+        assert imported.json()["data"]["imported"] == 3
+        assert {s.session_id for s in restored.get_all_sessions(None)} == \
+            {s.session_id for s in chat_storage.get_all_sessions(None)}
+        assert invalid.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_import_requires_admin_token(self, stores, admin_token):
+        """관리자 토큰 없이(또는 틀린 토큰으로) 가져오면 거부되고 아무것도 저장되지 않는지 테스트"""
+        from app.main import app
+
+        body = ndjson([create_basic_entry("사랑").dict()])
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            missing = await client.post("/api/import", content=body)
+            wrong = await client.post("/api/import", content=body, headers={"X-Admin-Token": "wrong"})
+
+        assert missing.status_code in (401, 403)
+        assert wrong.status_code in (401, 403)
+        assert stores[0].get_by_word("사랑") is None
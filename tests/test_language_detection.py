@@ -0,0 +1,122 @@
+"""
+코드 포인트 기반 언어 감지 테스트 (이전 정규식 구현과의 일치 여부)
+"""
+import random
+import re
+
+from app.language_detection import (
+    count_scripts,
+    count_scripts_batch,
+    detect_language,
+    detect_languages,
+    LanguageDetectionResult,
+)
+
+# 기준 구현: 통합 전 terminal_service.detect_language의 정규식과 판단 그대로 (findall 두 번 + re.sub)
+_HANGUL = re.compile(r'[가-힣ㄱ-ㅎㅏ-ㅣ]')
+_CYRILLIC = re.compile(r'[а-яёА-ЯЁ]')
+_NON_WORD = re.compile(r'[^\w]')
+
+def regex_detect_language(text: str) -> LanguageDetectionResult:
+    cleaned_text = text.strip()
+    if not cleaned_text:
+        return LanguageDetectionResult(language="unknown", confidence=0.0, text=text)
+    korean_chars = len(_HANGUL.findall(cleaned_text))
+    russian_chars = len(_CYRILLIC.findall(cleaned_text))
+    total_chars = len(_NON_WORD.sub('', cleaned_text))
+    if total_chars == 0:
+        return LanguageDetectionResult(language="unknown", confidence=0.0, text=text)
+    korean_ratio = korean_chars / total_chars
+    russian_ratio = russian_chars / total_chars
+    if korean_ratio > 0.7:
+        return LanguageDetectionResult(language="korean", confidence=korean_ratio, text=text, should_translate_to="russian")
+    if russian_ratio > 0.7:
+        return LanguageDetectionResult(language="russian", confidence=russian_ratio, text=text, should_translate_to="korean")
+    if korean_ratio > 0 and russian_ratio > 0:
+        return LanguageDetectionResult(language="mixed", confidence=max(korean_ratio, russian_ratio), text=text)
+    return LanguageDetectionResult(language="unknown", confidence=0.0, text=text)
+
+# 경계 문자: 자모 범위 끝, ё/Ё, 러시아어가 아닌 키릴 문자(ѐ, ї, і, ў, ђ, Ӏ), 키릴 기호(҂)와 결합 부호(҃, ҇),
+# 전각 숫자, 밑줄, 이모지, 한자
+ALPHABET = "가힣ㄱㅎㅏㅣㅤ각힝абвёЁЯАяѐїіЎўђӀӿ҂҃҇abcXYZ019０_ !?,.~\t\n😀漢ᄀ"
+
+# 키릴 블록이지만 러시아어 자모가 아닌 문자 위주의 입력
+NON_RUSSIAN_CYRILLIC = ["҂҂҂a", "привет҃", "̈́а҃҃", "їжі", "Ўўі", "Україна", "Ђорђе", "ѣѣѣ", "Ӏ"]
+
+def random_corpus(size: int = 2000, seed: int = 7):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 24))) for _ in range(size)]
+
+class TestScriptCounting:
+    """문자 집계 테스트"""
+    
+    def test_counts_by_code_point_range(self):
+        """한글 음절/자모, 키릴, 그 외 단어 문자 집계 테스트"""
+        counts = count_scripts("사랑ㅋ привет҂ abc_1 !")
+        assert counts.hangul_syllables == 2
+        assert counts.hangul_jamo == 1
+        assert counts.cyrillic == 6
+        assert counts.other_word == 5
+        assert counts.word == 2 + 1 + 6 + 5
+    
+    def test_counts_match_regex(self):
+        """무작위 입력에서 정규식 집계와 같은 값을 내는지 테스트"""
+        corpus = random_corpus()
+        for text, counts in zip(corpus, count_scripts_batch(corpus)):
+            assert counts.hangul == len(_HANGUL.findall(text)), text
+            assert counts.cyrillic == len(_CYRILLIC.findall(text)), text
+            assert counts.word == len(_NON_WORD.sub('', text)), text
+
+class TestDetectionParity:
+    """감지 결과 일치 테스트"""
+    
+    def test_detection_matches_regex_implementation(self):
+        """무작위 입력과 샘플 단어에서 이전 구현과 같은 결과인지 테스트"""
+        corpus = random_corpus() + ["사랑", "любовь", "안녕 привет hello", "12345", "!@#$%", "안녕하세요!", "   "]
+        for text in corpus:
+            assert detect_language(text) == regex_detect_language(text), text
+    
+    def test_non_russian_cyrillic_matches_baseline(self):
+        """키릴 기호/결합 부호와 다른 언어의 키릴 문자에서도 기준 구현과 같고 신뢰도가 1.0을 넘지 않는지 테스트"""
+        for text in NON_RUSSIAN_CYRILLIC:
+            result = detect_language(text)
+            assert result == regex_detect_language(text), text
+            assert 0.0 <= result.confidence <= 1.0, text
+        assert detect_language("їжі").language == "unknown"
+        assert detect_language("҂҂҂a").language == "unknown"
+    
+    def test_batch_api_preserves_order(self):
+        """배치 API가 입력 순서대로 결과를 반환하는지 테스트"""
+        results = detect_languages(["사랑", "любовь", ""])
+        assert [result.language for result in results] == ["korean", "russian", "unknown"]
+        assert detect_languages(["사랑"], forced_language="russian")[0].language == "russian"
+
+
+class TestSourceLanguageAgreement:
+    """터미널 감지와 AI 서비스 입력 언어 판단이 같은 규칙인지 테스트"""
+
+    def test_ai_path_agrees_with_terminal_detector(self):
+        """혼합/경계 입력에서 두 진입점이 같은 언어로 판단하는지 테스트"""
+        from app.ai_service import detect_language as ai_detect_language
+
+        corpus = random_corpus() + NON_RUSSIAN_CYRILLIC + [
+            "사랑", "любовь", "안녕 привет hello", "привет 안녕하세요", "Привет, John!", "hello", "12345", "ё", "   "
+        ]
+        for text in corpus:
+            detected = detect_language(text).language
+            ai_language = ai_detect_language(text)
+            assert ai_language in ("korean", "russian"), text
+            if detected in ("korean", "russian"):
+                assert ai_language == detected, text
+            else:
+                counts = count_scripts(text)
+                assert ai_language == ("russian" if counts.cyrillic > counts.hangul else "korean"), text
+
+    def test_single_cyrillic_letter_no_longer_overrides_korean(self):
+        """한글 문장 속 키릴 문자 하나로 러시아어 입력이 되지 않는지 테스트"""
+        from app.ai_service import detect_language as ai_detect_language
+
+        assert detect_language("사랑해요 я").language == "korean"
+        assert ai_detect_language("사랑해요 я") == "korean"
+        assert ai_detect_language("Привет, John!") == "russian"
+        assert ai_detect_language("҂҂҂a") == "korean"
@@ -0,0 +1,103 @@
+"""
+이벤트 루프 느린 콜백 감시 테스트
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.bot_update_processor import ChatOrderedUpdateProcessor
+from app.loop_monitor import LoopLagMonitor, recent_slow_callbacks, slow_callbacks, task_label
+from app.timing import RequestTimingMiddleware
+
+
+def block_loop(seconds: float) -> None:
+    """이벤트 루프를 막는 동기 호출 (스택 샘플에 이 함수가 보여야 함)"""
+    time.sleep(seconds)
+
+
+def records_for(loop_name: str):
+    return [record for record in recent_slow_callbacks() if record["loop"] == loop_name]
+
+
+class TestSlowCallbacks:
+    """느린 콜백의 라우트/코루틴/스택 기록 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_records_stack_and_label_of_blocking_task(self):
+        """루프를 막은 태스크의 라우트 이름과 막고 있던 함수가 기록되는지 테스트"""
+        monitor = LoopLagMonitor("test-label", interval=0.01, threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.03)
+
+        async def handler():
+            with task_label("GET /slow"):
+                block_loop(0.2)
+
+        before = slow_callbacks.value("test-label", "GET /slow")
+        await asyncio.create_task(handler(), name="slow-handler")
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        record = records_for("test-label")[0]
+        assert record["route"] == "GET /slow"
+        assert record["task"] == "slow-handler"
+        assert "handler" in record["coroutine"]
+        assert any("block_loop" in frame for frame in record["stack"])
+        assert record["blocked_seconds"] >= 0.15
+        assert slow_callbacks.value("test-label", "GET /slow") == before + 1
+        assert monitor.snapshot()["slow_callbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_http_route_template_is_reported(self):
+        """HTTP 요청 처리 중 차단은 경로 템플릿으로 보고되는지 테스트"""
+        app = FastAPI()
+        app.add_middleware(RequestTimingMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: str):
+            block_loop(0.15)
+            return {"item_id": item_id}
+
+        monitor = LoopLagMonitor("test-http", interval=0.01, threshold=0.05)
+        monitor.start()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            response = await client.get("/items/42")
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert response.status_code == 200
+        assert records_for("test-http")[0]["route"] == "GET /items/{item_id}"
+
+    @pytest.mark.asyncio
+    async def test_telegram_updates_are_labelled_by_kind(self):
+        """텔레그램 업데이트 처리 태스크에 업데이트 종류 레이블이 붙는지 테스트"""
+        monitor = LoopLagMonitor("test-telegram", interval=0.01, threshold=0.05)
+        monitor.start()
+        update = SimpleNamespace(effective_chat=SimpleNamespace(id=1), message=SimpleNamespace(text="안녕"))
+
+        async def handler():
+            block_loop(0.15)
+
+        async with ChatOrderedUpdateProcessor(workers=2) as processor:
+            await processor.process_update(update, handler())
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert records_for("test-telegram")[0]["route"] == "telegram message"
+
+    @pytest.mark.asyncio
+    async def test_short_pauses_are_not_reported(self):
+        """임계값보다 짧은 차단은 보고하지 않는지 테스트"""
+        monitor = LoopLagMonitor("test-quiet", interval=0.01, threshold=0.2)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        block_loop(0.03)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+        assert records_for("test-quiet") == []
+        assert monitor.max_lag >= 0.02
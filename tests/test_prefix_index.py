@@ -0,0 +1,152 @@
+"""
+어휘 접두사 색인 및 텔레그램 인라인 검색 테스트
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.ai_service import GenerationCache, create_basic_entry
+from app.prefix_index import PrefixIndex, VocabularyIndex
+from app.storage import VocabularyStorage
+from app.telegram_bot import KoreanVocabBot
+
+
+class TestPrefixIndex:
+    """bisect 접두사 검색 테스트"""
+
+    def test_prefix_search_and_exact(self):
+        """접두사 범위만 키 순서대로 반환하고 대소문자를 무시하는지 테스트"""
+        index = PrefixIndex([("사랑해", 2), ("사랑", 1), ("사과", 3), ("Любовь", 4), ("", 5)])
+
+        assert index.search("사랑") == [1, 2]
+        assert index.search("사") == [3, 1, 2]
+        assert index.search("любо") == [4]
+        assert index.search("없음") == []
+        assert index.search("") == []
+        assert index.search("사", limit=1) == [3]
+        assert index.exact("사랑") == 1
+        assert index.exact("사랑하") is None
+
+
+class TestVocabularyIndex:
+    """저장소/AI 캐시 변경 감지 테스트"""
+
+    def test_rebuilds_on_storage_and_cache_changes(self, tmp_path):
+        """저장 파일이나 AI 캐시가 바뀌면 색인이 다시 만들어지는지 테스트"""
+        vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+        cache = GenerationCache(max_size=10)
+        index = VocabularyIndex(vocabulary_storage, cache)
+        assert index.search("사") == []
+        assert not index.stale
+
+        vocabulary_storage.save(create_basic_entry("사랑"))
+        assert index.stale
+        assert [entry.original_word for entry in index.search("사")] == ["사랑"]
+
+        cache.put(("korean", "사과"), create_basic_entry("사과"))
+        assert [entry.original_word for entry in index.search("사")] == ["사과", "사랑"]
+        assert index.exact("사과").original_word == "사과"
+
+    def test_refresh_from_loop_snapshot(self, tmp_path):
+        """루프에서 뜬 캐시 사본으로 만든 색인은 이후 캐시 변경을 순회하지 않고 다시 만들 때 반영되는지 테스트"""
+        vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+        cache = GenerationCache(max_size=10)
+        index = VocabularyIndex(vocabulary_storage, cache)
+        cache.put(("korean", "사과"), create_basic_entry("사과"))
+        snapshot = index.cache_snapshot()
+
+        cache.put(("korean", "사랑"), create_basic_entry("사랑"))
+        assert [entry.original_word for entry in index.refresh(snapshot).search("사")] == ["사과"]
+        assert index.stale
+        assert [entry.original_word for entry in index.search("사")] == ["사과", "사랑"]
+
+
+def inline_update(query, query_id="1", user_id=7):
+    inline_query = SimpleNamespace(query=query, id=query_id, from_user=SimpleNamespace(id=user_id), answer=AsyncMock())
+    return SimpleNamespace(inline_query=inline_query)
+
+
+class TestInlineQuery:
+    """인라인 검색 핸들러 테스트"""
+
+    @pytest.fixture
+    def bot(self, tmp_path):
+        vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+        vocabulary_storage.save(create_basic_entry("사랑"))
+        index = VocabularyIndex(vocabulary_storage, GenerationCache(max_size=10))
+        with patch('app.telegram_bot.vocabulary_index', index), \
+             patch('app.telegram_bot.INLINE_DEBOUNCE_SECONDS', 0.05):
+            yield KoreanVocabBot()
+
+    @pytest.mark.asyncio
+    async def test_prefix_answers_without_generation(self, bot):
+        """색인에 있는 접두사는 AI 호출 없이 바로 응답하는지 테스트"""
+        generate = AsyncMock()
+        update = inline_update("사")
+        with patch('app.telegram_bot.generate_vocabulary_entry', generate):
+            await bot.inline_query(update, None)
+
+        results = update.inline_query.answer.call_args.args[0]
+        assert [result.title.split(" → ")[0] for result in results] == ["사랑"]
+        generate.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_index_is_never_rebuilt_on_the_event_loop(self, bot):
+        """인라인 검색 중 색인 재생성은 스레드에서만 일어나고 루프에서는 결과만 검색하는지 테스트"""
+        import threading
+        from app.telegram_bot import vocabulary_index
+
+        loop_thread = threading.current_thread()
+        rebuild_threads = []
+        original_refresh = vocabulary_index.refresh
+
+        def recording_refresh(*args):
+            rebuild_threads.append(threading.current_thread())
+            return original_refresh(*args)
+
+        update = inline_update("사")
+        with patch.object(vocabulary_index, 'refresh', side_effect=recording_refresh), \
+             patch('app.telegram_bot.generate_vocabulary_entry', AsyncMock()):
+            await bot.inline_query(update, None)
+            await bot.inline_query(inline_update("사랑", "2"), None)
+
+        assert rebuild_threads and loop_thread not in rebuild_threads
+        assert [result.title.split(" → ")[0] for result in update.inline_query.answer.call_args.args[0]] == ["사랑"]
+
+    @pytest.mark.asyncio
+    async def test_generates_only_for_settled_query(self, bot):
+        """일치 항목이 없으면 마지막 검색어에 대해서만 AI 생성하는지 테스트"""
+        calls = []
+
+        async def fake_generate(word):
+            calls.append(word)
+            return create_basic_entry(word)
+
+        # 실제 시간 대신 이벤트로 입력 멈춤을 흉내냄 (두 검색어가 모두 대기에 들어간 뒤 멈춤)
+        waiting = []
+        settled = asyncio.Event()
+
+        async def debounce(query):
+            waiting.append(query)
+            await settled.wait()
+
+        first, second, short = inline_update("고마", "1"), inline_update("고마워", "2"), inline_update("고", "3", user_id=8)
+        with patch('app.telegram_bot.generate_vocabulary_entry', new=fake_generate), \
+             patch.object(bot, '_inline_debounce', new=debounce):
+            pending = asyncio.gather(
+                bot.inline_query(first, None),
+                bot.inline_query(second, None),
+                bot.inline_query(short, None),
+            )
+            while len(waiting) < 2:
+                await asyncio.sleep(0.001)
+            settled.set()
+            await asyncio.wait_for(pending, 1)
+
+        assert calls == ["고마워"]
+        first.inline_query.answer.assert_not_called()
+        assert second.inline_query.answer.call_args.args[0][0].title.startswith("고마워")
+        # 한 글자 검색어는 생성하지 않고 빈 결과 응답
+        assert short.inline_query.answer.call_args.args[0] == []
@@ -0,0 +1,161 @@
+"""
+웹 앱과 텔레그램 봇 프로세스 간 어휘 저장소 공유 테스트
+"""
+import json
+import multiprocessing
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.ai_service import create_basic_entry
+from app.bookmark_storage import BookmarkStorage
+from app.chat_storage import ChatStorage
+from app.file_lock import atomic_write_json
+from app.models import ChatMessage
+from app.storage import VocabularyStorage
+from app.telegram_bot import KoreanVocabBot
+
+
+def save_words(path: str, worker: int, count: int) -> None:
+    """별도 프로세스에서 실행되는 저장 작업"""
+    worker_storage = VocabularyStorage(path)
+    for index in range(count):
+        worker_storage.save(create_basic_entry(f"단어{worker}-{index}"))
+
+
+def add_messages(path: str, session_id: str, worker: int, count: int) -> None:
+    """별도 프로세스에서 같은 채팅 세션에 메시지 추가"""
+    worker_storage = ChatStorage(path)
+    for index in range(count):
+        assert worker_storage.add_message_to_session(session_id, ChatMessage(text=f"메시지{worker}-{index}"))
+
+
+def start_processes(target, args_list):
+    # fork가 없는 플랫폼은 spawn (느리지만 동일하게 동작)
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    context = multiprocessing.get_context(method)
+    workers = [context.Process(target=target, args=args) for args in args_list]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+
+class TestSharedStorage:
+    """프로세스 간 잠금 및 봇의 저장소 사용 테스트"""
+
+    def test_concurrent_processes_do_not_lose_writes(self, tmp_path):
+        """여러 프로세스가 동시에 저장해도 항목이 사라지지 않는지 테스트"""
+        path = str(tmp_path / "vocab.json")
+        VocabularyStorage(path)
+        start_processes(save_words, [(path, worker, 10) for worker in range(4)])
+
+        words = {entry.original_word for entry in VocabularyStorage(path).load_all()}
+        assert len(words) == 40
+
+    @pytest.mark.asyncio
+    async def test_bot_reuses_and_persists_vocabulary(self, tmp_path):
+        """봇이 웹 앱이 저장한 단어를 재사용하고, 새로 만든 단어는 저장하는지 테스트"""
+        path = str(tmp_path / "vocab.json")
+        web_storage = VocabularyStorage(path)
+        web_storage.save(create_basic_entry("사랑"))
+
+        generate = AsyncMock(side_effect=lambda word: create_basic_entry(word))
+        with patch('app.telegram_bot.storage', VocabularyStorage(path)), \
+             patch('app.telegram_bot.generate_vocabulary_entry', generate):
+            bot = KoreanVocabBot()
+            reused = await bot.lookup_or_generate("사랑")
+            created = await bot.lookup_or_generate("안녕")
+
+        assert reused.original_word == "사랑"
+        assert generate.await_count == 1
+        assert created.id is not None
+        assert web_storage.get_by_word("안녕") is not None
+
+
+class TestAtomicJsonStores:
+    """원자적 저장과 다른 프로세스 변경 감지 테스트"""
+
+    def test_failed_write_keeps_previous_file(self, tmp_path):
+        """직렬화 도중 실패해도 기존 파일이 그대로 남고 임시 파일이 없는지 테스트"""
+        path = str(tmp_path / "data.json")
+        atomic_write_json(path, {"words": ["사랑"]})
+
+        with pytest.raises(TypeError):
+            atomic_write_json(path, {"words": ["안녕", object()]})
+
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {"words": ["사랑"]}
+        assert os.listdir(tmp_path) == ["data.json"]
+
+    def test_corrupt_vocabulary_file_is_not_overwritten(self, tmp_path):
+        """손상된 어휘 파일을 빈 목록으로 덮어쓰지 않는지 테스트"""
+        path = tmp_path / "vocab.json"
+        path.write_text('[{"original_word": "사랑"', encoding='utf-8')
+        vocabulary_storage = VocabularyStorage(str(path))
+
+        assert vocabulary_storage.load_all() == []
+        with pytest.raises(ValueError):
+            vocabulary_storage.save(create_basic_entry("안녕"))
+        assert path.read_text(encoding='utf-8') == '[{"original_word": "사랑"'
+
+    def test_corrupt_chat_and_bookmark_files_survive_writes(self, tmp_path):
+        """손상된 채팅/북마크 파일을 비어 있거나 오래된 메모리 상태로 덮어쓰지 않는지 테스트"""
+        chat_path = tmp_path / "chat.json"
+        chat_storage = ChatStorage(str(chat_path))
+        for index in range(3):
+            chat_storage.create_session(f"대화 {index}")
+        bookmark_path = tmp_path / "bookmarks.json"
+        bookmark_storage = BookmarkStorage(str(bookmark_path))
+        bookmark_storage.create_bookmark("s", ChatMessage(type="ai", text="안녕", russian_translation="привет"))
+
+        corrupt = '{"sessions": [{"session_id": "절반'
+        chat_path.write_text(corrupt, encoding='utf-8')
+        bookmark_path.write_text(corrupt, encoding='utf-8')
+
+        # 새로 시작한 프로세스(빈 메모리)와 이미 세션을 들고 있던 인스턴스 모두 쓰기를 거부
+        restarted = ChatStorage(str(chat_path))
+        assert restarted.get_all_sessions() == []
+        for storage_instance in (restarted, chat_storage):
+            with pytest.raises(ValueError):
+                storage_instance.create_session("새 대화")
+        with pytest.raises(ValueError):
+            BookmarkStorage(str(bookmark_path)).create_bookmark("s", ChatMessage(type="ai", text="사랑", russian_translation="любовь"))
+
+        assert chat_path.read_text(encoding='utf-8') == corrupt
+        assert bookmark_path.read_text(encoding='utf-8') == corrupt
+
+    def test_chat_instances_see_each_other(self, tmp_path):
+        """같은 파일을 쓰는 두 인스턴스가 서로의 변경을 잃지 않고 보는지 테스트"""
+        path = str(tmp_path / "chat.json")
+        first, second = ChatStorage(path), ChatStorage(path)
+
+        session_a = first.create_session("안녕")
+        session_b = second.create_session("사랑")
+        assert second.get_session(session_a.session_id) is not None
+        assert {session.session_id for session in first.get_all_sessions()} == {session_a.session_id, session_b.session_id}
+
+        assert first.delete_session(session_b.session_id)
+        assert second.get_session(session_b.session_id) is None
+        assert [session.session_id for session in ChatStorage(path).get_all_sessions()] == [session_a.session_id]
+
+    def test_bookmark_review_visible_to_other_instance(self, tmp_path):
+        """다른 인스턴스의 북마크 생성/복습 결과가 반영되는지 테스트"""
+        path = str(tmp_path / "bookmarks.json")
+        first, second = BookmarkStorage(path), BookmarkStorage(path)
+
+        bookmark = first.create_bookmark("session", ChatMessage(type="ai", text="사랑", russian_translation="любовь"))
+        assert second.update_review(bookmark.id, 3)
+        assert first.get_all_bookmarks()[0].review_count == 1
+        assert first.search_bookmarks("любовь")[0].id == bookmark.id
+
+    def test_concurrent_processes_append_chat_messages(self, tmp_path):
+        """여러 프로세스가 같은 세션에 동시에 메시지를 추가해도 모두 남는지 테스트"""
+        path = str(tmp_path / "chat.json")
+        session = ChatStorage(path).create_session()
+        start_processes(add_messages, [(path, session.session_id, worker, 5) for worker in range(4)])
+
+        texts = {message.text for message in ChatStorage(path).get_session(session.session_id).messages}
+        assert {f"메시지{worker}-{index}" for worker in range(4) for index in range(5)} <= texts
@@ -0,0 +1,105 @@
+"""
+저장소 스레드 풀 및 이벤트 루프 지연 측정 테스트
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.chat_storage import ChatStorage
+from app.loop_monitor import LoopLagMonitor
+from app.models import ChatMessage
+from app.storage_executor import run_storage
+
+request_name: contextvars.ContextVar[str] = contextvars.ContextVar("request_name", default="")
+
+
+class TestRunStorage:
+    """run_storage 실행 위치/컨텍스트/예외 전달 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_storage_thread_with_context(self):
+        """저장소 전용 스레드에서 요청 컨텍스트를 유지한 채 실행되는지 테스트"""
+        request_name.set("chat")
+        thread_name, value = await run_storage(lambda: (threading.current_thread().name, request_name.get()))
+
+        assert thread_name.startswith("storage-io")
+        assert value == "chat"
+
+    @pytest.mark.asyncio
+    async def test_propagates_exceptions(self):
+        """작업 예외가 호출자에게 그대로 전달되는지 테스트"""
+        def fail():
+            raise ValueError("손상된 파일")
+
+        with pytest.raises(ValueError, match="손상된 파일"):
+            await run_storage(fail)
+
+
+class TestLoopLag:
+    """이벤트 루프 지연 측정 테스트"""
+
+    @staticmethod
+    async def measure(monitor: LoopLagMonitor, work) -> float:
+        monitor.start()
+        await asyncio.sleep(monitor.interval * 2)
+        await work()
+        await asyncio.sleep(monitor.interval * 2)
+        await monitor.stop()
+        return monitor.max_lag
+
+    @pytest.mark.asyncio
+    async def test_detects_blocking_call(self):
+        """루프를 막는 동기 호출이 지연으로 기록되는지 테스트"""
+        async def block():
+            time.sleep(0.1)
+
+        lag = await self.measure(LoopLagMonitor("test", interval=0.005), block)
+        assert lag >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_async_storage_writes_keep_loop_responsive(self, tmp_path):
+        """비동기 저장 API는 파일 쓰기가 끝나지 않은 동안에도 이벤트 루프가 계속 도는지 테스트"""
+        chat_storage = ChatStorage(str(tmp_path / "chat.json"))
+        session = chat_storage.create_session("안녕하세요")
+        session_id, message_count = session.session_id, session.message_count
+        entered, release = threading.Event(), threading.Event()
+        original_save = chat_storage.save_all_sessions
+
+        def gated_save():
+            # 저장소 스레드에서 release될 때까지 막히는 쓰기
+            entered.set()
+            release.wait(5)
+            return original_save()
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        with patch.object(chat_storage, 'save_all_sessions', side_effect=gated_save):
+            write = asyncio.create_task(
+                chat_storage.add_message_to_session_async(session_id, ChatMessage(text="감사합니다"))
+            )
+            counter = asyncio.create_task(ticker())
+            try:
+                while not entered.is_set():
+                    await asyncio.sleep(0.001)
+                ticks_at_entry = ticks
+                for _ in range(20):
+                    await asyncio.sleep(0)
+                # 쓰기가 막혀 있는 동안에도 루프 쪽 작업이 진행됨
+                assert ticks >= ticks_at_entry + 10
+                assert not write.done()
+            finally:
+                release.set()
+                assert await asyncio.wait_for(write, 5) is True
+                counter.cancel()
+
+        assert chat_storage.get_session(session_id).message_count == message_count + 1
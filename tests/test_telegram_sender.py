@@ -0,0 +1,105 @@
+"""
+텔레그램 발신 스케줄러 테스트
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import BadRequest, RetryAfter
+
+from app.telegram_sender import TelegramSender, TokenBucket, telegram_send_throttled
+
+
+class FakeBot:
+    """호출을 기록하고 지정한 횟수만큼 오류를 내는 봇"""
+
+    def __init__(self, failures=None):
+        self.calls = []
+        self.failures = list(failures or [])
+
+    async def _record(self, method, **kwargs):
+        self.calls.append((method, kwargs, time.monotonic()))
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(**{"message_id": len(self.calls), **kwargs})
+
+    async def send_message(self, **kwargs):
+        return await self._record("send_message", **kwargs)
+
+    async def edit_message_text(self, **kwargs):
+        return await self._record("edit_message_text", **kwargs)
+
+
+class TestTelegramSender:
+    """토큰 버킷, RetryAfter 재시도, 처리 중 메시지 교체 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_after_burst(self):
+        """순간 허용량을 다 쓰면 rate에 맞춰 대기하는지 테스트"""
+        bucket = TokenBucket(rate=20, capacity=2)
+        waits = [await bucket.acquire() for _ in range(4)]
+        assert waits[0] == waits[1] == 0
+        assert sum(waits) >= 0.09
+
+    def test_token_bucket_rejects_invalid_settings(self):
+        """0 이하의 rate나 1 미만의 capacity는 ValueError"""
+        for rate, capacity in ((0, 1), (-1, 1), (1, 0.5)):
+            with pytest.raises(ValueError):
+                TokenBucket(rate=rate, capacity=capacity)
+        with pytest.raises(ValueError, match="rate"):
+            TelegramSender(FakeBot(), chat_rate=0)
+
+    @pytest.mark.asyncio
+    async def test_chat_limit_does_not_delay_other_chats(self):
+        """한 채팅의 전송 제한이 다른 채팅 전송을 늦추지 않는지 테스트"""
+        sender = TelegramSender(FakeBot(), global_rate=1000, chat_rate=5, chat_burst=1)
+        busy = asyncio.gather(*(sender.send(1, f"msg{i}") for i in range(3)))
+        started = time.monotonic()
+        await sender.send(2, "other")
+        assert time.monotonic() - started < 0.1
+        await busy
+        texts = [kwargs["text"] for method, kwargs, _ in sender.bot.calls if kwargs["chat_id"] == 1]
+        assert texts == ["msg0", "msg1", "msg2"]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_and_retries(self):
+        """RetryAfter를 받으면 지정 시간만큼 기다렸다가 다시 보내는지 테스트"""
+        bot = FakeBot(failures=[RetryAfter(0.1)])
+        sender = TelegramSender(bot, global_rate=1000, chat_rate=1000, chat_burst=10)
+        before = telegram_send_throttled.value("retry_after")
+
+        result = await sender.send(1, "안녕")
+
+        assert result.text == "안녕"
+        assert len(bot.calls) == 2
+        assert bot.calls[1][2] - bot.calls[0][2] >= 0.09
+        assert telegram_send_throttled.value("retry_after") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_all_chats(self):
+        """RetryAfter를 받으면 다른 채팅 전송도 지정 시간 동안 멈추는지 테스트"""
+        bot = FakeBot(failures=[RetryAfter(0.2)])
+        sender = TelegramSender(bot, global_rate=1000, chat_rate=1000, chat_burst=10)
+
+        flooded = asyncio.create_task(sender.send(1, "안녕"))
+        await asyncio.sleep(0.02)
+        await sender.send(2, "다른 채팅")
+        await flooded
+
+        first_failure = bot.calls[0][2]
+        other_chat = next(at for method, kwargs, at in bot.calls if kwargs["chat_id"] == 2)
+        assert other_chat - first_failure >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_replace_edits_and_falls_back_to_send(self):
+        """처리 중 메시지는 수정으로 교체하고, 수정이 실패하면 새로 보내는지 테스트"""
+        bot = FakeBot()
+        sender = TelegramSender(bot, global_rate=1000, chat_rate=1000, chat_burst=10)
+        processing = await sender.send(1, "🔄")
+        await sender.replace(1, processing, "결과")
+        assert [method for method, _, _ in bot.calls] == ["send_message", "edit_message_text"]
+
+        bot.failures.append(BadRequest("Message to edit not found"))
+        await sender.replace(1, processing, "결과")
+        assert [method for method, _, _ in bot.calls][-2:] == ["edit_message_text", "send_message"]
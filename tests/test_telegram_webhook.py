@@ -0,0 +1,128 @@
+"""
+텔레그램 웹훅 모드 테스트 (가짜 Bot API 사용, 네트워크 없음)
+"""
+import asyncio
+import re
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.ai_service import create_basic_entry
+from app.bot_session_store import BotSessionStore
+from app.main import app
+from app.storage import VocabularyStorage
+from app.telegram_bot import KoreanVocabBot, TELEGRAM_SECRET_HEADER
+from app.telegram_sender import TelegramSender
+from tests.fake_telegram import FAKE_BOT_TOKEN, FakeTelegramServer, make_update
+
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def fake_telegram():
+    return FakeTelegramServer()
+
+
+@pytest_asyncio.fixture
+async def webhook_bot(fake_telegram, tmp_path):
+    """가짜 Bot API에 연결된 웹훅 모드 봇 (앱의 웹훅 라우트에 연결)"""
+    bot = KoreanVocabBot()
+    bot.user_sessions = BotSessionStore(storage_file=str(tmp_path / "sessions.json"))
+
+    async def fake_generate(word):
+        await asyncio.sleep(0.01)
+        return create_basic_entry(word)
+
+    with patch('app.telegram_bot.generate_vocabulary_entry', new=fake_generate), \
+         patch('app.telegram_bot.storage', VocabularyStorage(str(tmp_path / "vocab.json"))):
+        assert await bot.start_webhook(
+            "https://example.test", SECRET, token=FAKE_BOT_TOKEN, request=fake_telegram
+        )
+        # 부하 테스트가 전송 제한에 걸리지 않도록 제한을 넉넉하게 설정
+        bot.sender = TelegramSender(bot.application.bot, global_rate=10_000, chat_rate=10_000, chat_burst=100)
+        with patch('app.main.telegram_webhook_bot', bot):
+            yield bot
+        await bot.stop_webhook()
+
+
+def webhook_client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+
+
+class TestTelegramWebhook:
+    """웹훅 등록, 비밀 토큰 확인, 업데이트 처리 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_registers_webhook_with_secret(self, webhook_bot, fake_telegram):
+        """시작 시 웹훅 URL과 비밀 토큰이 등록되는지 테스트"""
+        assert fake_telegram.webhook["url"] == "https://example.test/telegram/webhook"
+        assert fake_telegram.webhook["secret_token"] == SECRET
+
+    @pytest.mark.asyncio
+    async def test_rejects_wrong_secret(self, webhook_bot, fake_telegram):
+        """비밀 토큰이 없거나 틀리면 403으로 거절하는지 테스트"""
+        async with webhook_client() as client:
+            missing = await client.post("/telegram/webhook", json=make_update(1, 10, "사랑"))
+            wrong = await client.post(
+                "/telegram/webhook", json=make_update(1, 10, "사랑"), headers={TELEGRAM_SECRET_HEADER: "nope"}
+            )
+        assert missing.status_code == 403
+        assert wrong.status_code == 403
+        assert "sendMessage" not in fake_telegram.methods()
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_webhook_mode(self):
+        """웹훅 모드가 아니면 404를 반환하는지 테스트"""
+        async with webhook_client() as client:
+            response = await client.post("/telegram/webhook", json=make_update(1, 10, "사랑"))
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_acknowledges_before_processing(self, webhook_bot, fake_telegram):
+        """AI 처리가 끝나기 전에 200으로 응답하고, 처리는 백그라운드에서 끝나는지 테스트"""
+        async with webhook_client() as client:
+            response = await client.post(
+                "/telegram/webhook", json=make_update(1, 10, "사랑"), headers={TELEGRAM_SECRET_HEADER: SECRET}
+            )
+        assert response.status_code == 200
+        assert "사랑" not in "".join(fake_telegram.sent[10])
+
+        await fake_telegram.wait_for(lambda: any("사랑" in text for text in fake_telegram.sent[10]))
+        assert webhook_bot.user_sessions.get(10)['vocab_count'] == 1
+        # 처리 중 메시지는 삭제하지 않고 결과로 수정
+        sends = [method for method in fake_telegram.methods() if method not in ("getMe", "setWebhook")]
+        assert sends == ["sendMessage", "editMessageText"]
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_per_chat_order(self, webhook_bot, fake_telegram):
+        """여러 채팅의 업데이트를 몰아서 보내도 모두 처리되고 채팅별 순서가 유지되는지 테스트"""
+        chats, per_chat = 10, 5
+        updates = [
+            make_update(index, 100 + index % chats, f"단어{index // chats}")
+            for index in range(chats * per_chat)
+        ]
+
+        started = time.perf_counter()
+        async with webhook_client() as client:
+            responses = await asyncio.gather(*(
+                client.post("/telegram/webhook", json=update, headers={TELEGRAM_SECRET_HEADER: SECRET})
+                for update in updates
+            ))
+        ack_seconds = time.perf_counter() - started
+        assert all(response.status_code == 200 for response in responses)
+
+        def replies(chat_id):
+            return [text for text in fake_telegram.sent[chat_id] if "한국어 단어 #" in text]
+
+        await fake_telegram.wait_for(lambda: all(len(replies(100 + chat)) == per_chat for chat in range(chats)))
+        # 모든 응답이 끝나기 전에 확인 응답은 이미 보냄 (처리 시간은 업데이트당 10ms 이상)
+        assert ack_seconds < 0.01 * chats * per_chat
+
+        for chat in range(chats):
+            numbers = [int(re.search(r"#(\d+)", text).group(1)) for text in replies(100 + chat)]
+            words = [re.search(r"단어(\d+)", text).group(1) for text in replies(100 + chat)]
+            assert numbers == list(range(1, per_chat + 1))
+            assert words == [str(i) for i in range(per_chat)]
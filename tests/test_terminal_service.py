@@ -1,13 +1,21 @@
 """
 터미널 서비스 핵심 로직 테스트
 """
+import json
+
 import pytest
 from app.terminal_service import (
     detect_language,
     LanguageDetectionResult,
     TranslationMode,
-    format_terminal_response
+    TranslationHistory,
+    TranslationHistoryStore,
+    format_terminal_response,
+    render_static_response,
+    static_command_frame
 )
+from app.ws_codec import add_request_id, CODEC_MSGPACK
+
 
 class TestLanguageDetection:
     """언어 감지 기능 테스트"""
@@ -66,6 +74,19 @@ class TestLanguageDetection:
         # 구두점만
         result = detect_language("!@#$%")
         assert result.language == "unknown"
+    
+    def test_non_russian_cyrillic_is_not_russian(self):
+        """키릴 기호/결합 부호와 러시아어가 아닌 키릴 문자는 러시아어로 세지 않는지 테스트"""
+        # 키릴 기호는 단어 문자가 아니므로 신뢰도가 1.0을 넘지 않음
+        result = detect_language("҂҂҂a")
+        assert result.language == "unknown"
+        assert result.confidence == 0.0
+        
+        for text in ("їжі", "Ўўі"):
+            result = detect_language(text)
+            assert result.language != "russian", text
+            assert 0.0 <= result.confidence <= 1.0
+
 
 class TestTranslationMode:
     """번역 모드 관리 테스트"""
@@ -104,6 +125,7 @@ class TestTranslationMode:
         assert result.forced_language == "russian"
         assert result.should_translate_to == "korean"
 
+
 class TestTerminalResponseFormatting:
     """터미널 응답 포맷팅 테스트"""
     
@@ -154,4 +176,70 @@ class TestTerminalResponseFormatting:
         
         # 타이핑 애니메이션을 위한 특수 마커 확인
         assert "{{TYPING_START}}" in result
-        assert "{{TYPING_END}}" in result
\ No newline at end of file
+        assert "{{TYPING_END}}" in result
+
+
+class TestTranslationHistory:
+    """최근 번역 링 버퍼 테스트"""
+    
+    def test_ring_buffer_is_bounded(self):
+        """버퍼 크기를 넘으면 오래된 기록부터 버려지는지 테스트"""
+        history = TranslationHistory(maxlen=3)
+        for i in range(5):
+            history.record(f"단어{i}", {"success": True, "original": f"단어{i}", "translation": "слово"}, 10.0 * i, "auto")
+        
+        assert len(history) == 3
+        assert [entry["text"] for entry in history.recent()] == ["단어4", "단어3", "단어2"]
+    
+    def test_stats_from_buffer(self):
+        """성공/실패/캐시 적중과 지연 통계 테스트"""
+        history = TranslationHistory(maxlen=10)
+        history.record("사랑", {"success": True, "cached": True}, 10.0, "auto")
+        history.record("친구", {"success": True}, 30.0, "auto")
+        history.record("???", {"success": False, "error": "실패"}, 5.0, "auto")
+        
+        stats = history.stats()
+        assert stats["count"] == 3
+        assert stats["succeeded"] == 2
+        assert stats["failed"] == 1
+        assert stats["cache_hits"] == 1
+        assert stats["latency_avg_ms"] == 20.0
+        assert stats["window"] == 10
+        assert "최근 3/10건" in format_terminal_response(None, command_type="stats", stats=stats)
+    
+    def test_history_survives_reconnect_with_client_token(self):
+        """같은 클라이언트 토큰은 같은 히스토리를 받는지 테스트"""
+        store = TranslationHistoryStore(max_clients=1)
+        first = store.get("token-a")
+        assert store.get("token-a") is first
+        assert store.get(None) is not store.get(None)
+        store.get("token-b")
+        assert len(store) == 1
+        assert store.get("token-a") is not first
+
+
+class TestPrecomputedFrames:
+    """미리 직렬화된 명령어 프레임 테스트"""
+    
+    def test_static_response_matches_render(self):
+        """캐시된 고정 응답이 새로 그린 결과와 같은지 테스트"""
+        for command_type, mode in [("help", None), ("clear", None), ("mode_change", "korean")]:
+            assert format_terminal_response(None, command_type=command_type, mode=mode) == \
+                render_static_response(command_type, False, mode)
+    
+    def test_request_id_appended_to_cached_json_frame(self):
+        """캐시된 JSON 프레임에 request_id를 덧붙인 결과가 올바른 JSON인지 테스트"""
+        
+        frame = json.loads(add_request_id(static_command_frame("help"), "req-\"1\""))
+        assert frame["command_type"] == "help"
+        assert frame["request_id"] == "req-\"1\""
+        assert "터미널 명령어" in frame["data"]
+    
+    def test_request_id_appended_to_cached_msgpack_frame(self):
+        """캐시된 MessagePack 프레임에 request_id를 덧붙인 결과 테스트"""
+        msgpack = pytest.importorskip("msgpack")
+        
+        payload = add_request_id(static_command_frame("mode", "russian", CODEC_MSGPACK), 7, CODEC_MSGPACK)
+        assert msgpack.unpackb(payload) == {
+            "type": "command_result", "success": True, "command_type": "mode", "mode": "russian", "request_id": 7
+        }
@@ -0,0 +1,107 @@
+"""
+요청 단계 시간 측정 및 메트릭 레지스트리 테스트
+"""
+import pytest
+from app.metrics import Histogram, MetricsRegistry
+from app.timing import format_server_timing, stage_timer, stage_duration
+
+class TestHistogram:
+    """히스토그램 누적 테스트"""
+
+    def test_observe_accumulates_buckets(self):
+        """관측값이 누적 버킷에 반영되는지 테스트"""
+        histogram = Histogram("test_seconds", "테스트", labelnames=("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "a")
+        histogram.observe(0.5, "a")
+        histogram.observe(5.0, "a")
+
+        series = histogram.collect()[("a",)]
+        assert series["count"] == 3
+        assert series["sum"] == pytest.approx(5.55)
+        assert [count for _, count in series["buckets"]] == [1, 2, 3]
+
+    def test_quantile_uses_bucket_bounds(self):
+        """분위수 근사 테스트"""
+        histogram = Histogram("test_seconds", "테스트", buckets=(0.1, 1.0))
+        for _ in range(9):
+            histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.99) == 1.0
+        assert Histogram("empty", "빈 히스토그램").quantile(0.5) is None
+
+    def test_registry_returns_same_histogram(self):
+        """같은 이름은 같은 히스토그램을 반환"""
+        registry = MetricsRegistry()
+        first = registry.histogram("dup_seconds", "중복")
+        assert registry.histogram("dup_seconds", "중복") is first
+
+    def test_registry_rejects_type_mismatch(self):
+        """이미 다른 종류로 등록된 이름을 요청하면 ValueError"""
+        registry = MetricsRegistry()
+        registry.histogram("dup_seconds", "중복")
+        with pytest.raises(ValueError, match="Histogram"):
+            registry.counter("dup_seconds", "중복")
+        with pytest.raises(ValueError):
+            registry.gauge("dup_seconds", "중복")
+
+class TestServerTiming:
+    """Server-Timing 헤더 테스트"""
+
+    def test_stage_timer_records_histogram(self):
+        """stage_timer가 전역 히스토그램에 기록하는지 테스트"""
+        before = stage_duration.collect().get(("unit_test_stage",), {"count": 0})["count"]
+        with stage_timer("unit_test_stage"):
+            pass
+        after = stage_duration.collect()[("unit_test_stage",)]["count"]
+        assert after == before + 1
+
+    def test_format_merges_repeated_stages(self):
+        """반복된 단계는 합산되고 횟수가 표시되는지 테스트"""
+        header = format_server_timing(
+            [("chat_persist", 0.010), ("ai_generate", 0.5), ("chat_persist", 0.020)],
+            total=0.6
+        )
+        assert 'chat_persist;dur=30.00;desc="x2"' in header
+        assert "ai_generate;dur=500.00" in header
+        assert header.endswith("total;dur=600.00")
+
+    def test_http_response_has_server_timing_header(self, client):
+        """HTTP 응답에 Server-Timing 헤더가 포함되는지 테스트"""
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert "total;dur=" in response.headers["server-timing"]
+
+class TestMetricsEndpoint:
+    """/metrics 엔드포인트 테스트"""
+
+    def test_metrics_exposition_format(self, client):
+        """Prometheus 텍스트 형식과 주요 메트릭 포함 여부 테스트"""
+        client.get("/health")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/health",status="200",le="+Inf"}' in body
+        for name in ["process_resident_memory_bytes", "chat_sessions", "bookmarks",
+                     "vocabulary_entries", "websocket_connections"]:
+            assert f"\n{name} " in body
+
+    def test_websocket_connection_gauge(self, client):
+        """WebSocket 연결 수 게이지가 연결/종료를 반영하는지 테스트"""
+        from app.main import websocket_connections
+        before = websocket_connections.value()
+        with client.websocket_connect("/ws/terminal") as websocket:
+            websocket.receive_json()
+            assert websocket_connections.value() == before + 1
+            websocket.send_json({"type": "get_stats"})
+            websocket.receive_json()
+        import time
+        for _ in range(50):
+            if websocket_connections.value() == before:
+                break
+            time.sleep(0.01)
+        assert websocket_connections.value() == before
@@ -0,0 +1,79 @@
+"""
+어휘 저장소 단일 작성자(actor) 테스트
+"""
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.ai_service import create_basic_entry
+from app.storage import VocabularyStorage
+
+
+class TestVocabularyWriter:
+    """동시 저장 순서/일괄 저장 및 스냅샷 조회 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_are_batched_without_loss(self, tmp_path):
+        """동시에 들어온 저장이 모두 남고 파일 쓰기는 묶여서 줄어드는지 테스트"""
+        vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+        writes = []
+        original_write = vocabulary_storage._write_unlocked
+
+        def counting_write(entries):
+            writes.append(len(entries))
+            original_write(entries)
+
+        with patch.object(vocabulary_storage, '_write_unlocked', side_effect=counting_write):
+            saved = await asyncio.gather(*(
+                vocabulary_storage.save_async(create_basic_entry(f"단어{index}")) for index in range(50)
+            ))
+
+        assert all(entry.id for entry in saved)
+        assert len(writes) < 50
+        with open(tmp_path / "vocab.json", encoding='utf-8') as f:
+            assert {item["original_word"] for item in json.load(f)} == {f"단어{index}" for index in range(50)}
+
+    @pytest.mark.asyncio
+    async def test_operations_apply_in_submission_order(self, tmp_path):
+        """저장-삭제-저장이 요청 순서대로 적용되는지 테스트"""
+        vocabulary_storage = VocabularyStorage(str(tmp_path / "vocab.json"))
+        results = await asyncio.gather(
+            vocabulary_storage.save_async(create_basic_entry("사랑")),
+            vocabulary_storage.delete_async("사랑"),
+            vocabulary_storage.delete_async("사랑"),
+            vocabulary_storage.save_async(create_basic_entry("사랑")),
+        )
+
+        assert results[1:3] == [True, False]
+        assert vocabulary_storage.get_by_word("사랑").id == results[3].id
+        assert VocabularyStorage(str(tmp_path / "vocab.json")).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_reports_error_and_writer_recovers(self, tmp_path):
+        """저장 실패가 호출자에게 전달되고 이후 저장은 계속 동작하는지 테스트"""
+        path = tmp_path / "vocab.json"
+        vocabulary_storage = VocabularyStorage(str(path))
+        path.write_text("[", encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            await vocabulary_storage.save_async(create_basic_entry("사랑"))
+
+        path.write_text("[]", encoding='utf-8')
+        assert (await vocabulary_storage.save_async(create_basic_entry("사랑"))).id
+        await vocabulary_storage.writer.close()
+
+    def test_reads_use_snapshot_until_file_changes(self, tmp_path):
+        """파일이 바뀌지 않으면 조회가 파일을 다시 읽지 않는지 테스트"""
+        path = str(tmp_path / "vocab.json")
+        vocabulary_storage = VocabularyStorage(path)
+        vocabulary_storage.save(create_basic_entry("사랑"))
+
+        with patch.object(vocabulary_storage, '_load_unlocked', side_effect=AssertionError("파일을 다시 읽음")):
+            assert vocabulary_storage.get_by_word("사랑") is not None
+            assert len(vocabulary_storage.load_all()) == 1
+
+        # 다른 프로세스(인스턴스)의 저장은 다음 조회에 반영
+        VocabularyStorage(path).save(create_basic_entry("안녕"))
+        assert vocabulary_storage.get_by_word("안녕") is not None
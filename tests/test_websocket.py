@@ -275,4 +275,356 @@ class TestWebSocketPerformance:
             assert response["type"] == "translation"
             # 성공하거나 길이 제한 에러여야 함
             if not response["success"]:
-                assert "길이" in response["error"] or "크기" in response["error"]
\ No newline at end of file
+                assert "길이" in response["error"] or "크기" in response["error"]
+class TestWebSocketPipelining:
+    """요청 ID 기반 동시 번역 처리 테스트"""
+    
+    @staticmethod
+    async def fake_translation(text, mode=None):
+        """'느림'은 오래 걸리고 나머지는 즉시 끝나는 가짜 번역"""
+        import asyncio
+        await asyncio.sleep(0.3 if text == "느림" else 0)
+        return {"success": True, "original": text, "translation": f"{text}-ru", "pronunciation": "", "examples": []}
+    
+    def test_command_answered_while_translation_pending(self, client):
+        """느린 번역이 진행 중이어도 명령어와 다른 번역이 먼저 응답되는지 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "slow"})
+                websocket.send_json({"type": "command", "text": "/help", "request_id": "help"})
+                websocket.send_json({"type": "translate", "text": "빠름", "request_id": "fast"})
+                
+                order = [websocket.receive_json()["request_id"] for _ in range(3)]
+                assert order[0] == "help"
+                assert order.index("fast") < order.index("slow")
+    
+    def test_in_flight_limit(self, client):
+        """연결당 진행 중 번역 수 제한 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation), \
+             patch('app.main.TERMINAL_MAX_IN_FLIGHT', 1):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "first"})
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "second"})
+                
+                rejected = websocket.receive_json()
+                assert rejected["request_id"] == "second"
+                assert rejected["success"] is False
+                accepted = websocket.receive_json()
+                assert accepted["request_id"] == "first"
+                assert accepted["success"] is True
+    
+    def test_duplicate_request_id_rejected(self, client):
+        """진행 중인 request_id를 재사용하면 거절되고 기존 번역은 계속 취소 가능한지 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "same"})
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "same"})
+                rejected = websocket.receive_json()
+                assert rejected["request_id"] == "same"
+                assert rejected["success"] is False
+                
+                websocket.send_json({"type": "cancel", "request_id": "same"})
+                assert websocket.receive_json()["cancelled"] is True
+                
+                websocket.send_json({"type": "get_stats"})
+                assert websocket.receive_json()["data"]["in_flight"] == 0
+
+class TestWebSocketCancellation:
+    """진행 중 번역 취소 및 latest-wins 모드 테스트"""
+    
+    fake_translation = staticmethod(TestWebSocketPipelining.fake_translation)
+    
+    def test_cancel_message(self, client):
+        """cancel 메시지로 진행 중인 번역이 취소되는지 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "slow"})
+                websocket.send_json({"type": "cancel", "request_id": "slow"})
+                cancelled = websocket.receive_json()
+                assert cancelled["request_id"] == "slow"
+                assert cancelled["cancelled"] is True
+                assert cancelled["reason"] == "client"
+                
+                websocket.send_json({"type": "cancel", "request_id": "slow"})
+                assert websocket.receive_json()["success"] is False
+                
+                websocket.send_json({"type": "get_stats"})
+                stats = websocket.receive_json()
+                assert stats["type"] == "stats"
+                assert stats["data"]["cancelled_count"] == 1
+                assert stats["data"]["in_flight"] == 0
+    
+    def test_latest_wins_cancels_older_request(self, client):
+        """latest-wins 모드에서 새 번역이 이전 번역을 대체하는지 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal?latest_wins=1") as websocket:
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "translate", "text": "느림", "request_id": "old"})
+                websocket.send_json({"type": "translate", "text": "빠름", "request_id": "new"})
+                
+                superseded = websocket.receive_json()
+                assert superseded["request_id"] == "old"
+                assert superseded["reason"] == "superseded"
+                result = websocket.receive_json()
+                assert result["request_id"] == "new"
+                assert result["success"] is True
+
+class TestSharedCalls:
+    """같은 입력의 AI 호출 공유 테스트"""
+    
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_only_after_last_waiter(self):
+        """대기자가 남아 있으면 호출을 유지하고, 모두 취소되면 호출도 취소되는지 테스트"""
+        import asyncio
+        from app.terminal_service import SharedCalls
+        
+        shared = SharedCalls()
+        calls = []
+        upstream_cancelled = asyncio.Event()
+        
+        async def upstream():
+            calls.append(1)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                upstream_cancelled.set()
+                raise
+        
+        first = asyncio.create_task(shared.run("key", upstream))
+        second = asyncio.create_task(shared.run("key", upstream))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(calls) == 1
+        
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not upstream_cancelled.is_set()
+        
+        second.cancel()
+        await asyncio.wait_for(upstream_cancelled.wait(), 1)
+        assert len(shared) == 0
+    
+    @pytest.mark.asyncio
+    async def test_resubmit_right_after_cancel_starts_new_call(self):
+        """마지막 대기자 취소 직후 같은 키로 요청하면 취소 중인 호출이 아니라 새 호출을 받는지 테스트"""
+        import asyncio
+        from app.terminal_service import SharedCalls
+        
+        shared = SharedCalls()
+        calls = []
+        
+        async def upstream():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(10)
+            return "번역"
+        
+        first = asyncio.create_task(shared.run("key", upstream))
+        await asyncio.sleep(0)
+        first.cancel()
+        # 한 번만 양보: 대기자의 finally는 실행됐지만 실제 호출의 취소는 아직 끝나지 않은 시점
+        await asyncio.sleep(0)
+        assert first.done() and calls == [1]
+        
+        assert await asyncio.wait_for(shared.run("key", upstream), 1) == "번역"
+        assert len(calls) == 2
+
+class TestConnectionManager:
+    """연결 제한 및 하트비트 정리 테스트"""
+    
+    def test_per_ip_limit_rejects_with_1013(self, client):
+        """IP별 연결 수를 넘으면 오류 프레임 후 1013으로 종료되는지 테스트"""
+        from starlette.websockets import WebSocketDisconnect
+        from app.connection_manager import ConnectionManager
+        
+        with patch('app.main.connection_manager', ConnectionManager(max_per_ip=1)):
+            with client.websocket_connect("/ws/terminal") as first:
+                assert first.receive_json()["type"] == "connection"
+                
+                with client.websocket_connect("/ws/terminal") as second:
+                    rejected = second.receive_json()
+                    assert rejected["type"] == "error"
+                    assert rejected["reason"] == "ip_limit"
+                    with pytest.raises(WebSocketDisconnect) as exc_info:
+                        second.receive_json()
+                    assert exc_info.value.code == 1013
+    
+    def test_unanswered_ping_reaps_connection(self, client):
+        """ping에 응답하지 않는 연결이 정리되는지 테스트"""
+        from starlette.websockets import WebSocketDisconnect
+        from app.connection_manager import ConnectionManager
+        
+        manager = ConnectionManager(heartbeat_interval=0.05, pong_timeout=0.05)
+        with patch('app.main.connection_manager', manager):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                assert websocket.receive_json()["type"] == "ping"
+                assert manager.live == 1 and manager.peak == 1
+                
+                frames = []
+                with pytest.raises(WebSocketDisconnect) as exc_info:
+                    while True:
+                        frames.append(websocket.receive_json())
+                assert exc_info.value.code == 1001
+                assert frames[-1]["reason"] == "half_open"
+        assert manager.live == 0
+        assert manager.snapshot()["per_ip"] == {}
+    
+    def test_reservation_counts_against_limits_until_released(self):
+        """핸드셰이크 중 예약한 자리도 제한에 포함되고 반납하면 다시 받을 수 있는지 테스트"""
+        from app.connection_manager import ConnectionManager
+        
+        manager = ConnectionManager(max_connections=2, max_per_ip=1)
+        assert manager.reserve("10.0.0.1") is None
+        assert manager.reserve("10.0.0.1") == "ip_limit"
+        assert manager.reserve("10.0.0.2") is None
+        assert manager.reserve("10.0.0.3") == "global_limit"
+        
+        manager.release("10.0.0.1")
+        assert manager.reserve("10.0.0.1") is None
+        assert manager.snapshot()["per_ip"] == {"10.0.0.1": 1, "10.0.0.2": 1}
+    
+    @pytest.mark.asyncio
+    async def test_close_does_not_wait_on_stalled_peer(self):
+        """안내 프레임 전송이 멈춘 연결도 시간 제한 안에 정리되는지 테스트"""
+        import asyncio
+        from types import SimpleNamespace
+        from app.connection_manager import ConnectionManager, ManagedConnection
+        
+        async def stalled_send(message):
+            await asyncio.sleep(10)
+        
+        async def close(code):
+            pass
+        
+        manager = ConnectionManager()
+        connection = ManagedConnection(SimpleNamespace(close=close), "10.0.0.1", None, stalled_send)
+        with patch('app.connection_manager.WS_CLOSE_TIMEOUT', 0.05):
+            await asyncio.wait_for(manager.close(connection, 1001, "shutdown"), 1)
+        assert connection.close_reason == "shutdown"
+
+class TestWebSocketBatch:
+    """translate_batch 메시지 테스트"""
+    
+    @staticmethod
+    async def fake_translation(text, mode=None):
+        """'실패'는 실패하고 나머지는 성공하는 가짜 번역"""
+        if text == "실패":
+            return {"success": False, "error": "번역 실패"}
+        return {"success": True, "original": text, "translation": f"{text}-ru", "pronunciation": "", "examples": []}
+    
+    def test_batch_streams_items_and_summary(self, client, tmp_path):
+        """항목별 결과와 요약이 전송되고 개별 실패가 배치를 중단하지 않는지 테스트"""
+        from app.storage import VocabularyStorage
+        from app.models import VocabularyEntry
+        
+        vocabulary = VocabularyStorage(str(tmp_path / "vocabulary.json"))
+        vocabulary.save(VocabularyEntry(
+            original_word="사랑", russian_translation="любовь", pronunciation="саран", usage_examples=[]
+        ))
+        
+        translate = AsyncMock(side_effect=self.fake_translation)
+        with patch('app.terminal_service.process_terminal_translation', new=translate), \
+             patch('app.terminal_service.storage', vocabulary):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                websocket.send_json({
+                    "type": "translate_batch",
+                    "items": ["사랑", "친구", "실패", ""],
+                    "request_id": "batch"
+                })
+                
+                items = {}
+                for _ in range(4):
+                    frame = websocket.receive_json()
+                    assert frame["type"] == "batch_item"
+                    assert frame["request_id"] == "batch"
+                    items[frame["index"]] = frame
+                summary = websocket.receive_json()
+        
+        assert items[0]["cached"] is True
+        assert items[0]["translation"] == "любовь"
+        assert items[1]["success"] is True and items[1]["cached"] is False
+        assert items[2]["success"] is False
+        assert items[3]["success"] is False
+        # 저장된 단어와 빈 항목은 AI를 호출하지 않음
+        assert translate.await_count == 2
+        assert summary["type"] == "batch_summary"
+        assert summary["data"]["total"] == 4
+        assert summary["data"]["succeeded"] == 2
+        assert summary["data"]["cache_hits"] == 1
+    
+    def test_batch_size_limit(self, client):
+        """최대 항목 수를 넘는 배치는 거절되는지 테스트"""
+        with patch('app.main.TERMINAL_BATCH_MAX_ITEMS', 2):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "translate_batch", "items": ["가", "나", "다"]})
+                response = websocket.receive_json()
+                assert response["type"] == "batch_summary"
+                assert response["success"] is False
+
+class TestWebSocketHistory:
+    """/history, /stats 명령어 테스트"""
+    
+    fake_translation = staticmethod(TestWebSocketPipelining.fake_translation)
+    
+    def test_history_and_stats_commands(self, client):
+        """번역 후 /history와 /stats가 기록을 보여주는지 테스트"""
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal") as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "translate", "text": "빠름", "request_id": "t"})
+                websocket.receive_json()
+                
+                websocket.send_json({"type": "command", "text": "/history"})
+                history = websocket.receive_json()
+                assert history["success"] is True
+                assert history["command_type"] == "history"
+                assert "빠름 → 빠름-ru" in history["data"]
+                
+                websocket.send_json({"type": "command", "text": "/stats"})
+                stats = websocket.receive_json()
+                assert stats["command_type"] == "stats"
+                assert "성공: 1" in stats["data"]
+
+class TestWebSocketMessagePack:
+    """MessagePack 바이너리 프레임 협상 테스트"""
+    
+    fake_translation = staticmethod(TestWebSocketPipelining.fake_translation)
+    
+    def test_msgpack_subprotocol(self, client):
+        """msgpack 서브프로토콜로 연결하면 구조화된 바이너리 프레임을 받는지 테스트"""
+        msgpack = pytest.importorskip("msgpack")
+        with patch('app.main.process_terminal_translation', new=self.fake_translation):
+            with client.websocket_connect("/ws/terminal", subprotocols=["msgpack"]) as websocket:
+                assert websocket.accepted_subprotocol == "msgpack"
+                welcome = msgpack.unpackb(websocket.receive_bytes())
+                assert welcome["format"] == "msgpack"
+                
+                websocket.send_bytes(msgpack.packb({"type": "translate", "text": "빠름", "request_id": 1}))
+                response = msgpack.unpackb(websocket.receive_bytes())
+                assert response["request_id"] == 1
+                assert response["translation"] == "빠름-ru"
+                assert response["examples"] == []
+                assert "data" not in response
+                
+                websocket.send_bytes(msgpack.packb({"type": "command", "text": "/mode korean"}))
+                command = msgpack.unpackb(websocket.receive_bytes())
+                assert command["command_type"] == "mode"
+                assert command["mode"] == "korean"
+                assert "data" not in command
+    
+    def test_json_remains_default(self, client):
+        """협상하지 않으면 기존 JSON 텍스트 프레임을 사용하는지 테스트"""
+        with client.websocket_connect("/ws/terminal") as websocket:
+            assert websocket.receive_json()["format"] == "json"